@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Optional
+import structlog
+from app.core.config import settings
+from app.services.availability import availability_service, SERVICE_DURATIONS_MINUTES
+from app.services.calendar_sync import calendar_sync
+from app.services.jitter_queue import jitter_queue
+from app.services.quoting_service import ServiceType
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+@router.post("/tenants/{tenant_id}/calendar/sync", status_code=status.HTTP_202_ACCEPTED)
+async def sync_tenant_calendar(tenant_id: str):
+    """
+    Start (or immediately re-run) Google Calendar sync for a tenant
+    
+    Registers the tenant and starts the periodic CALENDAR_SYNC task, or
+    re-arms it if its next run was lost. While the periodic task is live,
+    calls schedule a one-off sync on top of it.
+    """
+    calendar_sync.register_tenant(tenant_id)
+    
+    armed = jitter_queue.ensure_periodic(
+        key="CALENDAR_SYNC",
+        interval_seconds=settings.CALENDAR_SYNC_INTERVAL_SECONDS,
+        tenant_id=tenant_id,
+        delay_seconds=0
+    )
+    
+    task_id = None
+    if armed:
+        task_id = f"CALENDAR_SYNC:{tenant_id}"
+    elif armed is False:
+        task_id = jitter_queue.enqueue_delayed(
+            key="CALENDAR_SYNC",
+            payload={"once": True},
+            delay_seconds=0,
+            tenant_id=tenant_id
+        )
+    
+    if not task_id:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Task queue not available"
+        )
+    
+    return {"status": "scheduled", "task_id": task_id}
+
+def _check_range(start: datetime, end: datetime, max_days: int = 31):
+    if start.tzinfo is None or end.tzinfo is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start and end must include a UTC offset"
+        )
+    
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be after start"
+        )
+    
+    if end - start > timedelta(days=max_days):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range cannot exceed {max_days} days"
+        )
+
+@router.get("/tenants/{tenant_id}/calendar/busy")
+async def get_busy_intervals(tenant_id: str, start: datetime, end: datetime):
+    """List synced busy blocks intersecting [start, end)"""
+    _check_range(start, end)
+    
+    index = calendar_sync.get_index(tenant_id)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar not synced for this tenant"
+        )
+    
+    return {
+        "busy": [
+            {
+                "start": datetime.fromtimestamp(busy_start, timezone.utc).isoformat(),
+                "end": datetime.fromtimestamp(busy_end, timezone.utc).isoformat()
+            }
+            for busy_start, busy_end in index.between(start.timestamp(), end.timestamp())
+        ]
+    }
+
+
+@router.get("/tenants/{tenant_id}/calendar/availability")
+async def get_availability(
+    tenant_id: str,
+    service_type: ServiceType,
+    start: datetime,
+    end: datetime,
+    buffer_minutes: Optional[int] = Query(None, ge=0, le=240)
+):
+    """
+    List bookable slots for a service between start and end
+    
+    Slot length comes from the service type; slots avoid quiet hours and
+    keep a buffer around existing calendar events.
+    """
+    _check_range(start, end)
+    
+    # Never offer slots in the past
+    start = max(start, datetime.now(timezone.utc))
+    if end <= start:
+        return {"service_type": service_type.value, "duration_minutes": SERVICE_DURATIONS_MINUTES[service_type], "slots": []}
+    
+    slots = availability_service.free_slots(
+        tenant_id=tenant_id,
+        service_type=service_type,
+        start=start,
+        end=end,
+        buffer_minutes=buffer_minutes
+    )
+    
+    if slots is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar not synced for this tenant"
+        )
+    
+    return {
+        "service_type": service_type.value,
+        "duration_minutes": SERVICE_DURATIONS_MINUTES[service_type],
+        "slots": [
+            {"start": slot_start.isoformat(), "end": slot_end.isoformat()}
+            for slot_start, slot_end in slots
+        ]
+    }
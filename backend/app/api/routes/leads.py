@@ -1,8 +1,19 @@
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
-from typing import Optional, List
+import asyncio
+import json
+import math
+import mimetypes
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, AsyncIterator
 import structlog
-from app.integrations.s3_client import S3Client
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.integrations.s3_client import async_s3_client, MAX_PHOTO_SIZE_BYTES
+from app.services.jitter_queue import jitter_queue
+from app.services.photo_index import photo_index, parse_photo_key
+from app.services.presigned_url_cache import presigned_url_cache
+from app.services.photo_derivatives import DERIVATIVE_FORMATS, derivative_key, derivative_keys
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -21,8 +32,64 @@ class PhotoPresignResponse(BaseModel):
     expires_at: str
     max_size_bytes: int
 
+class PhotoUploadFile(BaseModel):
+    file_extension: str = Field('jpg', pattern=r"^[A-Za-z0-9]{1,5}$")
+    content_type: Optional[str] = Field(None, pattern=r"^image/[\w.+-]+$")
+    size_bytes: Optional[int] = Field(None, gt=0, le=MAX_PHOTO_SIZE_BYTES)
+
+class PhotoBatchPresignRequest(BaseModel):
+    tenant_id: str
+    files: List[PhotoUploadFile] = Field(..., min_length=1, max_length=20)
+    expiration_seconds: int = 3600
+
+class PhotoBatchPresignResponse(BaseModel):
+    uploads: List[PhotoPresignResponse]
+
+class MultipartCreateRequest(BaseModel):
+    tenant_id: str
+    file_extension: str = Field(..., pattern=r"^[A-Za-z0-9]{1,5}$")
+    content_type: str = Field(..., pattern=r"^(image|video)/[\w.+-]+$")
+    size_bytes: int = Field(..., gt=0, le=settings.S3_MULTIPART_MAX_BYTES)
+
+class MultipartCreateResponse(BaseModel):
+    upload_id: str
+    file_key: str
+    file_id: str
+    part_size_bytes: int
+    part_count: int
+    expires_at: str
+
+class MultipartUploadRef(BaseModel):
+    tenant_id: str
+    file_key: str
+    upload_id: str
+
+class MultipartPartsRequest(MultipartUploadRef):
+    part_numbers: List[int] = Field(..., min_length=1, max_length=100)
+    expiration_seconds: int = Field(3600, ge=60, le=604800)
+
+class MultipartPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str
+
+class MultipartCompleteRequest(MultipartUploadRef):
+    parts: List[MultipartPart] = Field(..., min_length=1, max_length=10000)
+
+class PhotoConfirmRequest(BaseModel):
+    tenant_id: str
+    file_key: str
+
+class PhotoBatchDeleteRequest(BaseModel):
+    tenant_id: str
+    file_keys: List[str] = Field(..., min_length=1, max_length=10000)
+
+class PhotoBatchDeleteResponse(BaseModel):
+    deleted: List[str]
+    failed: List[dict]
+
 class PhotoListResponse(BaseModel):
     photos: List[dict]
+    next_cursor: Optional[str] = None
 
 @router.post("/leads/{lead_id}/photos/presign", response_model=PhotoPresignResponse)
 async def presign_photo_upload(lead_id: str, request: PhotoPresignRequest):
@@ -33,9 +100,7 @@ async def presign_photo_upload(lead_id: str, request: PhotoPresignRequest):
     without going through the server, improving performance and reducing load.
     """
     try:
-        s3_client = S3Client()
-        
-        presigned_data = s3_client.generate_presigned_upload_url(
+        presigned_data = await async_s3_client.generate_presigned_upload_url(
             tenant_id=request.tenant_id,
             lead_id=lead_id,
             file_extension=request.file_extension,
@@ -50,6 +115,13 @@ async def presign_photo_upload(lead_id: str, request: PhotoPresignRequest):
         
         return PhotoPresignResponse(**presigned_data)
         
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
     except Exception as e:
         logger.error(
             "Error generating presigned URL",
@@ -62,16 +134,208 @@ async def presign_photo_upload(lead_id: str, request: PhotoPresignRequest):
             detail="Failed to generate upload URL"
         )
 
-@router.get("/leads/{lead_id}/photos/{file_key}/download")
-async def get_photo_download_url(lead_id: str, file_key: str, expiration: int = 3600):
-    """Generate a presigned URL for photo download"""
+@router.post("/leads/{lead_id}/photos/presign/batch", response_model=PhotoBatchPresignResponse)
+async def presign_photo_uploads(lead_id: str, request: PhotoBatchPresignRequest):
+    """
+    Generate presigned URLs for several photo uploads in one request
+    
+    Saves a round trip per photo on mobile networks. Each upload is bound
+    to its declared content type and size.
+    """
+    try:
+        files = [
+            {
+                "file_extension": file.file_extension.lower(),
+                "content_type": (
+                    file.content_type
+                    or mimetypes.guess_type(f"upload.{file.file_extension.lower()}")[0]
+                    or f"image/{file.file_extension.lower()}"
+                ),
+                "max_size": file.size_bytes
+            }
+            for file in request.files
+        ]
+        
+        # A guessed type must still be an image, or derivative jobs would fail forever
+        not_images = [file["file_extension"] for file in files if not file["content_type"].startswith("image/")]
+        if not_images:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Not an image extension: {', '.join(not_images)}"
+            )
+        
+        uploads = await async_s3_client.generate_presigned_upload_urls(
+            tenant_id=request.tenant_id,
+            lead_id=lead_id,
+            files=files,
+            expiration=request.expiration_seconds
+        )
+        
+        if not uploads:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo upload service not available"
+            )
+        
+        return PhotoBatchPresignResponse(uploads=uploads)
+        
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
+    except Exception as e:
+        logger.error(
+            "Error generating presigned URLs",
+            error=str(e),
+            lead_id=lead_id,
+            tenant_id=request.tenant_id
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate upload URLs"
+        )
+
+async def _record_uploaded_photo(
+    tenant_id: str,
+    lead_id: str,
+    file_key: str,
+    metadata: Optional[dict] = None
+) -> Optional[dict]:
+    """
+    Index an object that has landed in S3 and schedule its follow-up work
+    
+    Args:
+        metadata: The object's HEAD result, if the caller already fetched it
+    
+    Returns:
+        The indexed photo record, or None if the object does not exist
+    """
+    metadata = metadata or await async_s3_client.get_photo_metadata(file_key)
+    if not metadata:
+        return None
+    
+    photo = {
+        "file_key": file_key,
+        "size_bytes": metadata["size_bytes"],
+        "etag": metadata["etag"],
+        "content_type": metadata["content_type"],
+        "last_modified": metadata["last_modified"]
+    }
+    photo_index.record_photo(tenant_id, lead_id, photo)
+    
+    # Only still images get resized copies; videos are served as uploaded
+    if (photo["content_type"] or "").startswith("image/"):
+        jitter_queue.enqueue_delayed(
+            key="PHOTO_DERIVATIVES",
+            payload={"file_key": file_key},
+            delay_seconds=0,
+            tenant_id=tenant_id
+        )
+    
+    # Starts the tenant's periodic reconciliation, or re-arms it if a run was lost
+    photo_index.register_tenant(tenant_id)
+    jitter_queue.ensure_periodic(
+        key="PHOTO_INDEX_RECONCILE",
+        interval_seconds=settings.PHOTO_INDEX_RECONCILE_INTERVAL_SECONDS,
+        tenant_id=tenant_id,
+        delay_seconds=0
+    )
+    
+    return photo
+
+@router.post("/leads/{lead_id}/photos/confirm")
+async def confirm_photo_upload(lead_id: str, request: PhotoConfirmRequest):
+    """
+    Record a completed upload in the photo index
+    
+    Clients call this after their presigned POST succeeds. The object is
+    checked with a HEAD request so only photos that actually landed in S3
+    are indexed.
+    """
     try:
-        s3_client = S3Client()
+        if parse_photo_key(request.file_key) != (request.tenant_id, lead_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File key does not belong to this lead"
+            )
+        
+        photo = await _record_uploaded_photo(request.tenant_id, lead_id, request.file_key)
+        
+        if not photo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Uploaded photo not found"
+            )
         
-        download_url = s3_client.generate_presigned_download_url(
-            file_key=file_key,
-            expiration=expiration
+        return {"status": "confirmed", "photo": photo}
+        
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
+    except Exception as e:
+        logger.error(
+            "Error confirming photo upload",
+            error=str(e),
+            lead_id=lead_id,
+            file_key=request.file_key
         )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to confirm upload"
+        )
+
+@router.get("/leads/{lead_id}/photos/{file_key:path}/download")
+async def get_photo_download_url(
+    lead_id: str,
+    file_key: str,
+    expiration: Optional[int] = Query(None, ge=60, le=604800),
+    size: str = Query("original", pattern="^(original|thumb|web)$"),
+    image_format: str = Query("webp", alias="format", pattern=f"^({'|'.join(DERIVATIVE_FORMATS)})$")
+):
+    """
+    Generate a presigned URL for photo download
+    
+    `size=thumb` or `size=web` returns a resized derivative once the worker
+    has produced it; until then the original is returned and `size` in the
+    response says so.
+    
+    Without an explicit `expiration`, URLs come from the presigned URL cache
+    and stay byte-identical for the current time bucket, so browsers and
+    CDNs can cache the image.
+    """
+    try:
+        served_size = "original"
+        object_key = file_key
+        
+        if size != "original":
+            parsed_key = parse_photo_key(file_key)
+            photo = photo_index.get_photo(parsed_key[0], parsed_key[1], file_key) if parsed_key else None
+            if photo and size in photo.get("derivatives", []):
+                served_size = size
+                object_key = derivative_key(file_key, size, image_format)
+        
+        if expiration is None:
+            async def sign(expires_in: int) -> Optional[str]:
+                return await async_s3_client.generate_presigned_download_url(
+                    file_key=object_key,
+                    expiration=expires_in
+                )
+            
+            cached = await presigned_url_cache.get_or_sign(object_key, sign)
+            download_url, expires_in = cached if cached else (None, None)
+        else:
+            download_url = await async_s3_client.generate_presigned_download_url(
+                file_key=object_key,
+                expiration=expiration
+            )
+            expires_in = expiration
         
         if not download_url:
             raise HTTPException(
@@ -81,9 +345,17 @@ async def get_photo_download_url(lead_id: str, file_key: str, expiration: int =
         
         return {
             "download_url": download_url,
-            "expires_in_seconds": expiration
+            "expires_in_seconds": expires_in,
+            "size": served_size
         }
         
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
     except Exception as e:
         logger.error(
             "Error generating download URL",
@@ -97,18 +369,59 @@ async def get_photo_download_url(lead_id: str, file_key: str, expiration: int =
         )
 
 @router.get("/leads/{lead_id}/photos", response_model=PhotoListResponse)
-async def list_lead_photos(lead_id: str, tenant_id: str):
-    """List all photos for a lead"""
+async def list_lead_photos(
+    lead_id: str,
+    tenant_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    List photos for a lead, one page at a time
+    
+    Served from the photo index when the tenant is indexed; otherwise pages
+    are listed from S3. Pass the returned next_cursor back as `cursor` to
+    fetch the next page; next_cursor is null on the last page.
+    """
     try:
-        s3_client = S3Client()
+        if not cursor or photo_index.is_index_cursor(cursor):
+            indexed_page = photo_index.get_lead_photos_page(tenant_id, lead_id, limit, cursor)
+            if indexed_page is not None:
+                return PhotoListResponse(**indexed_page)
+            
+            if cursor:
+                # An index cursor can't be resumed from an S3 listing
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Photo index not available"
+                )
         
-        photos = s3_client.list_tenant_photos(
+        page = await async_s3_client.list_photos_page(
             tenant_id=tenant_id,
-            lead_id=lead_id
+            lead_id=lead_id,
+            page_size=limit,
+            continuation_token=cursor
         )
         
-        return PhotoListResponse(photos=photos)
+        if page is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo storage not available"
+            )
+        
+        return PhotoListResponse(**page)
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
     except Exception as e:
         logger.error(
             "Error listing photos",
@@ -121,13 +434,71 @@ async def list_lead_photos(lead_id: str, tenant_id: str):
             detail="Failed to list photos"
         )
 
-@router.delete("/leads/{lead_id}/photos/{file_key}")
+@router.post("/leads/{lead_id}/photos/delete", response_model=PhotoBatchDeleteResponse)
+async def delete_lead_photos(lead_id: str, request: PhotoBatchDeleteRequest):
+    """
+    Delete many photos for a lead in batched S3 DeleteObjects calls
+    
+    Failures are reported per key; keys outside the lead are rejected
+    without touching S3.
+    """
+    try:
+        owned_keys = []
+        failed = []
+        for file_key in dict.fromkeys(request.file_keys):
+            if parse_photo_key(file_key) == (request.tenant_id, lead_id):
+                owned_keys.append(file_key)
+            else:
+                failed.append({"file_key": file_key, "error": "Key does not belong to this lead"})
+        
+        result = await async_s3_client.delete_photos(owned_keys)
+        
+        if result["deleted"]:
+            photo_index.remove_photos(result["deleted"])
+            
+            derived = await async_s3_client.delete_photos(
+                [key for file_key in result["deleted"] for key in derivative_keys(file_key)]
+            )
+            if derived["failed"]:
+                logger.warning("Failed to delete some photo derivatives", count=len(derived["failed"]))
+        
+        logger.info(
+            "Batch photo delete",
+            lead_id=lead_id,
+            tenant_id=request.tenant_id,
+            deleted=len(result["deleted"]),
+            failed=len(result["failed"]) + len(failed)
+        )
+        
+        return PhotoBatchDeleteResponse(
+            deleted=result["deleted"],
+            failed=failed + result["failed"]
+        )
+        
+    except Exception as e:
+        logger.error(
+            "Error deleting photos",
+            error=str(e),
+            lead_id=lead_id,
+            tenant_id=request.tenant_id
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete photos"
+        )
+
+@router.delete("/leads/{lead_id}/photos/{file_key:path}")
 async def delete_lead_photo(lead_id: str, file_key: str):
-    """Delete a photo"""
+    """Delete a photo along with its derivatives and index entry"""
     try:
-        s3_client = S3Client()
+        parsed_key = parse_photo_key(file_key)
+        if not parsed_key or parsed_key[1] != lead_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File key does not belong to this lead"
+            )
         
-        success = s3_client.delete_photo(file_key)
+        success = await async_s3_client.delete_photo(file_key)
         
         if not success:
             raise HTTPException(
@@ -135,8 +506,18 @@ async def delete_lead_photo(lead_id: str, file_key: str):
                 detail="Photo not found or delete failed"
             )
         
+        photo_index.remove_photo(parsed_key[0], parsed_key[1], file_key)
+        await async_s3_client.delete_photos(derivative_keys(file_key))
+        
         return {"status": "deleted"}
         
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
     except Exception as e:
         logger.error(
             "Error deleting photo",
@@ -147,4 +528,254 @@ async def delete_lead_photo(lead_id: str, file_key: str):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete photo"
-        )
\ No newline at end of file
+        )
+
+async def _stream_photo_ndjson(tenant_id: str) -> AsyncIterator[bytes]:
+    """Encode a tenant's photos as NDJSON, one S3 page at a time"""
+    count = 0
+    try:
+        async for photos in async_s3_client.stream_photo_pages(tenant_id=tenant_id):
+            yield "".join(json.dumps(photo, default=str) + "\n" for photo in photos).encode()
+            count += len(photos)
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.error("Photo export interrupted", error=str(e), tenant_id=tenant_id, exported=count)
+        yield (json.dumps({"error": "Export interrupted", "exported": count}) + "\n").encode()
+        return
+    
+    logger.info("Photo export completed", tenant_id=tenant_id, exported=count)
+
+def _check_lead_key(tenant_id: str, lead_id: str, file_key: str):
+    if parse_photo_key(file_key) != (tenant_id, lead_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File key does not belong to this lead"
+        )
+
+def _storage_error(message: str, error: Exception, **context) -> HTTPException:
+    if isinstance(error, asyncio.TimeoutError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Photo storage timed out"
+        )
+    
+    logger.error(message, error=str(error), **context)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=message
+    )
+
+@router.post("/leads/{lead_id}/media/multipart", response_model=MultipartCreateResponse)
+async def create_multipart_upload(lead_id: str, request: MultipartCreateRequest):
+    """
+    Start a resumable multipart upload for large media such as videos
+    
+    The client uploads fixed-size parts in parallel to URLs from the parts
+    endpoint, can list what already landed after a dropped connection, and
+    finishes with complete (or abort). Uploads left unfinished are aborted
+    by the worker after S3_MULTIPART_UPLOAD_TTL_SECONDS.
+    """
+    try:
+        # S3 allows at most 10,000 parts; grow the part size for huge files
+        part_size = max(settings.S3_MULTIPART_PART_SIZE_BYTES, math.ceil(request.size_bytes / 10000))
+        
+        upload = await async_s3_client.create_multipart_upload(
+            tenant_id=request.tenant_id,
+            lead_id=lead_id,
+            file_extension=request.file_extension.lower(),
+            content_type=request.content_type,
+            size_bytes=request.size_bytes
+        )
+        
+        if not upload:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo upload service not available"
+            )
+        
+        jitter_queue.enqueue_delayed(
+            key="MULTIPART_UPLOAD_SWEEP",
+            payload={"file_key": upload["file_key"], "upload_id": upload["upload_id"]},
+            delay_seconds=settings.S3_MULTIPART_UPLOAD_TTL_SECONDS,
+            tenant_id=request.tenant_id
+        )
+        
+        return MultipartCreateResponse(
+            **upload,
+            part_size_bytes=part_size,
+            part_count=math.ceil(request.size_bytes / part_size),
+            expires_at=(datetime.utcnow() + timedelta(seconds=settings.S3_MULTIPART_UPLOAD_TTL_SECONDS)).isoformat()
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _storage_error("Failed to start multipart upload", e, lead_id=lead_id, tenant_id=request.tenant_id)
+
+@router.post("/leads/{lead_id}/media/multipart/parts")
+async def presign_multipart_parts(lead_id: str, request: MultipartPartsRequest):
+    """Presign upload URLs for a batch of parts (up to 100 per call)"""
+    _check_lead_key(request.tenant_id, lead_id, request.file_key)
+    
+    if any(part_number < 1 or part_number > 10000 for part_number in request.part_numbers):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Part numbers must be between 1 and 10000"
+        )
+    
+    try:
+        parts = await async_s3_client.generate_presigned_part_urls(
+            file_key=request.file_key,
+            upload_id=request.upload_id,
+            part_numbers=request.part_numbers,
+            expiration=request.expiration_seconds
+        )
+        
+        if parts is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo upload service not available"
+            )
+        
+        return {"parts": parts, "expires_in_seconds": request.expiration_seconds}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _storage_error("Failed to presign upload parts", e, lead_id=lead_id, file_key=request.file_key)
+
+@router.get("/leads/{lead_id}/media/multipart/parts")
+async def list_multipart_parts(lead_id: str, tenant_id: str, file_key: str, upload_id: str):
+    """List parts already stored, so an interrupted upload can resume"""
+    _check_lead_key(tenant_id, lead_id, file_key)
+    
+    try:
+        parts = await async_s3_client.list_uploaded_parts(file_key=file_key, upload_id=upload_id)
+        
+        if parts is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found or service unavailable"
+            )
+        
+        return {"parts": parts}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _storage_error("Failed to list upload parts", e, lead_id=lead_id, file_key=file_key)
+
+@router.post("/leads/{lead_id}/media/multipart/complete")
+async def complete_multipart_upload(lead_id: str, request: MultipartCompleteRequest):
+    """
+    Assemble the uploaded parts and index the finished object
+    
+    Presigned part URLs don't limit how much is uploaded, so the assembled
+    object is checked against S3_MULTIPART_MAX_BYTES and the size declared
+    when the upload started, and deleted if it doesn't match.
+    """
+    _check_lead_key(request.tenant_id, lead_id, request.file_key)
+    
+    try:
+        success = await async_s3_client.complete_multipart_upload(
+            file_key=request.file_key,
+            upload_id=request.upload_id,
+            parts=[part.model_dump() for part in request.parts]
+        )
+        
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to complete upload; check part numbers and ETags"
+            )
+        
+        metadata = await async_s3_client.get_photo_metadata(request.file_key)
+        if not metadata:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo upload service not available"
+            )
+        
+        size_bytes = metadata["size_bytes"] or 0
+        declared_size = (metadata.get("metadata") or {}).get("declared-size")
+        if size_bytes > settings.S3_MULTIPART_MAX_BYTES:
+            await async_s3_client.delete_photo(request.file_key)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload exceeds {settings.S3_MULTIPART_MAX_BYTES} bytes"
+            )
+        if declared_size and size_bytes != int(declared_size):
+            await async_s3_client.delete_photo(request.file_key)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded size does not match the size declared at start"
+            )
+        
+        photo = await _record_uploaded_photo(request.tenant_id, lead_id, request.file_key, metadata)
+        
+        return {"status": "completed", "photo": photo}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _storage_error("Failed to complete multipart upload", e, lead_id=lead_id, file_key=request.file_key)
+
+@router.post("/leads/{lead_id}/media/multipart/abort")
+async def abort_multipart_upload(lead_id: str, request: MultipartUploadRef):
+    """Abort an upload and discard its stored parts"""
+    _check_lead_key(request.tenant_id, lead_id, request.file_key)
+    
+    try:
+        success = await async_s3_client.abort_multipart_upload(
+            file_key=request.file_key,
+            upload_id=request.upload_id
+        )
+        
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo upload service not available"
+            )
+        
+        return {"status": "aborted"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _storage_error("Failed to abort multipart upload", e, lead_id=lead_id, file_key=request.file_key)
+
+@router.post("/tenants/{tenant_id}/photos/purge", status_code=status.HTTP_202_ACCEPTED)
+async def purge_tenant_photos(tenant_id: str):
+    """
+    Schedule deletion of every photo for a tenant
+    
+    The worker streams the tenant prefix and deletes it page by page, so
+    data-deletion requests of any size return immediately.
+    """
+    task_id = jitter_queue.enqueue_delayed(
+        key="PHOTO_PURGE",
+        payload={},
+        delay_seconds=0,
+        tenant_id=tenant_id
+    )
+    
+    if not task_id:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Task queue not available"
+        )
+    
+    return {"status": "scheduled", "task_id": task_id}
+
+@router.get("/tenants/{tenant_id}/photos/export")
+async def export_tenant_photos(tenant_id: str):
+    """
+    Stream every photo for a tenant as NDJSON
+    
+    Pages are fetched from S3 as the client reads, so memory stays bounded
+    regardless of how many photos the tenant has.
+    """
+    return StreamingResponse(
+        _stream_photo_ndjson(tenant_id),
+        media_type="application/x-ndjson"
+    )
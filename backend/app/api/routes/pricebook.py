@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel
+from typing import Dict
+import structlog
+from app.services.pricebook import pricebook_store
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+class PriceBookRules(BaseModel):
+    base_prices: Dict[str, float] = {}
+    per_sqft_rates: Dict[str, float] = {}
+    severity_multipliers: Dict[str, float] = {}
+    material_multipliers: Dict[str, float] = {}
+
+def _not_available():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="PriceBook storage not available"
+    )
+
+@router.get("/tenants/{tenant_id}/pricebook")
+async def get_pricebook(tenant_id: str):
+    """Get a tenant's pricing overrides (empty when on default pricing)"""
+    stored = pricebook_store.get_rules(tenant_id) or {}
+    
+    return {
+        "tenant_id": tenant_id,
+        "version": stored.get("version", 0),
+        "rules": stored.get("rules") or {}
+    }
+
+@router.put("/tenants/{tenant_id}/pricebook")
+async def update_pricebook(tenant_id: str, rules: PriceBookRules):
+    """
+    Replace a tenant's pricing overrides
+    
+    Anything not overridden falls back to the default PriceBook. Every API
+    and worker process picks up the new version without a restart.
+    """
+    try:
+        version = pricebook_store.save_rules(
+            tenant_id,
+            {section: overrides for section, overrides in rules.model_dump().items() if overrides}
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if version is None:
+        raise _not_available()
+    
+    return {"tenant_id": tenant_id, "version": version}
+
+@router.delete("/tenants/{tenant_id}/pricebook")
+async def reset_pricebook(tenant_id: str):
+    """Revert a tenant to default pricing"""
+    version = pricebook_store.delete_rules(tenant_id)
+    if version is None:
+        raise _not_available()
+    
+    return {"tenant_id": tenant_id, "version": version}
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel
+from zoneinfo import ZoneInfo
+import structlog
+from app.core.config import settings
+from app.services.tenant_phone_numbers import tenant_phone_numbers
+from app.services.tenant_sms_settings import tenant_sms_settings
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+class SmsSettings(BaseModel):
+    gsm7_only: bool = False
+    timezone: str = settings.DEFAULT_TIMEZONE
+
+class SmsPreviewRequest(BaseModel):
+    body: str
+
+@router.get("/tenants/{tenant_id}/sms-settings")
+async def get_sms_settings(tenant_id: str):
+    """Get a tenant's outbound SMS settings"""
+    return {"tenant_id": tenant_id, **tenant_sms_settings.get(tenant_id)}
+
+@router.put("/tenants/{tenant_id}/sms-settings")
+async def update_sms_settings(tenant_id: str, sms_settings: SmsSettings):
+    """
+    Replace a tenant's outbound SMS settings
+
+    With gsm7_only on, emoji and other characters that force UCS-2 encoding
+    are replaced or dropped before sending. Dates in message templates are
+    shown in the tenant's timezone (an IANA name such as America/Chicago).
+    """
+    try:
+        ZoneInfo(sms_settings.timezone)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone: {sms_settings.timezone}"
+        )
+
+    if not tenant_sms_settings.save(tenant_id, sms_settings.model_dump()):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="SMS settings storage not available"
+        )
+
+    return {"tenant_id": tenant_id, **sms_settings.model_dump()}
+
+@router.post("/tenants/{tenant_id}/sms-preview")
+async def preview_sms(tenant_id: str, request: SmsPreviewRequest):
+    """Render a message body as the tenant would send it, with its segment count"""
+    body, (encoding, units, segments) = tenant_sms_settings.render(tenant_id, request.body)
+
+    return {
+        "tenant_id": tenant_id,
+        "body": body,
+        "encoding": encoding,
+        "units": units,
+        "segments": segments
+    }
+
+@router.put("/tenants/{tenant_id}/phone-numbers/{phone_number}")
+async def assign_phone_number(tenant_id: str, phone_number: str):
+    """
+    Route inbound calls and texts to a business phone number to this tenant
+
+    Other processes pick up the change within SMS_SETTINGS_CACHE_TTL_SECONDS.
+    """
+    if not tenant_phone_numbers.assign(phone_number, tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Phone number storage not available"
+        )
+
+    return {"tenant_id": tenant_id, "phone_number": phone_number}
+
+@router.delete("/tenants/{tenant_id}/phone-numbers/{phone_number}")
+async def release_phone_number(tenant_id: str, phone_number: str):
+    """Return a business phone number to the default tenant"""
+    if tenant_phone_numbers.resolve(phone_number) != tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Phone number not assigned to this tenant"
+        )
+
+    if not tenant_phone_numbers.release(phone_number):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Phone number storage not available"
+        )
+
+    return {"tenant_id": tenant_id, "phone_number": phone_number, "status": "released"}
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel
+from typing import Dict
+import structlog
+from app.services.message_templates import DEFAULT_TEMPLATES, TEMPLATE_FIELDS, message_templates
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+class MessageTemplates(BaseModel):
+    templates: Dict[str, str] = {}
+
+def _not_available():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Template storage not available"
+    )
+
+@router.get("/tenants/{tenant_id}/templates")
+async def get_templates(tenant_id: str):
+    """Get a tenant's template overrides, with the defaults and placeholders each template accepts"""
+    stored = message_templates.get_templates(tenant_id) or {}
+    
+    return {
+        "tenant_id": tenant_id,
+        "version": stored.get("version", 0),
+        "templates": stored.get("templates") or {},
+        "defaults": DEFAULT_TEMPLATES,
+        "fields": {name: sorted(fields) for name, fields in TEMPLATE_FIELDS.items()}
+    }
+
+@router.put("/tenants/{tenant_id}/templates")
+async def update_templates(tenant_id: str, body: MessageTemplates):
+    """
+    Replace a tenant's template overrides
+    
+    Templates not overridden use the defaults. Every API and worker process
+    picks up the new version without a restart.
+    """
+    try:
+        version = message_templates.save_templates(tenant_id, body.templates)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if version is None:
+        raise _not_available()
+    
+    return {"tenant_id": tenant_id, "version": version}
+
+@router.delete("/tenants/{tenant_id}/templates")
+async def reset_templates(tenant_id: str):
+    """Revert a tenant to the default templates"""
+    version = message_templates.delete_templates(tenant_id)
+    if version is None:
+        raise _not_available()
+    
+    return {"tenant_id": tenant_id, "version": version}
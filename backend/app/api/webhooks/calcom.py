@@ -6,8 +6,10 @@ from typing import Dict, Any
 import structlog
 
 from app.core.config import settings
-from app.integrations.twilio_client import TwilioClient
-from app.integrations.google_calendar_client import GoogleCalendarClient
+from app.services.sms_outbox import sms_outbox
+from app.services.message_templates import message_templates
+from app.services.booking_events import booking_event_links
+from app.integrations.google_calendar_client import GoogleCalendarClient, calendar_batch_writer
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -118,8 +120,8 @@ async def handle_booking_created(booking_data: Dict[str, Any]):
         # Create Google Calendar event
         if start_time and end_time:
             try:
-                # For now, use default tenant - in production, determine from booking
-                tenant_id = "default-tenant"
+                # Cal.com bookings don't identify a tenant; they belong to the configured default
+                tenant_id = settings.DEFAULT_TENANT_ID
                 
                 start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
                 end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
@@ -132,7 +134,8 @@ async def handle_booking_created(booking_data: Dict[str, Any]):
                     service_type="Pressure Washing",
                     start_time=start_dt,
                     duration_minutes=int((end_dt - start_dt).total_seconds() / 60),
-                    location=location
+                    location=location,
+                    booking_uid=booking_uid
                 )
                 
             except Exception as e:
@@ -162,7 +165,15 @@ async def handle_booking_cancelled(booking_data: Dict[str, Any]):
                 )
         
         # TODO: Update internal booking status to cancelled
-        # TODO: Delete or update Google Calendar event
+        
+        # Remove the Google Calendar event, which may have been created for
+        # an earlier booking if this one was rescheduled
+        booking_uid = booking_data.get("uid")
+        if booking_uid:
+            # Cal.com bookings don't identify a tenant; they belong to the configured default
+            tenant_id = settings.DEFAULT_TENANT_ID
+            
+            await calendar_batch_writer.delete_event(tenant_id, booking_event_links.resolve(booking_uid))
         
         logger.info("Booking cancellation handled", booking_id=booking_id)
         
@@ -190,7 +201,31 @@ async def handle_booking_rescheduled(booking_data: Dict[str, Any]):
                 )
         
         # TODO: Update internal booking record
-        # TODO: Update Google Calendar event
+        
+        # Move the Google Calendar event created for the original booking
+        original_uid = booking_data.get("rescheduleUid") or booking_data.get("fromReschedule")
+        new_end_time = booking_data.get("endTime")
+        if original_uid:
+            # The new booking UID keeps addressing the original event, so a
+            # second reschedule or a cancellation finds it
+            event_id = booking_event_links.link(booking_data.get("uid") or original_uid, original_uid)
+        
+        if original_uid and new_start_time and new_end_time:
+            # Cal.com bookings don't identify a tenant; they belong to the configured default
+            tenant_id = settings.DEFAULT_TENANT_ID
+            
+            start_dt = datetime.fromisoformat(new_start_time.replace('Z', '+00:00'))
+            end_dt = datetime.fromisoformat(new_end_time.replace('Z', '+00:00'))
+            
+            # A single PATCH of the changed fields, no read beforehand
+            await calendar_batch_writer.patch_event(
+                tenant_id,
+                event_id,
+                {
+                    "start": GoogleCalendarClient.event_time(start_dt),
+                    "end": GoogleCalendarClient.event_time(end_dt)
+                }
+            )
         
         logger.info("Booking reschedule handled", booking_id=booking_id)
         
@@ -205,22 +240,32 @@ async def send_booking_confirmation_sms(
 ):
     """Send booking confirmation SMS"""
     try:
-        # Parse and format appointment time
-        appointment_dt = datetime.fromisoformat(appointment_time.replace('Z', '+00:00'))
-        formatted_time = appointment_dt.strftime("%A, %B %d at %I:%M %p")
+        # Cal.com bookings don't identify a tenant; they belong to the configured default
+        tenant_id = settings.DEFAULT_TENANT_ID
         
-        message = f"Hi {customer_name}! 📅 Your pressure washing appointment is confirmed for {formatted_time}."
+        # Formatted in the tenant's timezone by the template
+        appointment_dt = datetime.fromisoformat(appointment_time.replace('Z', '+00:00'))
         
         if location:
-            message += f" Location: {location}."
-        
-        message += " We'll text you when we're on our way. Thanks for choosing us!"
+            message = message_templates.render(
+                tenant_id,
+                "booking_confirmation_with_location",
+                customer_name=customer_name,
+                appointment_time=appointment_dt,
+                location=location
+            )
+        else:
+            message = message_templates.render(
+                tenant_id,
+                "booking_confirmation",
+                customer_name=customer_name,
+                appointment_time=appointment_dt
+            )
         
-        twilio_client = TwilioClient()
-        success = await twilio_client.send_sms(phone, message)
+        success = await sms_outbox.send(phone, message, tenant_id=tenant_id)
         
         if success:
-            logger.info("Booking confirmation SMS sent", phone=phone, customer_name=customer_name)
+            logger.info("Booking confirmation SMS queued", phone=phone, customer_name=customer_name)
         
     except Exception as e:
         logger.error("Error sending booking confirmation SMS", error=str(e), phone=phone)
@@ -228,15 +273,14 @@ async def send_booking_confirmation_sms(
 async def send_cancellation_sms(phone: str, customer_name: str):
     """Send booking cancellation SMS"""
     try:
-        message = (
-            f"Hi {customer_name}, your appointment has been cancelled. "
-            "If you'd like to reschedule, just reply or call us anytime!"
-        )
+        # Cal.com bookings don't identify a tenant; they belong to the configured default
+        tenant_id = settings.DEFAULT_TENANT_ID
+        
+        message = message_templates.render(tenant_id, "booking_cancellation", customer_name=customer_name)
         
-        twilio_client = TwilioClient()
-        await twilio_client.send_sms(phone, message)
+        await sms_outbox.send(phone, message, tenant_id=tenant_id)
         
-        logger.info("Cancellation SMS sent", phone=phone, customer_name=customer_name)
+        logger.info("Cancellation SMS queued", phone=phone, customer_name=customer_name)
         
     except Exception as e:
         logger.error("Error sending cancellation SMS", error=str(e), phone=phone)
@@ -244,19 +288,22 @@ async def send_cancellation_sms(phone: str, customer_name: str):
 async def send_reschedule_sms(phone: str, customer_name: str, new_appointment_time: str):
     """Send booking reschedule SMS"""
     try:
-        # Parse and format new appointment time
+        # Cal.com bookings don't identify a tenant; they belong to the configured default
+        tenant_id = settings.DEFAULT_TENANT_ID
+        
+        # Formatted in the tenant's timezone by the template
         appointment_dt = datetime.fromisoformat(new_appointment_time.replace('Z', '+00:00'))
-        formatted_time = appointment_dt.strftime("%A, %B %d at %I:%M %p")
         
-        message = (
-            f"Hi {customer_name}! Your appointment has been rescheduled to "
-            f"{formatted_time}. Thanks for your flexibility!"
+        message = message_templates.render(
+            tenant_id,
+            "booking_reschedule",
+            customer_name=customer_name,
+            appointment_time=appointment_dt
         )
         
-        twilio_client = TwilioClient()
-        await twilio_client.send_sms(phone, message)
+        await sms_outbox.send(phone, message, tenant_id=tenant_id)
         
-        logger.info("Reschedule SMS sent", phone=phone, customer_name=customer_name)
+        logger.info("Reschedule SMS queued", phone=phone, customer_name=customer_name)
         
     except Exception as e:
         logger.error("Error sending reschedule SMS", error=str(e), phone=phone)
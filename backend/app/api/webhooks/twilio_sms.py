@@ -0,0 +1,109 @@
+import asyncio
+from fastapi import APIRouter, Request, Form, HTTPException, Response
+from typing import Any, Dict, Optional
+import structlog
+
+from app.integrations.twilio_client import TwilioClient
+from app.services.conversation_buffer import conversation_buffer
+from app.services.sms_opt_outs import sms_opt_outs
+from app.services.tenant_phone_numbers import tenant_phone_numbers
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+@router.post("/twilio/sms")
+async def twilio_sms_webhook(
+    request: Request,
+    MessageSid: str = Form(...),
+    From: str = Form(...),
+    To: str = Form(...),
+    Body: str = Form(""),
+    NumMedia: Optional[int] = Form(None),
+):
+    """
+    Handle Twilio inbound SMS webhook for text quotes
+    
+    Buffers the message with the rest of the customer's burst; once the
+    conversation goes quiet the worker quotes the burst as one message and
+    queues a jittered reply
+    """
+    try:
+        # Validate webhook signature
+        twilio_client = TwilioClient()
+        signature = request.headers.get("X-Twilio-Signature", "")
+        url = str(request.url)
+        
+        # Get form data for validation
+        form_data = await request.form()
+        params = dict(form_data)
+        
+        if not twilio_client.validate_webhook(url, params, signature):
+            logger.warning("Invalid Twilio webhook signature")
+            raise HTTPException(status_code=401, detail="Invalid signature")
+        
+        logger.info(
+            "Received Twilio SMS webhook",
+            message_sid=MessageSid,
+            from_number=From,
+            to_number=To,
+            num_media=NumMedia
+        )
+        
+        # Tenant lookup, opt-outs and the buffer are blocking Redis I/O
+        loop = asyncio.get_event_loop()
+        recorded = await loop.run_in_executor(None, record_inbound_sms, {
+            "message_sid": MessageSid,
+            "from_number": From,
+            "to_number": To,
+            "body": Body,
+            "num_media": NumMedia or 0
+        })
+        
+        if not recorded:
+            raise HTTPException(status_code=503, detail="Message could not be buffered")
+        
+        # Return empty TwiML response
+        return Response(
+            content='<?xml version="1.0" encoding="UTF-8"?><Response></Response>',
+            media_type="application/xml"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error processing Twilio SMS webhook", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def record_inbound_sms(message: Dict[str, Any]) -> bool:
+    """
+    Record an inbound text against the tenant that owns the number it was sent to
+    
+    Twilio's opt-out handling already answers STOP/START/HELP; they are
+    recorded here and never reach the quote pipeline. Texts from opted-out
+    numbers are skipped and everything else is buffered for quoting.
+    
+    Args:
+        message: Inbound message with message_sid, from_number, to_number,
+            body and num_media
+    
+    Returns:
+        False if the text should have been buffered but wasn't
+    """
+    tenant_id = tenant_phone_numbers.resolve(message["to_number"])
+    from_number = message["from_number"]
+    body = message["body"]
+    
+    if TwilioClient.is_stop_command(body):
+        sms_opt_outs.opt_out(tenant_id, from_number)
+    elif TwilioClient.is_start_command(body):
+        sms_opt_outs.opt_in(tenant_id, from_number)
+    elif TwilioClient.is_help_command(body):
+        logger.info("Skipping help keyword", message_sid=message["message_sid"])
+    elif sms_opt_outs.is_opted_out(tenant_id, from_number):
+        logger.info("Skipping message from opted-out number", message_sid=message["message_sid"], tenant_id=tenant_id)
+    elif body.strip() or message["num_media"]:
+        buffered = conversation_buffer.append(tenant_id, message)
+        logger.info("Buffered inbound SMS", buffered=buffered, message_sid=message["message_sid"])
+        return buffered
+    
+    return True
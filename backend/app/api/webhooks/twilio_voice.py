@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, Request, Form, HTTPException, Response
 from typing import Optional
 import structlog
@@ -6,6 +7,8 @@ import random
 from app.core.config import settings
 from app.integrations.twilio_client import TwilioClient
 from app.services.jitter_queue import JitterQueue
+from app.services.sms_opt_outs import sms_opt_outs
+from app.services.tenant_phone_numbers import tenant_phone_numbers
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -76,6 +79,14 @@ async def handle_missed_call(
 ):
     """Handle missed call by queuing follow-up SMS"""
     try:
+        # Blocking Redis I/O, kept off the event loop
+        loop = asyncio.get_event_loop()
+        tenant_id = await loop.run_in_executor(None, tenant_phone_numbers.resolve, to_number)
+        
+        if await loop.run_in_executor(None, sms_opt_outs.is_opted_out, tenant_id, from_number):
+            logger.info("Skipping missed call SMS to opted-out number", call_sid=call_sid, tenant_id=tenant_id)
+            return
+        
         # Generate jitter delay (10-45 seconds as specified)
         jitter_delay = random.randint(
             settings.JITTER_MIN_SECONDS,
@@ -89,10 +100,6 @@ async def handle_missed_call(
             "original_to": to_number
         }
         
-        # For now, use a default tenant_id
-        # In production, you'd look up the tenant by the business phone number (to_number)
-        tenant_id = "default-tenant"  # TODO: Implement tenant lookup by phone number
-        
         # Enqueue missed call SMS task
         task_id = JitterQueue.enqueue_delayed(
             task_type="MISSED_CALL_SMS",
@@ -34,12 +34,34 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
     GOOGLE_REDIRECT_URI: str = os.getenv("GOOGLE_REDIRECT_URI", "")
+    GOOGLE_CREDENTIAL_REFRESH_LOCK_SECONDS: int = int(os.getenv("GOOGLE_CREDENTIAL_REFRESH_LOCK_SECONDS", "10"))
+    GOOGLE_CALENDAR_API_ENDPOINT: str = os.getenv("GOOGLE_CALENDAR_API_ENDPOINT", "")
+    GOOGLE_CALENDAR_EXECUTOR_MAX_WORKERS: int = int(os.getenv("GOOGLE_CALENDAR_EXECUTOR_MAX_WORKERS", "8"))
+    GOOGLE_CALENDAR_TIMEOUT_SECONDS: int = int(os.getenv("GOOGLE_CALENDAR_TIMEOUT_SECONDS", "10"))
+    GOOGLE_CALENDAR_BATCH_WINDOW_MS: int = int(os.getenv("GOOGLE_CALENDAR_BATCH_WINDOW_MS", "50"))
+    GOOGLE_CALENDAR_BATCH_MAX_SIZE: int = int(os.getenv("GOOGLE_CALENDAR_BATCH_MAX_SIZE", "50"))
+    CALENDAR_SYNC_INTERVAL_SECONDS: int = int(os.getenv("CALENDAR_SYNC_INTERVAL_SECONDS", "300"))
+    CALENDAR_BUSY_INDEX_CHECK_SECONDS: int = int(os.getenv("CALENDAR_BUSY_INDEX_CHECK_SECONDS", "5"))
+    GOOGLE_CALENDAR_SERVICE_CACHE_SIZE: int = int(os.getenv("GOOGLE_CALENDAR_SERVICE_CACHE_SIZE", "256"))
+    GOOGLE_CALENDAR_SERVICE_TTL_SECONDS: int = int(os.getenv("GOOGLE_CALENDAR_SERVICE_TTL_SECONDS", "1800"))
     
     # AWS S3
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "lily-ai-photos")
+    S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "")  # e.g. MinIO or moto_server
+    S3_EXECUTOR_MAX_WORKERS: int = int(os.getenv("S3_EXECUTOR_MAX_WORKERS", "16"))
+    S3_OPERATION_TIMEOUT_SECONDS: float = float(os.getenv("S3_OPERATION_TIMEOUT_SECONDS", "10"))
+    S3_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("S3_CONNECT_TIMEOUT_SECONDS", "3"))
+    S3_READ_TIMEOUT_SECONDS: float = float(os.getenv("S3_READ_TIMEOUT_SECONDS", "8"))
+    S3_MULTIPART_PART_SIZE_BYTES: int = int(os.getenv("S3_MULTIPART_PART_SIZE_BYTES", str(8 * 1024 * 1024)))
+    S3_MULTIPART_MAX_BYTES: int = int(os.getenv("S3_MULTIPART_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+    S3_MULTIPART_UPLOAD_TTL_SECONDS: int = int(os.getenv("S3_MULTIPART_UPLOAD_TTL_SECONDS", "86400"))
+    PRESIGNED_URL_BUCKET_SECONDS: int = int(os.getenv("PRESIGNED_URL_BUCKET_SECONDS", "3600"))
+    PRESIGNED_URL_CACHE_SIZE: int = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "10000"))
+    PHOTO_DERIVATIVE_SPOOL_BYTES: int = int(os.getenv("PHOTO_DERIVATIVE_SPOOL_BYTES", str(2 * 1024 * 1024)))
+    PHOTO_INDEX_RECONCILE_INTERVAL_SECONDS: int = int(os.getenv("PHOTO_INDEX_RECONCILE_INTERVAL_SECONDS", "21600"))
     
     # Cal.com
     CALCOM_API_KEY: str = os.getenv("CALCOM_API_KEY", "")
@@ -47,10 +69,26 @@ class Settings(BaseSettings):
     
     # Application Settings
     DEFAULT_TIMEZONE: str = os.getenv("DEFAULT_TIMEZONE", "America/New_York")
+    DEFAULT_TENANT_ID: str = os.getenv("DEFAULT_TENANT_ID", "default-tenant")
     QUIET_HOURS_START: int = int(os.getenv("QUIET_HOURS_START", "21"))
     QUIET_HOURS_END: int = int(os.getenv("QUIET_HOURS_END", "9"))
+    AVAILABILITY_BUFFER_MINUTES: int = int(os.getenv("AVAILABILITY_BUFFER_MINUTES", "30"))
+    AVAILABILITY_SLOT_STEP_MINUTES: int = int(os.getenv("AVAILABILITY_SLOT_STEP_MINUTES", "30"))
+    PRICEBOOK_CACHE_SIZE: int = int(os.getenv("PRICEBOOK_CACHE_SIZE", "5000"))
+    PRICEBOOK_CACHE_TTL_SECONDS: int = int(os.getenv("PRICEBOOK_CACHE_TTL_SECONDS", "300"))
+    QUOTE_CACHE_SIZE: int = int(os.getenv("QUOTE_CACHE_SIZE", "10000"))
+    QUOTE_MESSAGE_CACHE_SIZE: int = int(os.getenv("QUOTE_MESSAGE_CACHE_SIZE", "10000"))
     JITTER_MIN_SECONDS: int = int(os.getenv("JITTER_MIN_SECONDS", "10"))
     JITTER_MAX_SECONDS: int = int(os.getenv("JITTER_MAX_SECONDS", "45"))
+    CONVERSATION_DEBOUNCE_SECONDS: int = int(os.getenv("CONVERSATION_DEBOUNCE_SECONDS", "8"))
+    CONVERSATION_MAX_WAIT_SECONDS: int = int(os.getenv("CONVERSATION_MAX_WAIT_SECONDS", "30"))
+    SMS_OUTBOX_WINDOW_SECONDS: int = int(os.getenv("SMS_OUTBOX_WINDOW_SECONDS", "5"))
+    SMS_OUTBOX_MERGE: bool = os.getenv("SMS_OUTBOX_MERGE", "true").lower() == "true"
+    SMS_OUTBOX_MAX_SEGMENTS: int = int(os.getenv("SMS_OUTBOX_MAX_SEGMENTS", "2"))
+    SMS_GSM7_ONLY_DEFAULT: bool = os.getenv("SMS_GSM7_ONLY_DEFAULT", "false").lower() == "true"
+    SMS_SETTINGS_CACHE_TTL_SECONDS: int = int(os.getenv("SMS_SETTINGS_CACHE_TTL_SECONDS", "300"))
+    MESSAGE_TEMPLATE_CACHE_SIZE: int = int(os.getenv("MESSAGE_TEMPLATE_CACHE_SIZE", "5000"))
+    MESSAGE_TEMPLATE_CACHE_TTL_SECONDS: int = int(os.getenv("MESSAGE_TEMPLATE_CACHE_TTL_SECONDS", "300"))
     REVIEW_DELAY_HOURS: int = int(os.getenv("REVIEW_DELAY_HOURS", "24"))
     
     # Worker Configuration
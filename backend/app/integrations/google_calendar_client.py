@@ -1,20 +1,120 @@
-import os
+import asyncio
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+import httplib2
 import structlog
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pickle
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
 
 from app.core.config import settings
+from app.integrations.google_credential_store import google_credential_store, SCOPES
 
 logger = structlog.get_logger()
 
-# Scopes required for Google Calendar
-SCOPES = ['https://www.googleapis.com/auth/calendar']
+@lru_cache(maxsize=1)
+def get_calendar_discovery_document() -> Dict[str, Any]:
+    """
+    Load the Calendar v3 discovery document once per process
+    
+    The document ships with google-api-python-client, so no network fetch is
+    needed; building from the parsed dict also skips re-reading and
+    re-parsing the JSON for every service object.
+    """
+    content = discovery_cache.get_static_doc('calendar', 'v3')
+    if content is None:
+        raise RuntimeError("Bundled Calendar v3 discovery document not found")
+    return json.loads(content)
+
+class CalendarSyncTokenExpired(Exception):
+    """The sync token is no longer valid and a full sync is required (HTTP 410)"""
+
+class CalendarServiceCache:
+    """
+    Per-tenant LRU of built Calendar service objects
+    
+    Each service is bound to the credentials object it was built with, so a
+    token refreshed by another replica (a new object from the credential
+    store) gets a fresh service. Entries also expire after
+    GOOGLE_CALENDAR_SERVICE_TTL_SECONDS.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.max_entries = max_entries or settings.GOOGLE_CALENDAR_SERVICE_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or settings.GOOGLE_CALENDAR_SERVICE_TTL_SECONDS
+        self.entries: "OrderedDict[str, Tuple[float, Credentials, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, tenant_id: str, credentials: Credentials, now: Optional[float] = None) -> Optional[Any]:
+        """Return the cached service for a tenant, or None if missing, stale or expired"""
+        now = now if now is not None else time.monotonic()
+        
+        with self.lock:
+            entry = self.entries.get(tenant_id)
+            if entry and entry[1] is credentials and now - entry[0] < self.ttl_seconds:
+                self.entries.move_to_end(tenant_id)
+                self.hits += 1
+                return entry[2]
+            
+            if entry:
+                del self.entries[tenant_id]
+            self.misses += 1
+            return None
+    
+    def put(self, tenant_id: str, credentials: Credentials, service: Any, now: Optional[float] = None):
+        """Cache a service for a tenant, evicting the least recently used"""
+        now = now if now is not None else time.monotonic()
+        
+        with self.lock:
+            self.entries[tenant_id] = (now, credentials, service)
+            self.entries.move_to_end(tenant_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def invalidate(self, tenant_id: str):
+        """Drop a tenant's service, e.g. after its credentials change"""
+        with self.lock:
+            self.entries.pop(tenant_id, None)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries)
+        }
+
+# Global instance
+calendar_service_cache = CalendarServiceCache()
+
+# Blocking SDK calls for every tenant run here, off the event loop
+calendar_executor = ThreadPoolExecutor(
+    max_workers=settings.GOOGLE_CALENDAR_EXECUTOR_MAX_WORKERS,
+    thread_name_prefix="gcal-io"
+)
+
+# httplib2.Http is not thread-safe, so each executor thread keeps its own
+_thread_local = threading.local()
+
+def _thread_http(credentials: Credentials) -> AuthorizedHttp:
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = httplib2.Http(timeout=settings.GOOGLE_CALENDAR_TIMEOUT_SECONDS)
+        _thread_local.http = http
+    return AuthorizedHttp(credentials, http=http)
 
 class GoogleCalendarClient:
     """Google Calendar integration client"""
@@ -22,77 +122,140 @@ class GoogleCalendarClient:
     def __init__(self, tenant_id: str):
         self.tenant_id = tenant_id
         self.service = None
-        self.credentials_file = f"/tmp/google_calendar_credentials_{tenant_id}.json"
-        self.token_file = f"/tmp/google_calendar_token_{tenant_id}.pickle"
+        self.credentials = None
     
-    def _get_credentials(self) -> Optional[Credentials]:
-        """Get or refresh Google API credentials for the tenant"""
-        creds = None
-        
-        # Load existing token
-        if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
-        
-        # If no valid credentials, initiate auth flow
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    logger.warning("Failed to refresh credentials", error=str(e))
-                    creds = None
-            
-            if not creds:
-                # Create credentials file for OAuth flow
-                client_config = {
-                    "installed": {
-                        "client_id": settings.GOOGLE_CLIENT_ID,
-                        "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        "redirect_uris": [settings.GOOGLE_REDIRECT_URI]
-                    }
-                }
-                
-                if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
-                    logger.error("Google Calendar credentials not configured")
-                    return None
-                
-                with open(self.credentials_file, 'w') as f:
-                    json.dump(client_config, f)
-                
-                try:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_file, SCOPES
-                    )
-                    creds = flow.run_local_server(port=0)
-                except Exception as e:
-                    logger.error("Failed to complete OAuth flow", error=str(e))
-                    return None
-            
-            # Save credentials for future use
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+    def authorize_local(self) -> bool:
+        """
+        Run the installed-app OAuth flow in a local browser and store the result
+        
+        For development setups only; production tenants authorize through the
+        web OAuth callback, which saves into the credential store.
+        """
+        if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
+            logger.error("Google Calendar credentials not configured")
+            return False
+        
+        client_config = {
+            "installed": {
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "redirect_uris": [settings.GOOGLE_REDIRECT_URI]
+            }
+        }
         
-        return creds
+        try:
+            flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
+            creds = flow.run_local_server(port=0)
+        except Exception as e:
+            logger.error("Failed to complete OAuth flow", error=str(e))
+            return False
+        
+        calendar_service_cache.invalidate(self.tenant_id)
+        return google_credential_store.save_credentials(self.tenant_id, creds)
     
-    def _get_service(self):
+    async def _get_service(self):
         """Get Google Calendar service instance"""
-        if self.service:
-            return self.service
-        
-        creds = self._get_credentials()
+        creds = await google_credential_store.get_credentials(self.tenant_id)
         if not creds:
             return None
         
+        self.credentials = creds
+        self.service = calendar_service_cache.get(self.tenant_id, creds)
+        if self.service:
+            return self.service
+        
         try:
-            self.service = build('calendar', 'v3', credentials=creds)
+            client_options = None
+            if settings.GOOGLE_CALENDAR_API_ENDPOINT:
+                client_options = {"api_endpoint": settings.GOOGLE_CALENDAR_API_ENDPOINT}
+            
+            self.service = build_from_document(
+                get_calendar_discovery_document(),
+                credentials=creds,
+                client_options=client_options
+            )
+            calendar_service_cache.put(self.tenant_id, creds, self.service)
             return self.service
         except Exception as e:
             logger.error("Failed to build Calendar service", error=str(e))
             return None
     
+    async def _execute(self, operation: str, request: HttpRequest, timeout: Optional[float] = None) -> Any:
+        """
+        Execute an API request on the Calendar executor
+        
+        Raises:
+            asyncio.TimeoutError: If the request exceeds its timeout
+        """
+        loop = asyncio.get_running_loop()
+        timeout = timeout or settings.GOOGLE_CALENDAR_TIMEOUT_SECONDS
+        credentials = self.credentials
+        
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    calendar_executor,
+                    lambda: request.execute(http=_thread_http(credentials))
+                ),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                "Google Calendar request timed out",
+                operation=operation,
+                timeout_seconds=timeout,
+                tenant_id=self.tenant_id
+            )
+            raise
+    
+    @staticmethod
+    def event_time(value: datetime) -> Dict[str, str]:
+        """Format a datetime as an event start/end"""
+        return {
+            'dateTime': value.isoformat(),
+            'timeZone': settings.DEFAULT_TIMEZONE,
+        }
+    
+    @staticmethod
+    def booking_event_id(booking_uid: str) -> str:
+        """
+        Derive a stable Calendar event ID from a Cal.com booking UID
+        
+        Event IDs may use base32hex characters, which include every hex
+        digit. A stable ID makes redelivered creates idempotent and lets
+        reschedules and cancellations address the event without a lookup.
+        """
+        return hashlib.sha1(booking_uid.encode()).hexdigest()
+    
+    @staticmethod
+    def build_event_body(
+        start: datetime,
+        end: datetime,
+        summary: str,
+        description: Optional[str] = None,
+        attendees: Optional[List[str]] = None,
+        location: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build an events.insert request body"""
+        event_body = {
+            'summary': summary,
+            'start': GoogleCalendarClient.event_time(start),
+            'end': GoogleCalendarClient.event_time(end),
+        }
+        
+        if description:
+            event_body['description'] = description
+        
+        if location:
+            event_body['location'] = location
+        
+        if attendees:
+            event_body['attendees'] = [{'email': email} for email in attendees]
+        
+        return event_body
+    
     async def create_event(
         self,
         start: datetime,
@@ -118,38 +281,19 @@ class GoogleCalendarClient:
         Returns:
             Created event data or None if failed
         """
-        service = self._get_service()
+        service = await self._get_service()
         if not service:
             logger.error("Google Calendar service not available")
             return None
         
         try:
-            event_body = {
-                'summary': summary,
-                'start': {
-                    'dateTime': start.isoformat(),
-                    'timeZone': settings.DEFAULT_TIMEZONE,
-                },
-                'end': {
-                    'dateTime': end.isoformat(),
-                    'timeZone': settings.DEFAULT_TIMEZONE,
-                },
-            }
-            
-            if description:
-                event_body['description'] = description
-            
-            if location:
-                event_body['location'] = location
-            
-            if attendees:
-                event_body['attendees'] = [{'email': email} for email in attendees]
+            event_body = self.build_event_body(start, end, summary, description, attendees, location)
             
             # Create the event
-            event = service.events().insert(
+            event = await self._execute("events.insert", service.events().insert(
                 calendarId=calendar_id,
                 body=event_body
-            ).execute()
+            ))
             
             logger.info(
                 "Google Calendar event created",
@@ -174,39 +318,68 @@ class GoogleCalendarClient:
         self,
         event_id: str,
         updates: Dict[str, Any],
-        calendar_id: str = 'primary'
+        calendar_id: str = 'primary',
+        etag: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """Update an existing Google Calendar event"""
-        service = self._get_service()
+        """
+        Update fields of an existing Google Calendar event in one round trip
+        
+        Only the fields in updates are sent (events.patch), so there is no
+        read beforehand. When etag is given the write is conditional
+        (If-Match): if the event changed since that version was read, the
+        update is rejected instead of overwriting the other change.
+        
+        Args:
+            event_id: Event ID
+            updates: Event fields to change
+            calendar_id: Calendar ID (defaults to primary)
+            etag: ETag of the version the updates are based on
+        
+        Returns:
+            Updated event data, or None if failed or the event has changed
+        """
+        service = await self._get_service()
         if not service:
             logger.error("Google Calendar service not available")
             return None
         
         try:
-            # Get existing event
-            event = service.events().get(
-                calendarId=calendar_id,
-                eventId=event_id
-            ).execute()
-            
-            # Apply updates
-            event.update(updates)
-            
-            # Update the event
-            updated_event = service.events().update(
+            request = service.events().patch(
                 calendarId=calendar_id,
                 eventId=event_id,
-                body=event
-            ).execute()
+                body=updates
+            )
+            if etag:
+                request.headers['If-Match'] = etag
+            
+            updated_event = await self._execute("events.patch", request)
             
             logger.info(
                 "Google Calendar event updated",
                 event_id=event_id,
+                fields=sorted(updates),
                 tenant_id=self.tenant_id
             )
             
             return updated_event
             
+        except HttpError as e:
+            if e.resp.status == 412:
+                logger.warning(
+                    "Google Calendar event changed since it was read",
+                    event_id=event_id,
+                    etag=etag,
+                    tenant_id=self.tenant_id
+                )
+            else:
+                logger.error(
+                    "Failed to update Google Calendar event",
+                    error=str(e),
+                    event_id=event_id,
+                    tenant_id=self.tenant_id
+                )
+            return None
+        
         except Exception as e:
             logger.error(
                 "Failed to update Google Calendar event",
@@ -216,22 +389,83 @@ class GoogleCalendarClient:
             )
             return None
     
+    async def list_events_page(
+        self,
+        calendar_id: str = 'primary',
+        sync_token: Optional[str] = None,
+        page_token: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one page of events for a full or incremental sync
+        
+        Without a sync token every event is listed; the last page carries a
+        nextSyncToken. With a sync token only events changed since that
+        token are listed, including cancelled ones.
+        
+        Args:
+            calendar_id: Calendar ID (defaults to primary)
+            sync_token: nextSyncToken from the previous sync
+            page_token: nextPageToken from the previous page
+        
+        Returns:
+            The events.list response, or None if failed
+        
+        Raises:
+            CalendarSyncTokenExpired: If Google invalidated the sync token
+        """
+        service = await self._get_service()
+        if not service:
+            logger.error("Google Calendar service not available")
+            return None
+        
+        try:
+            params = {
+                'calendarId': calendar_id,
+                'singleEvents': True,
+                'maxResults': 2500
+            }
+            if sync_token:
+                params['syncToken'] = sync_token
+            if page_token:
+                params['pageToken'] = page_token
+            
+            return await self._execute("events.list", service.events().list(**params))
+            
+        except HttpError as e:
+            if e.resp.status == 410:
+                raise CalendarSyncTokenExpired() from e
+            
+            logger.error(
+                "Failed to list Google Calendar events",
+                error=str(e),
+                tenant_id=self.tenant_id
+            )
+            return None
+        
+        except Exception as e:
+            logger.error(
+                "Failed to list Google Calendar events",
+                error=str(e),
+                tenant_id=self.tenant_id
+            )
+            return None
+    
     async def delete_event(
         self,
         event_id: str,
         calendar_id: str = 'primary'
     ) -> bool:
         """Delete a Google Calendar event"""
-        service = self._get_service()
+        service = await self._get_service()
         if not service:
             logger.error("Google Calendar service not available")
             return False
         
         try:
-            service.events().delete(
+            await self._execute("events.delete", service.events().delete(
                 calendarId=calendar_id,
                 eventId=event_id
-            ).execute()
+            ))
             
             logger.info(
                 "Google Calendar event deleted",
@@ -251,7 +485,7 @@ class GoogleCalendarClient:
             return False
     
     @staticmethod
-    def create_booking_event(
+    async def create_booking_event(
         tenant_id: str,
         customer_name: str,
         customer_email: str,
@@ -259,7 +493,8 @@ class GoogleCalendarClient:
         service_type: str,
         start_time: datetime,
         duration_minutes: int = 60,
-        location: Optional[str] = None
+        location: Optional[str] = None,
+        booking_uid: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Create a booking event with standard formatting
@@ -273,12 +508,11 @@ class GoogleCalendarClient:
             start_time: Appointment start time
             duration_minutes: Duration in minutes
             location: Service location
+            booking_uid: Cal.com booking UID, used to derive the event ID
         
         Returns:
             Created event data or None
         """
-        client = GoogleCalendarClient(tenant_id)
-        
         end_time = start_time + timedelta(minutes=duration_minutes)
         
         summary = f"{service_type} - {customer_name}"
@@ -296,11 +530,202 @@ class GoogleCalendarClient:
         
         attendees = [customer_email] if customer_email else None
         
-        return client.create_event(
+        event_body = GoogleCalendarClient.build_event_body(
             start=start_time,
             end=end_time,
             summary=summary,
             description=description,
             attendees=attendees,
             location=location
-        )
\ No newline at end of file
+        )
+        if booking_uid:
+            event_body['id'] = GoogleCalendarClient.booking_event_id(booking_uid)
+        
+        # Batched so that bursts (e.g. Cal.com redelivering a backlog) share requests
+        return await calendar_batch_writer.create_event(tenant_id, event_body)
+
+class CalendarBatchWriter:
+    """
+    Coalesces Calendar event writes per tenant into batch HTTP requests
+    
+    Operations submitted for a tenant within GOOGLE_CALENDAR_BATCH_WINDOW_MS
+    are sent together through the API's batch endpoint (at most
+    GOOGLE_CALENDAR_BATCH_MAX_SIZE per request), and each caller gets its
+    own operation's result back. A window holding a single operation is
+    sent as a plain request.
+    """
+    
+    OPERATIONS = ("insert", "update", "patch", "delete")
+    
+    def __init__(self, window_seconds: Optional[float] = None, max_batch_size: Optional[int] = None):
+        self.window_seconds = window_seconds if window_seconds is not None else settings.GOOGLE_CALENDAR_BATCH_WINDOW_MS / 1000
+        self.max_batch_size = max_batch_size or settings.GOOGLE_CALENDAR_BATCH_MAX_SIZE
+        self.pending: Dict[str, List[Tuple[str, Dict[str, Any], asyncio.Future]]] = {}
+        self.flush_scheduled: set = set()
+        self.tasks: set = set()
+        self.requests_sent = 0
+        self.operations_sent = 0
+    
+    async def submit(
+        self,
+        tenant_id: str,
+        operation: str,
+        if_match: Optional[str] = None,
+        **params
+    ) -> Tuple[Any, Optional[Exception]]:
+        """
+        Queue an events.<operation> call and wait for its result
+        
+        Args:
+            tenant_id: Tenant ID
+            operation: One of insert, update, patch, delete
+            if_match: Optional ETag the write is conditional on
+            **params: Request parameters (calendarId, eventId, body, ...)
+        
+        Returns:
+            (response, error) for this operation
+        """
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Unsupported batch operation: {operation}")
+        
+        future = asyncio.get_running_loop().create_future()
+        queue = self.pending.setdefault(tenant_id, [])
+        queue.append((operation, {**params, "if_match": if_match}, future))
+        
+        if len(queue) >= self.max_batch_size:
+            batch = queue[:self.max_batch_size]
+            del queue[:self.max_batch_size]
+            self._spawn(self._send(tenant_id, batch))
+        elif tenant_id not in self.flush_scheduled:
+            self.flush_scheduled.add(tenant_id)
+            self._spawn(self._flush_after_window(tenant_id))
+        
+        return await future
+    
+    async def create_event(
+        self,
+        tenant_id: str,
+        event_body: Dict[str, Any],
+        calendar_id: str = 'primary'
+    ) -> Optional[Dict[str, Any]]:
+        """Create an event, returning it or None if failed"""
+        event, error = await self.submit(tenant_id, "insert", calendarId=calendar_id, body=event_body)
+        return None if error else event
+    
+    async def update_event(
+        self,
+        tenant_id: str,
+        event_id: str,
+        event_body: Dict[str, Any],
+        calendar_id: str = 'primary'
+    ) -> Optional[Dict[str, Any]]:
+        """Replace an event, returning it or None if failed"""
+        event, error = await self.submit(tenant_id, "update", calendarId=calendar_id, eventId=event_id, body=event_body)
+        return None if error else event
+    
+    async def patch_event(
+        self,
+        tenant_id: str,
+        event_id: str,
+        changes: Dict[str, Any],
+        calendar_id: str = 'primary',
+        etag: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Patch fields of an event, optionally conditional on its ETag"""
+        event, error = await self.submit(
+            tenant_id,
+            "patch",
+            if_match=etag,
+            calendarId=calendar_id,
+            eventId=event_id,
+            body=changes
+        )
+        return None if error else event
+    
+    async def delete_event(self, tenant_id: str, event_id: str, calendar_id: str = 'primary') -> bool:
+        """Delete an event"""
+        _, error = await self.submit(tenant_id, "delete", calendarId=calendar_id, eventId=event_id)
+        return error is None
+    
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def _flush_after_window(self, tenant_id: str):
+        await asyncio.sleep(self.window_seconds)
+        self.flush_scheduled.discard(tenant_id)
+        
+        queue = self.pending.pop(tenant_id, [])
+        for start in range(0, len(queue), self.max_batch_size):
+            self._spawn(self._send(tenant_id, queue[start:start + self.max_batch_size]))
+    
+    async def _send(self, tenant_id: str, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]):
+        results: Dict[str, Tuple[Any, Optional[Exception]]] = {}
+        
+        try:
+            client = GoogleCalendarClient(tenant_id)
+            service = await client._get_service()
+            if not service:
+                raise RuntimeError("Google Calendar service not available")
+            
+            events = service.events()
+            
+            def build(operation: str, params: Dict[str, Any]):
+                params = dict(params)
+                if_match = params.pop("if_match", None)
+                request = getattr(events, operation)(**params)
+                if if_match:
+                    request.headers['If-Match'] = if_match
+                return request
+            
+            if len(batch) == 1:
+                operation, params, _ = batch[0]
+                try:
+                    results["0"] = (await client._execute(f"events.{operation}", build(operation, params)), None)
+                except HttpError as e:
+                    results["0"] = (None, e)
+            else:
+                def callback(request_id, response, exception):
+                    results[request_id] = (response, exception)
+                
+                batch_request = service.new_batch_http_request(callback=callback)
+                for index, (operation, params, _) in enumerate(batch):
+                    batch_request.add(build(operation, params), request_id=str(index))
+                
+                await client._execute("events.batch", batch_request)
+            
+            self.requests_sent += 1
+            self.operations_sent += len(batch)
+            
+            logger.info(
+                "Google Calendar batch sent",
+                tenant_id=tenant_id,
+                operations=len(batch),
+                failed=sum(1 for _, error in results.values() if error)
+            )
+        
+        except Exception as e:
+            logger.error(
+                "Failed to send Google Calendar batch",
+                error=str(e),
+                tenant_id=tenant_id,
+                operations=len(batch)
+            )
+            for index in range(len(batch)):
+                results.setdefault(str(index), (None, e))
+        
+        for index, (_, _, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(results.get(str(index), (None, RuntimeError("No response for batched operation"))))
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get batching statistics"""
+        return {
+            "requests_sent": self.requests_sent,
+            "operations_sent": self.operations_sent,
+            "pending": sum(len(queue) for queue in self.pending.values())
+        }
+
+# Global instance
+calendar_batch_writer = CalendarBatchWriter()
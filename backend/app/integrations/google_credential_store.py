@@ -0,0 +1,198 @@
+import asyncio
+import json
+import redis
+from typing import Dict, Optional
+import structlog
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Scopes required for Google Calendar
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+class GoogleCredentialStore:
+    """
+    Tenant OAuth credentials shared through Redis with an in-process cache
+    
+    Valid credentials are served from memory. When a token nears expiry it
+    is refreshed once: coroutines in this process wait on a per-tenant lock,
+    and other replicas wait on a short Redis lock and then pick up the
+    refreshed token instead of refreshing it themselves.
+    """
+    
+    def __init__(self):
+        self.credentials: Dict[str, Credentials] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.request = Request()
+        
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                client = redis.from_url(settings.REDIS_URL)
+                client.ping()
+                self.redis_client = client
+                logger.info("Google credential store Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - Google credentials are not shared across replicas")
+    
+    def credentials_key(self, tenant_id: str) -> str:
+        return f"lily:google:credentials:{tenant_id}"
+    
+    def refresh_lock_key(self, tenant_id: str) -> str:
+        return f"lily:google:credentials:{tenant_id}:refresh"
+    
+    async def get_credentials(self, tenant_id: str) -> Optional[Credentials]:
+        """
+        Get valid credentials for a tenant, refreshing them if needed
+        
+        Args:
+            tenant_id: Tenant ID
+        
+        Returns:
+            Valid credentials, or None if the tenant has not authorized
+            Google Calendar or the refresh failed
+        """
+        creds = self.credentials.get(tenant_id)
+        if creds and creds.valid:
+            return creds
+        
+        lock = self.locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have refreshed while we waited
+            creds = self.credentials.get(tenant_id)
+            if creds and creds.valid:
+                return creds
+            
+            creds = self._load(tenant_id)
+            if creds is None:
+                self.credentials.pop(tenant_id, None)
+                logger.warning("Google Calendar not authorized for tenant", tenant_id=tenant_id)
+                return None
+            
+            if not creds.valid:
+                creds = await self._refresh(tenant_id, creds)
+            
+            if creds is None:
+                self.credentials.pop(tenant_id, None)
+                return None
+            
+            self.credentials[tenant_id] = creds
+            return creds
+    
+    def save_credentials(self, tenant_id: str, creds: Credentials) -> bool:
+        """
+        Store credentials for a tenant, e.g. after the OAuth callback
+        
+        Returns:
+            True if stored in Redis (or in memory when Redis is not configured)
+        """
+        self.credentials[tenant_id] = creds
+        
+        if not self.redis_client:
+            return True
+        
+        try:
+            self.redis_client.set(self.credentials_key(tenant_id), creds.to_json())
+            return True
+        except Exception as e:
+            logger.error("Failed to store Google credentials", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def delete_credentials(self, tenant_id: str) -> bool:
+        """Forget a tenant's credentials, e.g. after the calendar is disconnected"""
+        self.credentials.pop(tenant_id, None)
+        
+        if not self.redis_client:
+            return True
+        
+        try:
+            self.redis_client.delete(self.credentials_key(tenant_id))
+            return True
+        except Exception as e:
+            logger.error("Failed to delete Google credentials", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def _load(self, tenant_id: str) -> Optional[Credentials]:
+        if not self.redis_client:
+            return self.credentials.get(tenant_id)
+        
+        try:
+            raw = self.redis_client.get(self.credentials_key(tenant_id))
+            if not raw:
+                return None
+            return Credentials.from_authorized_user_info(json.loads(raw), SCOPES)
+        except Exception as e:
+            logger.error("Failed to load Google credentials", error=str(e), tenant_id=tenant_id)
+            return None
+    
+    async def _refresh(self, tenant_id: str, creds: Credentials) -> Optional[Credentials]:
+        if not creds.refresh_token:
+            logger.error("Google credentials expired without a refresh token", tenant_id=tenant_id)
+            return None
+        
+        acquired = self._acquire_refresh_lock(tenant_id)
+        if not acquired:
+            # Another replica is refreshing; wait for it to publish the new token
+            refreshed = await self._wait_for_refresh(tenant_id)
+            if refreshed:
+                return refreshed
+        
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, creds.refresh, self.request)
+            
+            self.save_credentials(tenant_id, creds)
+            logger.info("Google credentials refreshed", tenant_id=tenant_id)
+            return creds
+        
+        except Exception as e:
+            logger.error("Failed to refresh Google credentials", error=str(e), tenant_id=tenant_id)
+            return None
+        
+        finally:
+            if acquired:
+                self._release_refresh_lock(tenant_id)
+    
+    def _acquire_refresh_lock(self, tenant_id: str) -> bool:
+        if not self.redis_client:
+            return True
+        
+        try:
+            return bool(self.redis_client.set(
+                self.refresh_lock_key(tenant_id),
+                "1",
+                nx=True,
+                ex=settings.GOOGLE_CREDENTIAL_REFRESH_LOCK_SECONDS
+            ))
+        except Exception as e:
+            logger.error("Failed to acquire credential refresh lock", error=str(e), tenant_id=tenant_id)
+            return True
+    
+    def _release_refresh_lock(self, tenant_id: str):
+        if not self.redis_client:
+            return
+        
+        try:
+            self.redis_client.delete(self.refresh_lock_key(tenant_id))
+        except Exception as e:
+            logger.error("Failed to release credential refresh lock", error=str(e), tenant_id=tenant_id)
+    
+    async def _wait_for_refresh(self, tenant_id: str) -> Optional[Credentials]:
+        deadline = asyncio.get_running_loop().time() + settings.GOOGLE_CREDENTIAL_REFRESH_LOCK_SECONDS
+        
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.2)
+            creds = self._load(tenant_id)
+            if creds and creds.valid:
+                return creds
+        
+        logger.warning("Timed out waiting for credential refresh", tenant_id=tenant_id)
+        return None
+
+# Global instance
+google_credential_store = GoogleCredentialStore()
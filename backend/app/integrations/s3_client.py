@@ -1,14 +1,36 @@
+import asyncio
 import boto3
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import partial
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator, BinaryIO
 import structlog
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
 from app.core.config import settings
 
 logger = structlog.get_logger()
 
+MAX_PHOTO_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+def chunk_keys(file_keys: List[str], chunk_size: int = DELETE_OBJECTS_MAX_KEYS) -> List[List[str]]:
+    """Split keys into DeleteObjects-sized chunks"""
+    chunk_size = min(chunk_size, DELETE_OBJECTS_MAX_KEYS)
+    return [file_keys[i:i + chunk_size] for i in range(0, len(file_keys), chunk_size)]
+
+def merge_delete_results(batches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-chunk delete_photo_batch results"""
+    result = {"deleted": [], "failed": []}
+    for batch in batches:
+        result["deleted"].extend(batch["deleted"])
+        result["failed"].extend(batch["failed"])
+    return result
+
 class S3Client:
     """S3 integration client for photo uploads and presigned URLs"""
     
@@ -24,7 +46,14 @@ class S3Client:
                     's3',
                     aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION
+                    region_name=settings.AWS_REGION,
+                    endpoint_url=settings.S3_ENDPOINT_URL or None,
+                    config=Config(
+                        connect_timeout=settings.S3_CONNECT_TIMEOUT_SECONDS,
+                        read_timeout=settings.S3_READ_TIMEOUT_SECONDS,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                        max_pool_connections=settings.S3_EXECUTOR_MAX_WORKERS
+                    )
                 )
                 logger.info("S3 client initialized", bucket=self.bucket_name)
             except Exception as e:
@@ -38,7 +67,7 @@ class S3Client:
         lead_id: str,
         file_extension: str = 'jpg',
         expiration: int = 3600,
-        max_size: int = 10 * 1024 * 1024  # 10MB
+        max_size: int = MAX_PHOTO_SIZE_BYTES
     ) -> Optional[Dict[str, Any]]:
         """
         Generate a presigned URL for photo upload
@@ -109,6 +138,286 @@ class S3Client:
             )
             return None
     
+    def generate_presigned_upload_urls(
+        self,
+        tenant_id: str,
+        lead_id: str,
+        files: List[Dict[str, Any]],
+        expiration: int = 3600
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Generate presigned POSTs for several photos in one pass
+        
+        Each upload is pinned to its own content type and size limit, so a
+        client cannot swap a declared JPEG for something else.
+        
+        Args:
+            tenant_id: Tenant ID for organizing uploads
+            lead_id: Lead ID for associating photos
+            files: One dict per photo with file_extension, content_type and
+                optional max_size (bytes, capped at MAX_PHOTO_SIZE_BYTES)
+            expiration: URL expiration time in seconds
+        
+        Returns:
+            List of upload dictionaries in request order, or None if failed
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return None
+        
+        try:
+            expires_at = (datetime.utcnow() + timedelta(seconds=expiration)).isoformat()
+            prefix = f"photos/{tenant_id}/{lead_id}/"
+            uploads = []
+            
+            for file in files:
+                file_id = str(uuid.uuid4())
+                file_key = f"{prefix}{file_id}.{file['file_extension']}"
+                content_type = file["content_type"]
+                max_size = min(file.get("max_size") or MAX_PHOTO_SIZE_BYTES, MAX_PHOTO_SIZE_BYTES)
+                
+                response = self.client.generate_presigned_post(
+                    Bucket=self.bucket_name,
+                    Key=file_key,
+                    Fields={"key": file_key, "Content-Type": content_type},
+                    Conditions=[
+                        {"bucket": self.bucket_name},
+                        {"key": file_key},
+                        ["content-length-range", 0, max_size],
+                        {"Content-Type": content_type}
+                    ],
+                    ExpiresIn=expiration
+                )
+                
+                uploads.append({
+                    "upload_url": response["url"],
+                    "fields": response["fields"],
+                    "file_key": file_key,
+                    "file_id": file_id,
+                    "expires_at": expires_at,
+                    "max_size_bytes": max_size
+                })
+            
+            logger.info(
+                "Generated presigned upload URLs",
+                tenant_id=tenant_id,
+                lead_id=lead_id,
+                count=len(uploads),
+                expiration=expiration
+            )
+            
+            return uploads
+            
+        except Exception as e:
+            logger.error(
+                "Failed to generate presigned upload URLs",
+                error=str(e),
+                tenant_id=tenant_id,
+                lead_id=lead_id
+            )
+            return None
+    
+    def create_multipart_upload(
+        self,
+        tenant_id: str,
+        lead_id: str,
+        file_extension: str,
+        content_type: str,
+        size_bytes: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Start a multipart upload for large media (e.g. walk-around videos)
+        
+        Args:
+            tenant_id: Tenant ID for organizing uploads
+            lead_id: Lead ID for associating media
+            file_extension: File extension (mp4, mov, etc.)
+            content_type: Content-Type stored with the object
+            size_bytes: Declared size, stored as declared-size metadata so
+                the assembled object can be checked against it
+        
+        Returns:
+            Dictionary with upload_id, file_key and file_id, or None if failed
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return None
+        
+        try:
+            file_id = str(uuid.uuid4())
+            file_key = f"photos/{tenant_id}/{lead_id}/{file_id}.{file_extension}"
+            
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                ContentType=content_type,
+                Metadata={"declared-size": str(size_bytes)} if size_bytes else {}
+            )
+            
+            logger.info(
+                "Created multipart upload",
+                tenant_id=tenant_id,
+                lead_id=lead_id,
+                file_key=file_key
+            )
+            
+            return {
+                "upload_id": response["UploadId"],
+                "file_key": file_key,
+                "file_id": file_id
+            }
+            
+        except Exception as e:
+            logger.error(
+                "Failed to create multipart upload",
+                error=str(e),
+                tenant_id=tenant_id,
+                lead_id=lead_id
+            )
+            return None
+    
+    def generate_presigned_part_urls(
+        self,
+        file_key: str,
+        upload_id: str,
+        part_numbers: List[int],
+        expiration: int = 3600
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Presign UploadPart URLs for a batch of parts
+        
+        Args:
+            file_key: S3 object key of the multipart upload
+            upload_id: Multipart upload ID
+            part_numbers: Part numbers to presign (1-10000)
+            expiration: URL expiration time in seconds
+        
+        Returns:
+            List of part_number/upload_url dictionaries, or None if failed
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return None
+        
+        try:
+            return [
+                {
+                    "part_number": part_number,
+                    "upload_url": self.client.generate_presigned_url(
+                        'upload_part',
+                        Params={
+                            'Bucket': self.bucket_name,
+                            'Key': file_key,
+                            'UploadId': upload_id,
+                            'PartNumber': part_number
+                        },
+                        ExpiresIn=expiration
+                    )
+                }
+                for part_number in part_numbers
+            ]
+            
+        except Exception as e:
+            logger.error("Failed to presign upload parts", error=str(e), file_key=file_key)
+            return None
+    
+    def list_uploaded_parts(self, file_key: str, upload_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        List parts already uploaded, so a client can resume after a dropped connection
+        
+        Returns:
+            List of part_number/etag/size_bytes dictionaries, or None if failed
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return None
+        
+        try:
+            parts = []
+            paginator = self.client.get_paginator('list_parts')
+            for page in paginator.paginate(Bucket=self.bucket_name, Key=file_key, UploadId=upload_id):
+                for part in page.get('Parts', []):
+                    parts.append({
+                        "part_number": part['PartNumber'],
+                        "etag": part['ETag'].strip('"'),
+                        "size_bytes": part['Size']
+                    })
+            return parts
+            
+        except Exception as e:
+            logger.error("Failed to list uploaded parts", error=str(e), file_key=file_key)
+            return None
+    
+    def complete_multipart_upload(
+        self,
+        file_key: str,
+        upload_id: str,
+        parts: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Assemble uploaded parts into the final object
+        
+        Args:
+            file_key: S3 object key of the multipart upload
+            upload_id: Multipart upload ID
+            parts: part_number/etag dictionaries for every uploaded part
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return False
+        
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                        for part in sorted(parts, key=lambda part: part["part_number"])
+                    ]
+                }
+            )
+            
+            logger.info("Completed multipart upload", file_key=file_key, parts=len(parts))
+            return True
+            
+        except Exception as e:
+            logger.error("Failed to complete multipart upload", error=str(e), file_key=file_key)
+            return False
+    
+    def abort_multipart_upload(self, file_key: str, upload_id: str) -> bool:
+        """
+        Abort a multipart upload and free its stored parts
+        
+        Returns:
+            True if aborted or already finished, False otherwise
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return False
+        
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                UploadId=upload_id
+            )
+            logger.info("Aborted multipart upload", file_key=file_key)
+            return True
+            
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchUpload':
+                return True  # Already completed or aborted
+            logger.error("Failed to abort multipart upload", error=str(e), file_key=file_key)
+            return False
+        except Exception as e:
+            logger.error("Failed to abort multipart upload", error=str(e), file_key=file_key)
+            return False
+    
     def generate_presigned_download_url(
         self,
         file_key: str,
@@ -179,6 +488,133 @@ class S3Client:
             )
             return False
     
+    def delete_photo_batch(self, file_keys: List[str]) -> Dict[str, Any]:
+        """
+        Delete up to 1000 photos with a single DeleteObjects request
+        
+        Args:
+            file_keys: S3 object keys (at most 1000)
+        
+        Returns:
+            Dictionary with deleted keys and per-key failures
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return {
+                "deleted": [],
+                "failed": [{"file_key": key, "error": "S3 client not available"} for key in file_keys]
+            }
+        
+        try:
+            response = self.client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={
+                    "Objects": [{"Key": key} for key in file_keys],
+                    "Quiet": True  # Only errors are returned
+                }
+            )
+            
+            failed = [
+                {"file_key": error["Key"], "error": error.get("Code", "Unknown")}
+                for error in response.get("Errors", [])
+            ]
+            failed_keys = {failure["file_key"] for failure in failed}
+            deleted = [key for key in file_keys if key not in failed_keys]
+            
+            logger.info(
+                "Deleted photo batch from S3",
+                deleted=len(deleted),
+                failed=len(failed)
+            )
+            
+            return {"deleted": deleted, "failed": failed}
+            
+        except Exception as e:
+            logger.error(
+                "Failed to delete photo batch from S3",
+                error=str(e),
+                count=len(file_keys)
+            )
+            return {
+                "deleted": [],
+                "failed": [{"file_key": key, "error": str(e)} for key in file_keys]
+            }
+    
+    def delete_photos(
+        self,
+        file_keys: List[str],
+        chunk_size: int = DELETE_OBJECTS_MAX_KEYS
+    ) -> Dict[str, Any]:
+        """
+        Delete many photos using batched DeleteObjects requests, one chunk at a time
+        
+        AsyncS3Client.delete_photos runs the same chunks concurrently.
+        
+        Args:
+            file_keys: S3 object keys
+            chunk_size: Keys per DeleteObjects request (max 1000)
+        
+        Returns:
+            Dictionary with deleted keys and per-key failures
+        """
+        return merge_delete_results([self.delete_photo_batch(chunk) for chunk in chunk_keys(file_keys, chunk_size)])
+    
+    def download_fileobj(self, file_key: str, fileobj: BinaryIO) -> bool:
+        """
+        Stream an object from S3 into a file-like object
+        
+        Args:
+            file_key: S3 object key
+            fileobj: Writable binary file object
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return False
+        
+        try:
+            self.client.download_fileobj(self.bucket_name, file_key, fileobj)
+            return True
+        except Exception as e:
+            logger.error("Failed to download object from S3", error=str(e), file_key=file_key)
+            return False
+    
+    def upload_fileobj(
+        self,
+        file_key: str,
+        fileobj: BinaryIO,
+        content_type: str,
+        cache_control: Optional[str] = None
+    ) -> bool:
+        """
+        Stream a file-like object to S3
+        
+        Args:
+            file_key: S3 object key
+            fileobj: Readable binary file object
+            content_type: Content-Type stored with the object
+            cache_control: Optional Cache-Control stored with the object
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.client:
+            logger.error("S3 client not available")
+            return False
+        
+        try:
+            extra_args = {"ContentType": content_type}
+            if cache_control:
+                extra_args["CacheControl"] = cache_control
+            
+            self.client.upload_fileobj(fileobj, self.bucket_name, file_key, ExtraArgs=extra_args)
+            return True
+        except Exception as e:
+            logger.error("Failed to upload object to S3", error=str(e), file_key=file_key)
+            return False
+    
     def check_photo_exists(self, file_key: str) -> bool:
         """
         Check if a photo exists in S3
@@ -241,62 +677,305 @@ class S3Client:
             )
             return None
     
-    def list_tenant_photos(
+    @staticmethod
+    def _photo_prefix(tenant_id: str, lead_id: Optional[str] = None, root: str = "photos") -> str:
+        if lead_id:
+            return f"{root}/{tenant_id}/{lead_id}/"
+        return f"{root}/{tenant_id}/"
+    
+    @staticmethod
+    def _photo_from_object(obj: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "file_key": obj['Key'],
+            "size_bytes": obj['Size'],
+            "last_modified": obj['LastModified'],
+            "etag": obj['ETag'].strip('"')
+        }
+    
+    def list_photos_page(
         self,
         tenant_id: str,
         lead_id: Optional[str] = None,
-        max_keys: int = 100
-    ) -> List[Dict[str, Any]]:
+        page_size: int = 100,
+        continuation_token: Optional[str] = None,
+        root: str = "photos"
+    ) -> Optional[Dict[str, Any]]:
         """
-        List photos for a tenant/lead
+        List a single page of photos for a tenant/lead
         
         Args:
             tenant_id: Tenant ID
             lead_id: Optional lead ID to filter by
-            max_keys: Maximum number of keys to return
+            page_size: Maximum number of keys in the page (S3 caps this at 1000)
+            continuation_token: Token returned as next_cursor by the previous page
+            root: Top-level prefix (photos for originals, derived for resized copies)
         
         Returns:
-            List of photo metadata dictionaries
+            Dictionary with photos and next_cursor (None on the last page),
+            or None if failed
+        
+        Raises:
+            ValueError: If S3 rejects the continuation token (malformed or expired)
         """
         if not self.client:
             logger.error("S3 client not available")
-            return []
+            return None
         
         try:
-            if lead_id:
-                prefix = f"photos/{tenant_id}/{lead_id}/"
-            else:
-                prefix = f"photos/{tenant_id}/"
+            params = {
+                "Bucket": self.bucket_name,
+                "Prefix": self._photo_prefix(tenant_id, lead_id, root),
+                "MaxKeys": min(page_size, 1000)
+            }
+            if continuation_token:
+                params["ContinuationToken"] = continuation_token
             
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix,
-                MaxKeys=max_keys
-            )
+            response = self.client.list_objects_v2(**params)
             
-            photos = []
-            for obj in response.get('Contents', []):
-                photos.append({
-                    "file_key": obj['Key'],
-                    "size_bytes": obj['Size'],
-                    "last_modified": obj['LastModified'],
-                    "etag": obj['ETag'].strip('"')
-                })
+            photos = [self._photo_from_object(obj) for obj in response.get('Contents', [])]
+            next_cursor = response.get('NextContinuationToken') if response.get('IsTruncated') else None
             
-            logger.info(
-                "Listed tenant photos",
+            return {
+                "photos": photos,
+                "next_cursor": next_cursor
+            }
+            
+        except ClientError as e:
+            if continuation_token and e.response['Error']['Code'] == 'InvalidArgument':
+                raise ValueError("Invalid cursor")
+            logger.error(
+                "Failed to list photo page",
+                error=str(e),
                 tenant_id=tenant_id,
-                lead_id=lead_id,
-                count=len(photos)
+                lead_id=lead_id
             )
-            
-            return photos
-            
+            return None
         except Exception as e:
             logger.error(
-                "Failed to list tenant photos",
+                "Failed to list photo page",
                 error=str(e),
                 tenant_id=tenant_id,
                 lead_id=lead_id
             )
-            return []
\ No newline at end of file
+            return None
+    
+    def list_tenant_photos(
+        self,
+        tenant_id: str,
+        lead_id: Optional[str] = None,
+        max_keys: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        List the first page of photos for a tenant/lead
+        
+        Use list_photos_page (or AsyncS3Client.stream_photo_pages) to walk
+        prefixes holding more than max_keys objects.
+        
+        Args:
+            tenant_id: Tenant ID
+            lead_id: Optional lead ID to filter by
+            max_keys: Maximum number of keys to return
+        
+        Returns:
+            List of photo metadata dictionaries
+        """
+        page = self.list_photos_page(tenant_id=tenant_id, lead_id=lead_id, page_size=max_keys)
+        if page is None:
+            return []
+        
+        if page["next_cursor"]:
+            logger.warning(
+                "Photo listing truncated",
+                tenant_id=tenant_id,
+                lead_id=lead_id,
+                max_keys=max_keys
+            )
+        
+        logger.info(
+            "Listed tenant photos",
+            tenant_id=tenant_id,
+            lead_id=lead_id,
+            count=len(page["photos"])
+        )
+        
+        return page["photos"]
+
+class AsyncS3Client:
+    """
+    Async facade over S3Client for use inside request handlers
+
+    boto3 is blocking, so every call is dispatched to a dedicated, bounded
+    thread pool and awaited with a per-operation timeout. A slow S3 call
+    then only ties up one pool thread instead of the whole event loop.
+    """
+    
+    def __init__(
+        self,
+        sync_client: Optional[S3Client] = None,
+        max_workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        self.sync_client = sync_client or S3Client()
+        self.timeout_seconds = timeout_seconds or settings.S3_OPERATION_TIMEOUT_SECONDS
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.S3_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="s3-io"
+        )
+    
+    @property
+    def available(self) -> bool:
+        return self.sync_client.client is not None
+    
+    async def _run(
+        self,
+        operation: str,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run a blocking S3Client method on the executor
+        
+        Raises:
+            asyncio.TimeoutError: If the operation exceeds its timeout
+        """
+        loop = asyncio.get_running_loop()
+        timeout = timeout or self.timeout_seconds
+        
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self.executor, partial(func, *args, **kwargs)),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error("S3 operation timed out", operation=operation, timeout_seconds=timeout)
+            raise
+    
+    async def generate_presigned_upload_url(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        return await self._run(
+            "generate_presigned_upload_url",
+            self.sync_client.generate_presigned_upload_url,
+            *args, timeout=timeout, **kwargs
+        )
+    
+    async def generate_presigned_upload_urls(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        return await self._run(
+            "generate_presigned_upload_urls",
+            self.sync_client.generate_presigned_upload_urls,
+            *args, timeout=timeout, **kwargs
+        )
+    
+    async def create_multipart_upload(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        return await self._run("create_multipart_upload", self.sync_client.create_multipart_upload, *args, timeout=timeout, **kwargs)
+    
+    async def generate_presigned_part_urls(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        return await self._run("generate_presigned_part_urls", self.sync_client.generate_presigned_part_urls, *args, timeout=timeout, **kwargs)
+    
+    async def list_uploaded_parts(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        return await self._run("list_uploaded_parts", self.sync_client.list_uploaded_parts, *args, timeout=timeout, **kwargs)
+    
+    async def complete_multipart_upload(self, *args, timeout: Optional[float] = None, **kwargs) -> bool:
+        return await self._run("complete_multipart_upload", self.sync_client.complete_multipart_upload, *args, timeout=timeout, **kwargs)
+    
+    async def abort_multipart_upload(self, *args, timeout: Optional[float] = None, **kwargs) -> bool:
+        return await self._run("abort_multipart_upload", self.sync_client.abort_multipart_upload, *args, timeout=timeout, **kwargs)
+    
+    async def generate_presigned_download_url(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[str]:
+        return await self._run(
+            "generate_presigned_download_url",
+            self.sync_client.generate_presigned_download_url,
+            *args, timeout=timeout, **kwargs
+        )
+    
+    async def delete_photo(self, *args, timeout: Optional[float] = None, **kwargs) -> bool:
+        return await self._run("delete_photo", self.sync_client.delete_photo, *args, timeout=timeout, **kwargs)
+    
+    async def delete_photos(
+        self,
+        file_keys: List[str],
+        chunk_size: int = DELETE_OBJECTS_MAX_KEYS,
+        max_concurrency: int = 4,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Delete many photos, running DeleteObjects chunks concurrently
+        
+        Chunks that time out are reported as failed rather than aborting
+        the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def delete_chunk(chunk: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self._run(
+                        "delete_photo_batch",
+                        self.sync_client.delete_photo_batch,
+                        chunk,
+                        timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    return {
+                        "deleted": [],
+                        "failed": [{"file_key": key, "error": "Timeout"} for key in chunk]
+                    }
+        
+        batch_results = await asyncio.gather(
+            *[delete_chunk(chunk) for chunk in chunk_keys(file_keys, chunk_size)]
+        )
+        return merge_delete_results(batch_results)
+    
+    async def check_photo_exists(self, *args, timeout: Optional[float] = None, **kwargs) -> bool:
+        return await self._run("check_photo_exists", self.sync_client.check_photo_exists, *args, timeout=timeout, **kwargs)
+    
+    async def get_photo_metadata(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        return await self._run("get_photo_metadata", self.sync_client.get_photo_metadata, *args, timeout=timeout, **kwargs)
+    
+    async def list_tenant_photos(self, *args, timeout: Optional[float] = None, **kwargs) -> List[Dict[str, Any]]:
+        return await self._run("list_tenant_photos", self.sync_client.list_tenant_photos, *args, timeout=timeout, **kwargs)
+    
+    async def list_photos_page(self, *args, timeout: Optional[float] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        return await self._run("list_photos_page", self.sync_client.list_photos_page, *args, timeout=timeout, **kwargs)
+    
+    async def stream_photo_pages(
+        self,
+        tenant_id: str,
+        lead_id: Optional[str] = None,
+        page_size: int = 1000,
+        root: str = "photos"
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield photo pages for a tenant/lead prefix until it is exhausted
+        
+        Only one page is held in memory at a time, so callers can stream
+        arbitrarily large prefixes.
+        
+        Raises:
+            RuntimeError: If a page cannot be listed mid-stream
+        """
+        cursor = None
+        while True:
+            page = await self.list_photos_page(
+                tenant_id=tenant_id,
+                lead_id=lead_id,
+                page_size=page_size,
+                continuation_token=cursor,
+                root=root
+            )
+            if page is None:
+                raise RuntimeError("Failed to list photo page")
+            
+            if page["photos"]:
+                yield page["photos"]
+            
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+    
+    def shutdown(self, wait: bool = False):
+        """Release executor threads"""
+        self.executor.shutdown(wait=wait)
+
+# Global instance
+async_s3_client = AsyncS3Client()
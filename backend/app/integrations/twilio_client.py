@@ -5,6 +5,8 @@ import structlog
 from twilio.rest import Client
 from twilio.request_validator import RequestValidator
 from app.core.config import settings
+from app.services.sms_segments import analyze
+from app.services.message_templates import message_templates
 
 logger = structlog.get_logger()
 
@@ -51,6 +53,8 @@ class TwilioClient:
             logger.error("No Twilio from number configured")
             return False
         
+        encoding, _, segments = analyze(body)
+        
         for attempt in range(max_retries):
             try:
                 # Run in thread pool since Twilio SDK is sync
@@ -68,7 +72,9 @@ class TwilioClient:
                     "SMS sent successfully",
                     message_sid=message.sid,
                     to=to,
-                    status=message.status
+                    status=message.status,
+                    encoding=encoding,
+                    segments=segments
                 )
                 return True
                 
@@ -127,6 +133,15 @@ class TwilioClient:
         
         return body.lower().strip() in stop_keywords
     
+    @staticmethod
+    def is_start_command(body: str) -> bool:
+        """Check if message is a START command for SMS opt-in"""
+        if not body:
+            return False
+        
+        start_keywords = {'start', 'unstop', 'yes'}
+        return body.lower().strip() in start_keywords
+    
     @staticmethod
     def is_help_command(body: str) -> bool:
         """Check if message is a HELP command"""
@@ -136,6 +151,22 @@ class TwilioClient:
         help_keywords = {'help', 'info'}
         return body.lower().strip() in help_keywords
     
+    @staticmethod
+    def missed_call_followup_body(caller_name: str = None, tenant_id: str = None) -> str:
+        """Missed call follow-up SMS text, from the tenant's templates"""
+        if caller_name:
+            return message_templates.render(tenant_id, "missed_call_followup_named", caller_name=caller_name)
+        
+        return message_templates.render(tenant_id, "missed_call_followup")
+    
+    @staticmethod
+    def review_request_body(customer_name: str = None, tenant_id: str = None) -> str:
+        """Review request SMS text, from the tenant's templates"""
+        if customer_name:
+            return message_templates.render(tenant_id, "review_request_named", customer_name=customer_name)
+        
+        return message_templates.render(tenant_id, "review_request")
+    
     async def send_missed_call_followup(self, to: str, caller_name: str = None) -> bool:
         """
         Send missed call follow-up SMS
@@ -147,20 +178,7 @@ class TwilioClient:
         Returns:
             True if successful
         """
-        if caller_name:
-            body = (
-                f"Hi {caller_name}! Sorry we missed your call. 📞 "
-                "Text us 2-3 photos of what needs cleaning + your ZIP code "
-                "and we'll send a ballpark quote in minutes!"
-            )
-        else:
-            body = (
-                "Sorry we missed your call! 📞 Text us 2-3 photos of what "
-                "needs cleaning + your ZIP code and we'll send a ballpark "
-                "quote in minutes!"
-            )
-        
-        return await self.send_sms(to, body)
+        return await self.send_sms(to, self.missed_call_followup_body(caller_name))
     
     async def send_review_request(self, to: str, customer_name: str = None) -> bool:
         """
@@ -173,32 +191,12 @@ class TwilioClient:
         Returns:
             True if successful
         """
-        if customer_name:
-            body = (
-                f"Hi {customer_name}! 🌟 How did we do with your cleaning? "
-                "We'd love a quick review to help other customers find us!"
-            )
-        else:
-            body = (
-                "Hi! 🌟 How did we do with your cleaning? "
-                "We'd love a quick review to help other customers find us!"
-            )
-        
-        return await self.send_sms(to, body)
+        return await self.send_sms(to, self.review_request_body(customer_name))
     
-    async def send_help_response(self, to: str) -> bool:
+    async def send_help_response(self, to: str, tenant_id: str = None) -> bool:
         """Send HELP command response"""
-        body = (
-            "This is Lily AI automated messaging. "
-            "Text photos + ZIP for quotes, or call us directly. "
-            "Reply STOP to unsubscribe."
-        )
-        return await self.send_sms(to, body)
+        return await self.send_sms(to, message_templates.render(tenant_id, "help_response"))
     
-    async def send_stop_confirmation(self, to: str) -> bool:
+    async def send_stop_confirmation(self, to: str, tenant_id: str = None) -> bool:
         """Send STOP command confirmation"""
-        body = (
-            "You've been unsubscribed from SMS messages. "
-            "Reply START to resubscribe or call us anytime."
-        )
-        return await self.send_sms(to, body)
\ No newline at end of file
+        return await self.send_sms(to, message_templates.render(tenant_id, "stop_confirmation"))
\ No newline at end of file
@@ -32,13 +32,23 @@ async def health():
 # Import and include routers
 from app.api.webhooks.stripe import router as stripe_webhook_router
 from app.api.webhooks.twilio_voice import router as twilio_voice_router  
+from app.api.webhooks.twilio_sms import router as twilio_sms_router
 from app.api.webhooks.calcom import router as calcom_webhook_router
 from app.api.routes.billing import router as billing_router
 from app.api.routes.leads import router as leads_router
+from app.api.routes.calendar import router as calendar_router
+from app.api.routes.pricebook import router as pricebook_router
+from app.api.routes.sms_settings import router as sms_settings_router
+from app.api.routes.templates import router as templates_router
 
 # Include all routers
 app.include_router(stripe_webhook_router, prefix="/webhooks", tags=["webhooks"])
 app.include_router(twilio_voice_router, prefix="/webhooks", tags=["webhooks"])
+app.include_router(twilio_sms_router, prefix="/webhooks", tags=["webhooks"])
 app.include_router(calcom_webhook_router, prefix="/webhooks", tags=["webhooks"])
 app.include_router(billing_router, prefix=f"{settings.API_V1_PREFIX}/billing", tags=["billing"])
-app.include_router(leads_router, prefix=f"{settings.API_V1_PREFIX}", tags=["leads"])
\ No newline at end of file
+app.include_router(leads_router, prefix=f"{settings.API_V1_PREFIX}", tags=["leads"])
+app.include_router(calendar_router, prefix=f"{settings.API_V1_PREFIX}", tags=["calendar"])
+app.include_router(pricebook_router, prefix=f"{settings.API_V1_PREFIX}", tags=["pricebook"])
+app.include_router(sms_settings_router, prefix=f"{settings.API_V1_PREFIX}", tags=["sms"])
+app.include_router(templates_router, prefix=f"{settings.API_V1_PREFIX}", tags=["sms"])
\ No newline at end of file
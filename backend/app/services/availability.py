@@ -0,0 +1,131 @@
+import math
+import numpy as np
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import structlog
+
+from app.core.config import settings
+from app.services.calendar_sync import BusyIndex, CalendarSyncService, calendar_sync
+from app.services.quoting_service import ServiceType
+
+logger = structlog.get_logger()
+
+# Typical on-site time per job, used as the slot length
+SERVICE_DURATIONS_MINUTES = {
+    ServiceType.DRIVEWAY: 90,
+    ServiceType.ROOF: 240,
+    ServiceType.HOUSE: 240,
+    ServiceType.DECK: 150,
+    ServiceType.WALKWAY: 60,
+    ServiceType.WINDOWS: 120,
+    ServiceType.OTHER: 120,
+}
+
+def candidate_starts(
+    range_start: datetime,
+    range_end: datetime,
+    duration_seconds: int,
+    step_seconds: int,
+    tz: ZoneInfo
+) -> np.ndarray:
+    """
+    Slot start times (epoch seconds) that fit outside quiet hours
+    
+    Each local day's window runs from QUIET_HOURS_END to QUIET_HOURS_START,
+    computed per day so DST changes shift the window correctly. Starts are
+    aligned to step_seconds from the window opening.
+    """
+    first_day = range_start.astimezone(tz).date()
+    last_day = range_end.astimezone(tz).date()
+    range_start_ts = range_start.timestamp()
+    range_end_ts = range_end.timestamp()
+    
+    days = []
+    day = first_day
+    while day <= last_day:
+        window_open = datetime.combine(day, time(settings.QUIET_HOURS_END), tzinfo=tz).timestamp()
+        window_close = datetime.combine(day, time(settings.QUIET_HOURS_START), tzinfo=tz).timestamp()
+        
+        earliest = max(window_open, range_start_ts)
+        first = window_open + math.ceil((earliest - window_open) / step_seconds) * step_seconds
+        last = min(window_close, range_end_ts) - duration_seconds
+        
+        if first <= last:
+            days.append(np.arange(first, last + 1, step_seconds, dtype=np.float64))
+        day += timedelta(days=1)
+    
+    return np.concatenate(days) if days else np.empty(0, dtype=np.float64)
+
+def free_slot_mask(
+    busy: BusyIndex,
+    starts: np.ndarray,
+    duration_seconds: int,
+    buffer_seconds: int
+) -> np.ndarray:
+    """Which slots keep buffer_seconds clear of every busy block on both sides"""
+    return ~busy.overlaps_many(starts - buffer_seconds, starts + duration_seconds + buffer_seconds)
+
+class AvailabilityService:
+    """Bookable slot generation against a tenant's synced calendar"""
+    
+    def __init__(self, sync_service: Optional[CalendarSyncService] = None):
+        self.calendar_sync = sync_service or calendar_sync
+    
+    def free_slots(
+        self,
+        tenant_id: str,
+        service_type: ServiceType,
+        start: datetime,
+        end: datetime,
+        buffer_minutes: Optional[int] = None,
+        step_minutes: Optional[int] = None,
+        timezone_name: Optional[str] = None
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """
+        Find free slots for a job between start and end
+        
+        Every candidate slot in the range is checked against the busy index
+        in one vectorised pass.
+        
+        Args:
+            tenant_id: Tenant ID
+            service_type: Service type, which sets the slot length
+            start: Range start (timezone-aware)
+            end: Range end (timezone-aware)
+            buffer_minutes: Clearance required before and after busy blocks
+            step_minutes: Spacing between candidate start times
+            timezone_name: Timezone for quiet hours (defaults to DEFAULT_TIMEZONE)
+        
+        Returns:
+            (start, end) pairs in the tenant's timezone, or None if the
+            tenant's calendar has not been synced
+        """
+        busy = self.calendar_sync.get_index(tenant_id)
+        if busy is None:
+            return None
+        
+        tz = ZoneInfo(timezone_name or settings.DEFAULT_TIMEZONE)
+        duration = SERVICE_DURATIONS_MINUTES[service_type] * 60
+        buffer = (settings.AVAILABILITY_BUFFER_MINUTES if buffer_minutes is None else buffer_minutes) * 60
+        step = (step_minutes or settings.AVAILABILITY_SLOT_STEP_MINUTES) * 60
+        
+        starts = candidate_starts(start, end, duration, step, tz)
+        free_starts = starts[free_slot_mask(busy, starts, duration, buffer)]
+        
+        logger.info(
+            "Availability computed",
+            tenant_id=tenant_id,
+            service_type=service_type.value,
+            candidates=len(starts),
+            free=len(free_starts),
+            busy_blocks=len(busy)
+        )
+        
+        return [
+            (datetime.fromtimestamp(slot, tz), datetime.fromtimestamp(slot + duration, tz))
+            for slot in free_starts.tolist()
+        ]
+
+# Global instance
+availability_service = AvailabilityService()
@@ -0,0 +1,72 @@
+import redis
+from typing import Optional
+import structlog
+
+from app.core.config import settings
+from app.integrations.google_calendar_client import GoogleCalendarClient
+
+logger = structlog.get_logger()
+
+class BookingEventLinks:
+    """
+    Maps Cal.com booking UIDs to the Calendar event they belong to
+    
+    The event ID is derived from the UID of the booking that created it.
+    Rescheduling issues a new UID for the same appointment, so each new UID
+    is linked to the original event under lily:bookings:{uid}:event; later
+    reschedules and cancellations then address the event that exists.
+    """
+    
+    # Bookings can be made months in advance
+    LINK_TTL_SECONDS = 400 * 24 * 3600
+    
+    def __init__(self):
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL)
+                self.redis_client.ping()
+                logger.info("Booking event links Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - booking events resolved from their own UID only")
+    
+    def link_key(self, booking_uid: str) -> str:
+        return f"lily:bookings:{booking_uid}:event"
+    
+    def resolve(self, booking_uid: str) -> str:
+        """Calendar event ID for a booking, following earlier reschedules"""
+        if self.redis_client:
+            try:
+                event_id = self.redis_client.get(self.link_key(booking_uid))
+                if event_id:
+                    return event_id.decode() if isinstance(event_id, bytes) else event_id
+            except Exception as e:
+                logger.error("Failed to resolve booking event", error=str(e), booking_uid=booking_uid)
+        
+        return GoogleCalendarClient.booking_event_id(booking_uid)
+    
+    def link(self, booking_uid: str, original_uid: str) -> str:
+        """
+        Record that a rescheduled booking keeps its original booking's event
+        
+        Args:
+            booking_uid: UID of the new (rescheduled) booking
+            original_uid: UID of the booking it replaces
+        
+        Returns:
+            The Calendar event ID both UIDs now resolve to
+        """
+        event_id = self.resolve(original_uid)
+        
+        if self.redis_client:
+            try:
+                self.redis_client.set(self.link_key(booking_uid), event_id, ex=self.LINK_TTL_SECONDS)
+            except Exception as e:
+                logger.error("Failed to link booking event", error=str(e), booking_uid=booking_uid)
+        
+        return event_id
+
+# Global instance
+booking_event_links = BookingEventLinks()
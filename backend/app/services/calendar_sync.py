@@ -0,0 +1,311 @@
+import time
+import numpy as np
+import redis
+from datetime import date, datetime, time as dt_time
+from typing import List, Dict, Any, Optional, Tuple
+from zoneinfo import ZoneInfo
+import structlog
+
+from app.core.config import settings
+from app.integrations.google_calendar_client import GoogleCalendarClient, CalendarSyncTokenExpired
+
+logger = structlog.get_logger()
+
+class BusyIndex:
+    """
+    Sorted-array index of busy intervals (epoch seconds)
+    
+    Intervals are sorted by start with a running maximum of end times, so
+    an overlap check is one binary search, and many ranges can be checked
+    in a single vectorised searchsorted.
+    """
+    
+    def __init__(self, intervals: List[Tuple[float, float]]):
+        ordered = np.array(sorted(intervals), dtype=np.float64).reshape(-1, 2)
+        self.starts = ordered[:, 0]
+        self.ends = ordered[:, 1]
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def overlaps(self, start: float, end: float) -> bool:
+        """Check whether any busy interval intersects [start, end)"""
+        count = int(np.searchsorted(self.starts, end, side="left"))
+        return count > 0 and bool(self.max_ends[count - 1] > start)
+    
+    def overlaps_many(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Vectorised overlaps() for arrays of [start, end) ranges"""
+        if not len(self.starts):
+            return np.zeros(len(starts), dtype=bool)
+        
+        counts = np.searchsorted(self.starts, ends, side="left")
+        latest_end = self.max_ends[np.maximum(counts - 1, 0)]
+        return (counts > 0) & (latest_end > starts)
+    
+    def between(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Busy intervals intersecting [start, end), ordered by start"""
+        count = int(np.searchsorted(self.starts, end, side="left"))
+        mask = self.ends[:count] > start
+        return list(zip(self.starts[:count][mask].tolist(), self.ends[:count][mask].tolist()))
+
+def event_interval(event: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    Busy interval for a Calendar event, or None if it does not block time
+    
+    Cancelled and transparent ("show as available") events are free. All-day
+    events block from midnight to midnight in their calendar's timezone.
+    """
+    if event.get("status") == "cancelled" or event.get("transparency") == "transparent":
+        return None
+    
+    def timestamp(value: Dict[str, Any]) -> Optional[float]:
+        if value.get("dateTime"):
+            return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).timestamp()
+        if value.get("date"):
+            tz = ZoneInfo(value.get("timeZone") or settings.DEFAULT_TIMEZONE)
+            return datetime.combine(date.fromisoformat(value["date"]), dt_time.min, tzinfo=tz).timestamp()
+        return None
+    
+    start = timestamp(event.get("start") or {})
+    end = timestamp(event.get("end") or {})
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+class CalendarSyncService:
+    """
+    Incremental Google Calendar sync into a per-tenant busy index
+    
+    Busy intervals live in a Redis hash per tenant, updated from syncToken
+    deltas by the CALENDAR_SYNC worker task. Each process keeps a BusyIndex
+    built from that hash and revalidates it against a version counter at
+    most every CALENDAR_BUSY_INDEX_CHECK_SECONDS, so availability checks
+    don't touch Redis or Google.
+    """
+    
+    def __init__(self):
+        self.indexes: Dict[str, Tuple[int, float, BusyIndex]] = {}
+        
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                client = redis.from_url(settings.REDIS_URL)
+                client.ping()
+                self.redis_client = client
+                logger.info("Calendar sync Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - calendar sync disabled")
+    
+    @property
+    def tenants_key(self) -> str:
+        return "lily:calendar:tenants"
+    
+    def busy_key(self, tenant_id: str) -> str:
+        return f"lily:calendar:{tenant_id}:busy"
+    
+    def sync_token_key(self, tenant_id: str) -> str:
+        return f"lily:calendar:{tenant_id}:sync_token"
+    
+    def version_key(self, tenant_id: str) -> str:
+        return f"lily:calendar:{tenant_id}:version"
+    
+    def register_tenant(self, tenant_id: str) -> bool:
+        """
+        Mark a tenant for periodic sync
+        
+        Returns:
+            True if the tenant was not registered before
+        """
+        if not self.redis_client:
+            return False
+        
+        try:
+            return bool(self.redis_client.sadd(self.tenants_key, tenant_id))
+        except Exception as e:
+            logger.error("Failed to register tenant for calendar sync", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def unregister_tenant(self, tenant_id: str) -> bool:
+        """Stop syncing a tenant and drop its busy index"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.srem(self.tenants_key, tenant_id)
+            pipe.delete(self.busy_key(tenant_id), self.sync_token_key(tenant_id), self.version_key(tenant_id))
+            pipe.execute()
+            self.indexes.pop(tenant_id, None)
+            return True
+        except Exception as e:
+            logger.error("Failed to unregister tenant from calendar sync", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def is_tenant_registered(self, tenant_id: str) -> bool:
+        """Check whether a tenant is registered for sync"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            return bool(self.redis_client.sismember(self.tenants_key, tenant_id))
+        except Exception as e:
+            logger.error("Failed to check calendar sync registration", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    async def sync_tenant(self, tenant_id: str, calendar_id: str = 'primary') -> Dict[str, int]:
+        """
+        Pull changes from Google Calendar into the tenant's busy index
+        
+        Uses the stored syncToken for a delta; without one, or when Google
+        has expired it, lists every event and replaces the index.
+        
+        Args:
+            tenant_id: Tenant ID
+            calendar_id: Calendar ID (defaults to primary)
+        
+        Returns:
+            Counts of busy intervals upserted and removed
+        
+        Raises:
+            RuntimeError: If the Calendar listing fails
+        """
+        client = GoogleCalendarClient(tenant_id)
+        sync_token = self._get_sync_token(tenant_id)
+        
+        try:
+            events, next_sync_token = await self._list_changes(client, calendar_id, sync_token)
+        except CalendarSyncTokenExpired:
+            logger.info("Calendar sync token expired, running full sync", tenant_id=tenant_id)
+            sync_token = None
+            events, next_sync_token = await self._list_changes(client, calendar_id, None)
+        
+        upserts = {}
+        removals = []
+        for event in events:
+            interval = event_interval(event)
+            if interval:
+                upserts[event["id"]] = f"{interval[0]},{interval[1]}"
+            else:
+                removals.append(event["id"])
+        
+        self._apply(tenant_id, upserts, removals, next_sync_token, full=sync_token is None)
+        
+        logger.info(
+            "Calendar synced",
+            tenant_id=tenant_id,
+            full=sync_token is None,
+            upserted=len(upserts),
+            removed=len(removals)
+        )
+        
+        return {"upserted": len(upserts), "removed": len(removals)}
+    
+    async def _list_changes(
+        self,
+        client: GoogleCalendarClient,
+        calendar_id: str,
+        sync_token: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        events = []
+        page_token = None
+        
+        while True:
+            page = await client.list_events_page(
+                calendar_id=calendar_id,
+                sync_token=sync_token,
+                page_token=page_token
+            )
+            if page is None:
+                raise RuntimeError("Failed to list Google Calendar events")
+            
+            events.extend(page.get("items", []))
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return events, page.get("nextSyncToken")
+    
+    def _get_sync_token(self, tenant_id: str) -> Optional[str]:
+        if not self.redis_client:
+            return None
+        
+        value = self.redis_client.get(self.sync_token_key(tenant_id))
+        return value.decode() if isinstance(value, bytes) else value
+    
+    def _apply(
+        self,
+        tenant_id: str,
+        upserts: Dict[str, str],
+        removals: List[str],
+        sync_token: Optional[str],
+        full: bool
+    ):
+        if not self.redis_client:
+            return
+        
+        busy_key = self.busy_key(tenant_id)
+        pipe = self.redis_client.pipeline()
+        if full:
+            pipe.delete(busy_key)
+        elif removals:
+            pipe.hdel(busy_key, *removals)
+        if upserts:
+            pipe.hset(busy_key, mapping=upserts)
+        if sync_token:
+            pipe.set(self.sync_token_key(tenant_id), sync_token)
+        pipe.incr(self.version_key(tenant_id))
+        pipe.execute()
+    
+    def get_index(self, tenant_id: str, now: Optional[float] = None) -> Optional[BusyIndex]:
+        """
+        Get the tenant's busy index from the in-process cache
+        
+        Returns:
+            The index, or None if the tenant has never been synced
+        """
+        now = now if now is not None else time.monotonic()
+        cached = self.indexes.get(tenant_id)
+        if cached and now - cached[1] < settings.CALENDAR_BUSY_INDEX_CHECK_SECONDS:
+            return cached[2]
+        
+        if not self.redis_client:
+            return None
+        
+        try:
+            version = self.redis_client.get(self.version_key(tenant_id))
+            if version is None:
+                return None
+            version = int(version)
+            
+            if cached and cached[0] == version:
+                index = cached[2]
+            else:
+                intervals = []
+                for raw in self.redis_client.hgetall(self.busy_key(tenant_id)).values():
+                    start, end = (raw.decode() if isinstance(raw, bytes) else raw).split(",")
+                    intervals.append((float(start), float(end)))
+                index = BusyIndex(intervals)
+            
+            self.indexes[tenant_id] = (version, now, index)
+            return index
+        
+        except Exception as e:
+            logger.error("Failed to load busy index", error=str(e), tenant_id=tenant_id)
+            return cached[2] if cached else None
+    
+    def is_busy(self, tenant_id: str, start: datetime, end: datetime) -> Optional[bool]:
+        """
+        Check a time range against the tenant's synced calendar
+        
+        Returns:
+            True if any busy block overlaps, or None if the tenant's calendar
+            has not been synced yet
+        """
+        index = self.get_index(tenant_id)
+        if index is None:
+            return None
+        return index.overlaps(start.timestamp(), end.timestamp())
+
+# Global instance
+calendar_sync = CalendarSyncService()
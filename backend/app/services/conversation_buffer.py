@@ -0,0 +1,215 @@
+import json
+import math
+import time
+import redis
+from typing import Any, Dict, List, Optional
+import structlog
+
+from app.core.config import settings
+from app.services.jitter_queue import jitter_queue
+
+logger = structlog.get_logger()
+
+class ConversationBuffer:
+    """
+    Per-conversation debounce buffer for inbound texts
+    
+    Customers tend to send a burst ("hi", a photo, "driveway is really
+    dirty", their ZIP) rather than one message. Each inbound text is appended
+    to a Redis list for its conversation (tenant, customer number, business
+    number) and only the first text of a burst schedules an INBOUND_SMS task,
+    CONVERSATION_DEBOUNCE_SECONDS out. When the task fires and the customer
+    has texted again since, it is pushed back until the conversation has been
+    quiet for the debounce window (but never past
+    CONVERSATION_MAX_WAIT_SECONDS from the first text), then the whole burst
+    is quoted as one message.
+    
+    Messages stay in the buffer until ack() so a failed quote run is retried
+    with the same burst. ack() trims up to the last handled message SID, so
+    acknowledging the same burst twice leaves later texts alone.
+    """
+    
+    BUFFER_TTL_SECONDS = 3600
+    
+    def __init__(self):
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL)
+                self.redis_client.ping()
+                logger.info("Conversation buffer Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - conversation buffer disabled")
+    
+    def conversation_key(self, tenant_id: str, from_number: str, to_number: str) -> str:
+        return f"lily:conversation:{tenant_id}:{from_number}:{to_number}"
+    
+    def append(self, tenant_id: str, message: Dict[str, Any], now: Optional[float] = None) -> bool:
+        """
+        Buffer an inbound text, scheduling a flush if it starts a burst
+        
+        Args:
+            tenant_id: Tenant ID
+            message: Inbound message with message_sid, from_number, to_number
+                and body
+            now: Current Unix time (for testing)
+        
+        Returns:
+            True if buffered, False if failed
+        """
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return False
+        
+        now = now if now is not None else time.time()
+        key = self.conversation_key(tenant_id, message["from_number"], message["to_number"])
+        
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.rpush(f"{key}:messages", json.dumps(message))
+            pipe.expire(f"{key}:messages", self.BUFFER_TTL_SECONDS)
+            self._touch(pipe, key, now)
+            starts_burst = pipe.execute()[2]
+            
+            if starts_burst:
+                self._schedule(
+                    tenant_id,
+                    message["from_number"],
+                    message["to_number"],
+                    settings.CONVERSATION_DEBOUNCE_SECONDS,
+                    idempotency_key=f"inbound_sms_{message['message_sid']}"
+                )
+            
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to buffer inbound SMS", error=str(e), message_sid=message.get("message_sid"))
+            return False
+    
+    def take(
+        self,
+        tenant_id: str,
+        from_number: str,
+        to_number: str,
+        now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a conversation's buffered burst once it has gone quiet
+        
+        Args:
+            tenant_id: Tenant ID
+            from_number: Customer phone number
+            to_number: Business phone number
+            now: Current Unix time (for testing)
+        
+        Returns:
+            Buffered messages, oldest first, or an empty list if the flush
+            was pushed back (a new task is already scheduled) or there is
+            nothing buffered
+        """
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return []
+        
+        now = now if now is not None else time.time()
+        key = self.conversation_key(tenant_id, from_number, to_number)
+        
+        state = self.redis_client.hgetall(f"{key}:state")
+        if state:
+            first_at = float(state[b"first_at"])
+            last_at = float(state[b"last_at"])
+            wait = min(
+                last_at + settings.CONVERSATION_DEBOUNCE_SECONDS,
+                first_at + settings.CONVERSATION_MAX_WAIT_SECONDS
+            ) - now
+            if wait > 0:
+                self._schedule(tenant_id, from_number, to_number, math.ceil(wait))
+                return []
+        
+        return [json.loads(raw) for raw in self.redis_client.lrange(f"{key}:messages", 0, -1)]
+    
+    def ack(
+        self,
+        tenant_id: str,
+        from_number: str,
+        to_number: str,
+        last_message_sid: str,
+        now: Optional[float] = None
+    ):
+        """
+        Drop a handled burst, starting a new one for anything that arrived meanwhile
+        
+        Args:
+            tenant_id: Tenant ID
+            from_number: Customer phone number
+            to_number: Business phone number
+            last_message_sid: SID of the last message returned by take()
+            now: Current Unix time (for testing)
+        """
+        if not self.redis_client:
+            return
+        
+        now = now if now is not None else time.time()
+        key = self.conversation_key(tenant_id, from_number, to_number)
+        
+        # Texts are only appended on the right, so the handled burst is
+        # everything up to its last SID
+        sids = [json.loads(raw).get("message_sid") for raw in self.redis_client.lrange(f"{key}:messages", 0, -1)]
+        if last_message_sid not in sids:
+            logger.info("Conversation burst already acknowledged", message_sid=last_message_sid)
+            return
+        
+        pipe = self.redis_client.pipeline()
+        pipe.ltrim(f"{key}:messages", sids.index(last_message_sid) + 1, -1)
+        pipe.llen(f"{key}:messages")
+        pipe.delete(f"{key}:state")
+        _, remaining, _ = pipe.execute()
+        
+        # Texts that arrived mid-quote found the burst still open and didn't
+        # schedule a flush of their own
+        if remaining:
+            pipe = self.redis_client.pipeline()
+            self._touch(pipe, key, now)
+            if pipe.execute()[0]:
+                self._schedule(tenant_id, from_number, to_number, settings.CONVERSATION_DEBOUNCE_SECONDS)
+    
+    @staticmethod
+    def merge(tenant_id: str, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine a burst into one message, replying to the latest text"""
+        latest = messages[-1]
+        return {
+            "message_sid": latest["message_sid"],
+            "tenant_id": tenant_id,
+            "from_number": latest["from_number"],
+            "to_number": latest["to_number"],
+            "body": "\n".join(message["body"] for message in messages if message.get("body")),
+            "num_media": sum(message.get("num_media", 0) for message in messages),
+            "message_count": len(messages)
+        }
+    
+    def _touch(self, pipe: Any, key: str, now: float):
+        # Queues 3 commands; the first returns 1 when this opens a new burst
+        pipe.hsetnx(f"{key}:state", "first_at", now)
+        pipe.hset(f"{key}:state", "last_at", now)
+        pipe.expire(f"{key}:state", self.BUFFER_TTL_SECONDS)
+    
+    def _schedule(
+        self,
+        tenant_id: str,
+        from_number: str,
+        to_number: str,
+        delay_seconds: int,
+        idempotency_key: Optional[str] = None
+    ):
+        jitter_queue.enqueue_delayed(
+            key="INBOUND_SMS",
+            payload={"from_number": from_number, "to_number": to_number},
+            delay_seconds=delay_seconds,
+            tenant_id=tenant_id,
+            idempotency_key=idempotency_key
+        )
+
+# Global instance
+conversation_buffer = ConversationBuffer()
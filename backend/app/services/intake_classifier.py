@@ -0,0 +1,250 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.quoting_service import ServiceType, SeverityLevel, MaterialType
+
+# (category, value, weight, terms) - terms are whole words or short
+# phrases, matched on the lowercased message
+KEYWORDS = [
+    ("service_types", ServiceType.DRIVEWAY, 1.0, ["driveway", "driveways"]),
+    ("service_types", ServiceType.DRIVEWAY, 0.8, ["parking lot", "parking pad", "parking area"]),
+    ("service_types", ServiceType.DRIVEWAY, 0.5, ["drive", "garage", "parking"]),
+    ("service_types", ServiceType.ROOF, 1.0, ["roof", "roofs", "roofing"]),
+    ("service_types", ServiceType.ROOF, 0.8, ["shingle", "shingles"]),
+    ("service_types", ServiceType.ROOF, 0.6, ["gutter", "gutters"]),
+    ("service_types", ServiceType.HOUSE, 1.0, ["house", "siding"]),
+    ("service_types", ServiceType.HOUSE, 0.5, ["home", "exterior", "building"]),
+    ("service_types", ServiceType.DECK, 1.0, ["deck", "decks", "patio", "patios"]),
+    ("service_types", ServiceType.DECK, 0.8, ["porch", "porches", "balcony", "balconies"]),
+    ("service_types", ServiceType.WALKWAY, 1.0, ["walkway", "walkways", "sidewalk", "sidewalks"]),
+    ("service_types", ServiceType.WALKWAY, 0.5, ["path", "paths", "steps", "stairs"]),
+    ("service_types", ServiceType.WINDOWS, 1.0, ["window", "windows"]),
+    ("service_types", ServiceType.WINDOWS, 0.6, ["glass", "pane", "panes"]),
+    
+    ("severities", SeverityLevel.EXTREME, 1.0, [
+        "extreme", "extremely", "terrible", "terribly", "awful", "disaster", "disgusting", "gross", "filthy"
+    ]),
+    ("severities", SeverityLevel.HEAVY, 1.0, [
+        "heavy", "heavily", "very dirty", "really dirty", "super dirty", "caked",
+        "mold", "moldy", "mould", "mouldy", "mildew"
+    ]),
+    ("severities", SeverityLevel.HEAVY, 0.5, ["bad", "badly", "dirty", "stained", "stain", "stains", "grime", "grimy"]),
+    ("severities", SeverityLevel.MODERATE, 1.0, ["moderate", "moderately", "somewhat", "fairly", "a bit", "a little"]),
+    ("severities", SeverityLevel.MODERATE, 0.4, ["some"]),
+    ("severities", SeverityLevel.LIGHT, 1.0, [
+        "light", "lightly", "slight", "slightly", "barely",
+        "not too dirty", "not very dirty", "not that dirty", "not too bad", "not that bad"
+    ]),
+    
+    ("materials", MaterialType.CONCRETE, 1.0, ["concrete", "cement"]),
+    ("materials", MaterialType.ASPHALT, 1.0, ["asphalt", "blacktop", "tarmac"]),
+    ("materials", MaterialType.BRICK, 1.0, ["brick", "bricks"]),
+    ("materials", MaterialType.BRICK, 0.6, ["paver", "pavers"]),
+    ("materials", MaterialType.VINYL, 1.0, ["vinyl"]),
+    ("materials", MaterialType.WOOD, 1.0, ["wood", "wooden", "cedar", "timber"]),
+    ("materials", MaterialType.METAL, 1.0, ["metal", "aluminum", "aluminium", "steel"]),
+    ("materials", MaterialType.OTHER, 0.8, ["stucco", "stone", "composite", "tile"]),
+]
+
+CATEGORIES = ["service_types", "severities", "materials", "sqft", "window_counts", "zip_codes"]
+
+# Words after a number that make it an area, a length or a window count
+SQFT_UNITS = {"sq", "sqft", "sf", "square"}
+LENGTH_UNITS = {"ft", "feet", "foot"}
+DIMENSION_WORDS = {"x", "by", "\u00d7"}
+WINDOW_WORDS = {"window", "windows"}
+
+# Spelled-out counts, only used for window counts
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "dozen": 12,
+    "fifteen": 15, "twenty": 20, "thirty": 30,
+}
+
+TOKEN_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?|[a-z]+|\u00d7")
+
+class IntakeClassifier:
+    """
+    Single-pass keyword and number extraction for quote intake messages
+    
+    The message is tokenized once by a compiled regex and every token is
+    resolved with a dict lookup (phrases through a second lookup keyed by
+    their first word), so cost grows with message length rather than with
+    the number of keywords. Numbers are classified by the token after them:
+    sqft units, "windows", or a standalone 5-digit ZIP. Every category
+    returns all candidates with a score (the sum of matched weights), best
+    first; ties go to the earliest mention.
+    """
+    
+    def __init__(self, keywords: Optional[List[Tuple[str, Any, float, List[str]]]] = None):
+        keywords = keywords if keywords is not None else KEYWORDS
+        
+        # Entries are (category, key, value, weight). Candidates are grouped
+        # by key - the enum's string value - since str hashing is much
+        # cheaper than Enum.__hash__.
+        self.phrases: Dict[Tuple[str, ...], Tuple[str, str, Any, float]] = {}
+        words: Dict[str, Tuple[str, str, Any, float]] = {}
+        phrase_lengths: Dict[str, List[int]] = {}
+        
+        for category, value, weight, terms in keywords:
+            entry = (category, value.value, value, weight)
+            for term in terms:
+                term_words = tuple(term.split())
+                if len(term_words) == 1:
+                    words[term_words[0]] = entry
+                    continue
+                self.phrases[term_words] = entry
+                lengths = phrase_lengths.setdefault(term_words[0], [])
+                if len(term_words) not in lengths:
+                    lengths.append(len(term_words))
+                    lengths.sort(reverse=True)
+        
+        # One lookup per token: (word entry, phrase lengths starting here)
+        self.lexicon: Dict[str, Tuple[Optional[Tuple[str, str, Any, float]], List[int]]] = {
+            token: (words.get(token), phrase_lengths.get(token, []))
+            for token in set(words) | set(phrase_lengths)
+        }
+    
+    def classify(self, text: str) -> Dict[str, List[Tuple[Any, float]]]:
+        """
+        Extract every candidate from a customer message
+        
+        Args:
+            text: Customer message
+        
+        Returns:
+            For each of service_types, severities, materials, sqft,
+            window_counts and zip_codes, a list of (value, score) pairs
+            ordered best first
+        """
+        found: Dict[str, Dict[Any, List[Any]]] = {category: {} for category in CATEGORIES}
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        count = len(tokens)
+        
+        i = 0
+        while i < count:
+            token = tokens[i]
+            step = 1
+            match = None
+            
+            known = self.lexicon.get(token)
+            if known:
+                for length in known[1]:
+                    match = self.phrases.get(tuple(tokens[i:i + length]))
+                    if match:
+                        step = length
+                        break
+                if match is None:
+                    match = known[0]
+            elif token[0].isdigit() or token in NUMBER_WORDS:
+                match, step = self._number(tokens, i, found)
+            
+            if match:
+                self._add(found[match[0]], match[1], match[2], match[3], i)
+            i += step
+        
+        return {category: self._ranked(candidates) for category, candidates in found.items()}
+    
+    def _number(
+        self,
+        tokens: List[str],
+        i: int,
+        found: Dict[str, Dict[Any, List[Any]]]
+    ) -> Tuple[Optional[Tuple[str, Any, Any, float]], int]:
+        token = tokens[i]
+        spelled = token in NUMBER_WORDS
+        value = NUMBER_WORDS[token] if spelled else float(token.rstrip(",").replace(",", ""))
+        
+        # "1.5k sq ft"
+        j = i + 1
+        if j < len(tokens) and tokens[j] == "k" and not spelled:
+            value *= 1000
+            j += 1
+        next_token = tokens[j] if j < len(tokens) else ""
+        
+        # "12 windows", "12 large windows", "a dozen windows"
+        if next_token in WINDOW_WORDS:
+            end = j + 1
+        elif j + 1 < len(tokens) and next_token.isalpha() and tokens[j + 1] in WINDOW_WORDS:
+            end = j + 2
+            # The skipped word still counts: "3 moldy windows" is heavy
+            entry = self.lexicon.get(next_token, (None,))[0]
+            if entry:
+                self._add(found[entry[0]], entry[1], entry[2], entry[3], j)
+        else:
+            end = 0
+        if end:
+            self._add(found["service_types"], ServiceType.WINDOWS.value, ServiceType.WINDOWS, 1.0, i)
+            count = int(value)
+            return (("window_counts", count, count, 1.0) if count else None), end - i
+        
+        if spelled:
+            return None, 1
+        
+        # "20x40", "20 x 40 ft", "20 ft by 40 ft"
+        k = j + 1 if next_token in LENGTH_UNITS else j
+        if k + 1 < len(tokens) and tokens[k] in DIMENSION_WORDS and tokens[k + 1][0].isdigit():
+            end = k + 2
+            if end < len(tokens) and tokens[end] in LENGTH_UNITS:
+                end += 1
+            area = round(value * float(tokens[k + 1].rstrip(",").replace(",", "")))
+            return (("sqft", area, area, 1.0) if area else None), end - i
+        
+        # "800 sq ft", "1,200 square feet", "800sqft"
+        if next_token in SQFT_UNITS:
+            area = round(value)
+            return (("sqft", area, area, 1.0) if area else None), j + 1 - i
+        
+        # "zip 30301, thanks" - the token keeps its trailing comma
+        digits = token.rstrip(",")
+        if len(digits) == 5 and digits.isdigit():
+            weight = 1.0 if "zip" in tokens[max(i - 2, 0):i] else 0.5
+            return ("zip_codes", digits, digits, weight), 1
+        
+        return None, 1
+    
+    @staticmethod
+    def _add(candidates: Dict[Any, List[Any]], key: Any, value: Any, weight: float, position: int):
+        entry = candidates.get(key)
+        if entry:
+            entry[0] += weight
+        else:
+            candidates[key] = [weight, position, value]
+    
+    @staticmethod
+    def _ranked(candidates: Dict[Any, List[Any]]) -> List[Tuple[Any, float]]:
+        if len(candidates) < 2:
+            return [(value, score) for score, _, value in candidates.values()]
+        ranked = sorted(candidates.values(), key=lambda entry: (-entry[0], entry[1]))
+        return [(value, score) for score, _, value in ranked]
+    
+    def extract_quote_inputs(self, text: str) -> Dict[str, Any]:
+        """
+        Best guess at each calculate_quote input from a customer message
+        
+        Args:
+            text: Customer message
+        
+        Returns:
+            service_type, severity, material, sqft, unit_count and zip_code
+            (None where the message doesn't say), plus all candidates
+        """
+        candidates = self.classify(text)
+        
+        return {
+            "service_type": self.best(candidates["service_types"], ServiceType.OTHER),
+            "severity": self.best(candidates["severities"], SeverityLevel.LIGHT),
+            "material": self.best(candidates["materials"]),
+            "sqft": self.best(candidates["sqft"]),
+            "unit_count": self.best(candidates["window_counts"]),
+            "zip_code": self.best(candidates["zip_codes"]),
+            "candidates": candidates
+        }
+    
+    @staticmethod
+    def best(candidates: List[Tuple[Any, float]], default: Any = None) -> Any:
+        """Top candidate's value, or default when there are none"""
+        return candidates[0][0] if candidates else default
+
+# Global instance
+intake_classifier = IntakeClassifier()
@@ -94,6 +94,53 @@ class JitterQueue:
             )
             return None
     
+    def enqueue_many(self, tasks: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Enqueue several delayed tasks in one Redis round trip
+        
+        Args:
+            tasks: Dicts with the enqueue_delayed arguments (key, payload,
+                delay_seconds and optionally tenant_id, idempotency_key)
+        
+        Returns:
+            Task IDs in input order, or all None if the write failed
+        """
+        if not tasks:
+            return []
+        
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return [None] * len(tasks)
+        
+        try:
+            now = time.time()
+            task_ids = []
+            entries = {}
+            
+            for task in tasks:
+                task_id = task.get("idempotency_key") or str(uuid.uuid4())
+                execute_at = now + task["delay_seconds"]
+                task_data = {
+                    "task_id": task_id,
+                    "task_type": task["key"],
+                    "payload": task["payload"],
+                    "tenant_id": task.get("tenant_id"),
+                    "created_at": now,
+                    "execute_at": execute_at,
+                    "retry_count": 0
+                }
+                entries[json.dumps(task_data)] = execute_at
+                task_ids.append(task_id)
+            
+            self.redis_client.zadd(self.queue_key, entries)
+            
+            logger.info("Tasks enqueued", count=len(task_ids))
+            return task_ids
+            
+        except Exception as e:
+            logger.error("Failed to enqueue tasks", count=len(tasks), error=str(e))
+            return [None] * len(tasks)
+    
     def pop_due(self, batch_size: int = 50) -> List[Dict[str, Any]]:
         """
         Pop tasks that are due for execution
@@ -205,6 +252,71 @@ class JitterQueue:
             )
             return False
     
+    def periodic_key(self, key: str, tenant_id: Optional[str]) -> str:
+        return f"lily:periodic:{key}:{tenant_id}"
+    
+    def ensure_periodic(
+        self,
+        key: str,
+        interval_seconds: int,
+        tenant_id: Optional[str] = None,
+        delay_seconds: Optional[int] = None,
+        renew: bool = False
+    ) -> Optional[bool]:
+        """
+        Arm a self-rescheduling task unless its next run is already pending
+        
+        Each scheduled run is recorded under lily:periodic:{key}:{tenant_id},
+        which expires two intervals after the run was due. While it exists the
+        chain is live and this is a no-op; if a run is lost (worker crash after
+        pop_due, retries exhausted) the record lapses and the next call re-arms
+        the chain. Runs share the fixed task ID "{key}:{tenant_id}".
+        
+        Args:
+            key: Task type key (e.g., 'CALENDAR_SYNC')
+            interval_seconds: Time between runs
+            tenant_id: Tenant ID for tracking
+            delay_seconds: Delay before the run (defaults to interval_seconds)
+            renew: Schedule even though a run is recorded; used by the running
+                task to schedule its successor
+        
+        Returns:
+            True if a run was scheduled, False if one was already pending,
+            None if scheduling failed
+        """
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return None
+        
+        delay_seconds = interval_seconds if delay_seconds is None else delay_seconds
+        next_run_key = self.periodic_key(key, tenant_id)
+        
+        try:
+            scheduled = self.redis_client.set(
+                next_run_key,
+                time.time() + delay_seconds,
+                nx=not renew,
+                ex=delay_seconds + 2 * interval_seconds
+            )
+            if not scheduled:
+                return False
+            
+            task_id = self.enqueue_delayed(
+                key=key,
+                payload={},
+                delay_seconds=delay_seconds,
+                tenant_id=tenant_id,
+                idempotency_key=f"{key}:{tenant_id}"
+            )
+            if not task_id:
+                self.redis_client.delete(next_run_key)
+                return None
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to schedule periodic task", error=str(e), task_type=key, tenant_id=tenant_id)
+            return None
+    
     def get_queue_stats(self) -> Dict[str, int]:
         """Get queue statistics"""
         if not self.redis_client:
@@ -0,0 +1,348 @@
+import re
+import string
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+import structlog
+
+from app.core.config import settings
+from app.services.tenant_sms_settings import tenant_sms_settings
+from app.services.versioned_store import VersionedStore
+
+logger = structlog.get_logger()
+
+# Stock wording for every outbound SMS; tenants override any of these
+DEFAULT_TEMPLATES = {
+    "missed_call_followup": (
+        "Sorry we missed your call! 📞 Text us 2-3 photos of what "
+        "needs cleaning + your ZIP code and we'll send a ballpark "
+        "quote in minutes!"
+    ),
+    "missed_call_followup_named": (
+        "Hi {caller_name}! Sorry we missed your call. 📞 "
+        "Text us 2-3 photos of what needs cleaning + your ZIP code "
+        "and we'll send a ballpark quote in minutes!"
+    ),
+    "review_request": (
+        "Hi! 🌟 How did we do with your cleaning? "
+        "We'd love a quick review to help other customers find us!"
+    ),
+    "review_request_named": (
+        "Hi {customer_name}! 🌟 How did we do with your cleaning? "
+        "We'd love a quick review to help other customers find us!"
+    ),
+    "help_response": (
+        "This is Lily AI automated messaging. "
+        "Text photos + ZIP for quotes, or call us directly. "
+        "Reply STOP to unsubscribe."
+    ),
+    "stop_confirmation": (
+        "You've been unsubscribed from SMS messages. "
+        "Reply START to resubscribe or call us anytime."
+    ),
+    "booking_confirmation": (
+        "Hi {customer_name}! 📅 Your pressure washing appointment is confirmed for {appointment_time}. "
+        "We'll text you when we're on our way. Thanks for choosing us!"
+    ),
+    "booking_confirmation_with_location": (
+        "Hi {customer_name}! 📅 Your pressure washing appointment is confirmed for {appointment_time}. "
+        "Location: {location}. We'll text you when we're on our way. Thanks for choosing us!"
+    ),
+    "booking_cancellation": (
+        "Hi {customer_name}, your appointment has been cancelled. "
+        "If you'd like to reschedule, just reply or call us anytime!"
+    ),
+    "booking_reschedule": (
+        "Hi {customer_name}! Your appointment has been rescheduled to "
+        "{appointment_time}. Thanks for your flexibility!"
+    ),
+    "quote_estimate": (
+        "Great! For {service} cleaning, our ballpark range is "
+        "${min}-${max}. 💰\n\n"
+        "For a more precise quote, we'd need the square footage or "
+        "a quick in-person assessment. Would you like to schedule "
+        "a free estimate? 📅"
+    ),
+    "quote": (
+        "Perfect! Based on your details, {service} cleaning "
+        "would be approximately ${avg} "
+        "(range: ${min}-${max}). 💰\n\n"
+        "This includes our standard cleaning process. "
+        "Ready to schedule? 📅"
+    ),
+    "quote_error": (
+        "Sorry, I couldn't calculate a quote right now. "
+        "Please call us for a personalized estimate!"
+    ),
+}
+
+# Placeholders each template may use
+TEMPLATE_FIELDS = {
+    "missed_call_followup": set(),
+    "missed_call_followup_named": {"caller_name"},
+    "review_request": set(),
+    "review_request_named": {"customer_name"},
+    "help_response": set(),
+    "stop_confirmation": set(),
+    "booking_confirmation": {"customer_name", "appointment_time"},
+    "booking_confirmation_with_location": {"customer_name", "appointment_time", "location"},
+    "booking_cancellation": {"customer_name"},
+    "booking_reschedule": {"customer_name", "appointment_time"},
+    "quote_estimate": {"service", "min", "max", "avg"},
+    "quote": {"service", "min", "max", "avg"},
+    "quote_error": set(),
+}
+
+# Stand-in placeholder values of the types sends use, rendered once at save
+# time so a format spec that can't apply is refused instead of failing every send
+SAMPLE_VALUES = {
+    "caller_name": "Sam",
+    "customer_name": "Sam",
+    "location": "123 Main St",
+    "service": "House Wash",
+    "appointment_time": datetime(2025, 6, 2, 18, 30, tzinfo=dt_timezone.utc),
+    "min": 200,
+    "max": 300,
+    "avg": 250,
+}
+
+# Datetime placeholders without a format spec, e.g. "Monday, June 02 at 02:30 PM"
+DEFAULT_DATE_FORMAT = "%A, %B %d at %I:%M %p"
+
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_NAMES = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+# strftime directives rendered from lookup tables rather than the C
+# strftime (locale-dependent and comparatively slow); "-" drops zero padding
+DATE_DIRECTIVES: Dict[str, Callable[[datetime], str]] = {
+    "A": lambda d: DAY_NAMES[d.weekday()],
+    "a": lambda d: DAY_NAMES[d.weekday()][:3],
+    "B": lambda d: MONTH_NAMES[d.month],
+    "b": lambda d: MONTH_NAMES[d.month][:3],
+    "d": lambda d: f"{d.day:02d}",
+    "-d": lambda d: str(d.day),
+    "m": lambda d: f"{d.month:02d}",
+    "-m": lambda d: str(d.month),
+    "Y": lambda d: str(d.year),
+    "H": lambda d: f"{d.hour:02d}",
+    "I": lambda d: f"{d.hour % 12 or 12:02d}",
+    "-I": lambda d: str(d.hour % 12 or 12),
+    "M": lambda d: f"{d.minute:02d}",
+    "p": lambda d: "AM" if d.hour < 12 else "PM",
+    "Z": lambda d: d.tzname() or "",
+    "%": lambda d: "%",
+}
+
+DATE_DIRECTIVE_PATTERN = re.compile(r"%(-?.)")
+FIELD_NAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+class DateFormatter:
+    """
+    strftime-style formatter for one timezone and pattern
+    
+    The pattern is split into literals and directive functions once, and
+    the timezone is resolved once, so formatting a datetime is a timezone
+    conversion plus a join. Naive datetimes are taken as UTC.
+    """
+    
+    __slots__ = ("zone", "parts")
+    
+    def __init__(self, timezone: str, pattern: str):
+        self.zone = ZoneInfo(timezone)
+        self.parts: List[Union[str, Callable[[datetime], str]]] = []
+        
+        position = 0
+        for match in DATE_DIRECTIVE_PATTERN.finditer(pattern):
+            if match.start() > position:
+                self.parts.append(pattern[position:match.start()])
+            directive = match.group(1)
+            self.parts.append(DATE_DIRECTIVES.get(directive) or (lambda d, spec=match.group(): d.strftime(spec)))
+            position = match.end()
+        if position < len(pattern):
+            self.parts.append(pattern[position:])
+    
+    def format(self, value: datetime) -> str:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=dt_timezone.utc)
+        local = value.astimezone(self.zone)
+        return "".join(part if part.__class__ is str else part(local) for part in self.parts)
+
+_date_formatters: Dict[Tuple[str, str], DateFormatter] = {}
+
+def date_formatter(timezone: str, pattern: str = DEFAULT_DATE_FORMAT) -> DateFormatter:
+    """Shared formatter for a timezone and pattern, built on first use"""
+    formatter = _date_formatters.get((timezone, pattern))
+    if formatter is None:
+        try:
+            formatter = DateFormatter(timezone, pattern)
+        except Exception as e:
+            logger.error("Invalid timezone for date formatting", error=str(e), timezone=timezone)
+            formatter = DateFormatter(settings.DEFAULT_TIMEZONE, pattern)
+        _date_formatters[(timezone, pattern)] = formatter
+    return formatter
+
+class CompiledTemplate:
+    """
+    A message template split into literal text and placeholders
+    
+    Templates use str.format placeholders ("Hi {customer_name}!"); a format
+    spec on a datetime placeholder is a strftime pattern
+    ("{appointment_time:%A at %-I:%M %p}") rendered in the tenant's timezone.
+    """
+    
+    __slots__ = ("text", "parts")
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.parts: List[Union[str, Tuple[str, str]]] = []
+        
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(text):
+            if literal:
+                self.parts.append(literal)
+            if field_name is None:
+                continue
+            if not FIELD_NAME_PATTERN.match(field_name) or conversion:
+                raise ValueError(f"Unsupported placeholder: {{{field_name}}}")
+            self.parts.append((field_name, format_spec or ""))
+    
+    @property
+    def fields(self) -> set:
+        return {part[0] for part in self.parts if part.__class__ is tuple}
+    
+    def render(self, values: Dict[str, Any], timezone: str) -> str:
+        chunks = []
+        for part in self.parts:
+            if part.__class__ is str:
+                chunks.append(part)
+                continue
+            
+            name, spec = part
+            value = values[name]
+            if isinstance(value, datetime):
+                chunks.append(date_formatter(timezone, spec or DEFAULT_DATE_FORMAT).format(value))
+            elif spec:
+                chunks.append(format(value, spec))
+            else:
+                chunks.append(str(value))
+        return "".join(chunks)
+
+def validate_templates(templates: Dict[str, Any]) -> Dict[str, CompiledTemplate]:
+    """
+    Check and compile a tenant's template overrides
+    
+    Args:
+        templates: Template name -> template text
+    
+    Returns:
+        Compiled templates
+    
+    Raises:
+        ValueError: If a template name or placeholder is unknown, or a
+            template doesn't parse or render
+    """
+    compiled = {}
+    for name, text in templates.items():
+        if name not in TEMPLATE_FIELDS:
+            raise ValueError(f"Unknown template: {name}")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError(f"Template {name} must be non-empty text")
+        
+        template = CompiledTemplate(text)
+        unknown = template.fields - TEMPLATE_FIELDS[name]
+        if unknown:
+            raise ValueError(f"Unknown placeholders in {name}: {', '.join(sorted(unknown))}")
+        
+        try:
+            template.render(SAMPLE_VALUES, settings.DEFAULT_TIMEZONE)
+        except Exception as e:
+            raise ValueError(f"Invalid format in {name}: {e}")
+        compiled[name] = template
+    
+    return compiled
+
+class TemplateSet:
+    """A tenant's compiled templates at one version, defaults filled in"""
+    
+    __slots__ = ("version", "key", "templates")
+    
+    def __init__(self, version: int, templates: Dict[str, CompiledTemplate], tenant_id: Optional[str] = None):
+        self.version = version
+        # Cache key for rendered output: None for the shared default set
+        self.key = (tenant_id, version) if tenant_id else None
+        self.templates = templates
+    
+    def render(self, name: str, values: Dict[str, Any], timezone: Optional[str] = None) -> str:
+        return self.templates[name].render(values, timezone or settings.DEFAULT_TIMEZONE)
+
+DEFAULT_COMPILED = {name: CompiledTemplate(text) for name, text in DEFAULT_TEMPLATES.items()}
+
+class MessageTemplateStore(VersionedStore):
+    """
+    Per-tenant SMS templates, compiled once and cached per version
+    
+    Overrides are stored under lily:templates:{tenant_id} and cached as
+    TemplateSets for MESSAGE_TEMPLATE_CACHE_TTL_SECONDS between version
+    checks. Tenants without overrides share the default set.
+    """
+    
+    KEY_PREFIX = "lily:templates"
+    CHANNEL = "lily:templates:invalidate"
+    FIELD = "templates"
+    NAME = "message templates"
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        super().__init__(TemplateSet(0, DEFAULT_COMPILED), max_entries or settings.MESSAGE_TEMPLATE_CACHE_SIZE)
+    
+    @property
+    def cache_ttl_seconds(self) -> int:
+        return settings.MESSAGE_TEMPLATE_CACHE_TTL_SECONDS
+    
+    @property
+    def default_set(self) -> TemplateSet:
+        return self.default
+    
+    def render(self, tenant_id: Optional[str], name: str, **values: Any) -> str:
+        """
+        Render a message with the tenant's templates and timezone
+        
+        Args:
+            tenant_id: Tenant ID (None for the defaults)
+            name: Template name
+            **values: Placeholder values; datetimes are formatted in the
+                tenant's timezone
+        
+        Returns:
+            Message text
+        """
+        timezone = tenant_sms_settings.get(tenant_id)["timezone"]
+        return self.get(tenant_id).render(name, values, timezone)
+    
+    def save_templates(self, tenant_id: str, templates: Dict[str, Any]) -> Optional[int]:
+        """
+        Replace a tenant's template overrides
+        
+        Raises:
+            ValueError: If the templates don't validate
+        
+        Returns:
+            New version, or None if storage is unavailable
+        """
+        validate_templates(templates)
+        return self._write(tenant_id, templates)
+    
+    def delete_templates(self, tenant_id: str) -> Optional[int]:
+        """Revert a tenant to the default templates"""
+        return self._write(tenant_id, None)
+    
+    def get_templates(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Read a tenant's stored overrides and version"""
+        return self._read(tenant_id)
+    
+    def _compile(self, tenant_id: str, version: int, templates: Dict[str, Any]) -> TemplateSet:
+        return TemplateSet(version, {**DEFAULT_COMPILED, **validate_templates(templates)}, tenant_id)
+
+# Global instance
+message_templates = MessageTemplateStore()
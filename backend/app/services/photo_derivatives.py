@@ -0,0 +1,108 @@
+import io
+import tempfile
+from typing import List, Optional
+import structlog
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+from app.integrations.s3_client import S3Client
+
+logger = structlog.get_logger()
+
+# Longest edge in pixels for each size variant
+DERIVATIVE_SIZES = {
+    "thumb": 320,
+    "web": 1600,
+}
+
+# Output format -> (Pillow format, content type, file extension, save options)
+DERIVATIVE_FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", "jpg", {"quality": 82, "progressive": True}),
+    "webp": ("WEBP", "image/webp", "webp", {"quality": 80, "method": 4}),
+}
+
+# Derivative keys embed the original's UUID, so their content never changes
+DERIVATIVE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def derivative_key(file_key: str, size: str, image_format: str) -> str:
+    """
+    Build the S3 key for a derivative of an original photo
+    
+    photos/{tenant}/{lead}/{file_id}.jpg -> derived/{tenant}/{lead}/{file_id}/{size}.{ext}
+    """
+    path = file_key.split("/", 1)[1]
+    stem = path.rsplit(".", 1)[0]
+    return f"derived/{stem}/{size}.{DERIVATIVE_FORMATS[image_format][2]}"
+
+def derivative_keys(file_key: str) -> List[str]:
+    """All derivative keys that may exist for an original photo"""
+    return [
+        derivative_key(file_key, size, image_format)
+        for size in DERIVATIVE_SIZES
+        for image_format in DERIVATIVE_FORMATS
+    ]
+
+class PhotoDerivativeService:
+    """Produces resized JPEG/WebP copies of uploaded photos"""
+    
+    def __init__(self, s3_client: Optional[S3Client] = None):
+        self.s3_client = s3_client or S3Client()
+    
+    def generate(self, file_key: str) -> Optional[List[str]]:
+        """
+        Generate and upload every size variant for a photo
+        
+        The original is spooled to disk past PHOTO_DERIVATIVE_SPOOL_BYTES and
+        JPEGs are decoded at reduced scale, so memory stays bounded even for
+        large camera originals. Variants are produced largest first, each
+        one downscaled from the previous.
+        
+        Args:
+            file_key: S3 key of the original photo
+        
+        Returns:
+            Names of the generated size variants, an empty list if the
+            original isn't a decodable image (retrying won't help), or None
+            if failed
+        """
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=settings.PHOTO_DERIVATIVE_SPOOL_BYTES) as original:
+                if not self.s3_client.download_fileobj(file_key, original):
+                    return None
+                original.seek(0)
+                
+                with Image.open(original) as source:
+                    largest_edge = max(DERIVATIVE_SIZES.values())
+                    source.draft("RGB", (largest_edge, largest_edge))
+                    image = ImageOps.exif_transpose(source)
+                    if image.mode != "RGB":
+                        image = image.convert("RGB")
+                
+                generated = []
+                for size, edge in sorted(DERIVATIVE_SIZES.items(), key=lambda item: -item[1]):
+                    image.thumbnail((edge, edge), Image.LANCZOS)
+                    
+                    for image_format, (pil_format, content_type, _, options) in DERIVATIVE_FORMATS.items():
+                        buffer = io.BytesIO()
+                        image.save(buffer, pil_format, **options)
+                        buffer.seek(0)
+                        
+                        if not self.s3_client.upload_fileobj(
+                            derivative_key(file_key, size, image_format),
+                            buffer,
+                            content_type=content_type,
+                            cache_control=DERIVATIVE_CACHE_CONTROL
+                        ):
+                            return None
+                    
+                    generated.append(size)
+            
+            logger.info("Photo derivatives generated", file_key=file_key, sizes=generated)
+            return generated
+        
+        except UnidentifiedImageError as e:
+            logger.warning("Original is not a decodable image, skipping derivatives", error=str(e), file_key=file_key)
+            return []
+        except Exception as e:
+            logger.error("Failed to generate photo derivatives", error=str(e), file_key=file_key)
+            return None
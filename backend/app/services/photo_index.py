@@ -0,0 +1,436 @@
+import base64
+import json
+import mimetypes
+import redis
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+from app.integrations.s3_client import AsyncS3Client
+
+logger = structlog.get_logger()
+
+# Marks listing cursors issued by the index, as opposed to S3 continuation tokens
+INDEX_CURSOR_PREFIX = "ix:"
+
+def parse_photo_key(file_key: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract (tenant_id, lead_id) from a photo key
+    
+    Keys follow the photos/{tenant_id}/{lead_id}/{file} layout used by S3Client.
+    """
+    parts = file_key.split("/")
+    if len(parts) < 4 or parts[0] != "photos" or not parts[1] or not parts[2]:
+        return None
+    return parts[1], parts[2]
+
+class PhotoIndex:
+    """Redis hash-based index of uploaded photo metadata per (tenant, lead)"""
+    
+    def __init__(self):
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                client = redis.from_url(settings.REDIS_URL)
+                client.ping()
+                self.redis_client = client
+                logger.info("Photo index Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - photo index disabled")
+    
+    @property
+    def tenants_key(self) -> str:
+        return "lily:photos:tenants"
+    
+    def lead_key(self, tenant_id: str, lead_id: str) -> str:
+        return f"lily:photos:{tenant_id}:{lead_id}"
+    
+    def tenant_leads_key(self, tenant_id: str) -> str:
+        return f"lily:photos:{tenant_id}:leads"
+    
+    @staticmethod
+    def _serialize(photo: Dict[str, Any]) -> str:
+        last_modified = photo.get("last_modified")
+        if isinstance(last_modified, datetime):
+            last_modified = last_modified.isoformat()
+        
+        record = {
+            "file_key": photo["file_key"],
+            "size_bytes": photo.get("size_bytes"),
+            "etag": photo.get("etag"),
+            "content_type": photo.get("content_type") or mimetypes.guess_type(photo["file_key"])[0],
+            "last_modified": last_modified
+        }
+        if photo.get("derivatives"):
+            record["derivatives"] = photo["derivatives"]
+        return json.dumps(record)
+    
+    def record_photo(self, tenant_id: str, lead_id: str, photo: Dict[str, Any]) -> bool:
+        """
+        Add or replace a photo in the index
+        
+        Args:
+            tenant_id: Tenant ID
+            lead_id: Lead ID
+            photo: Metadata with file_key, size_bytes, etag, content_type, last_modified
+        
+        Returns:
+            True if recorded
+        """
+        if not self.redis_client:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.hset(self.lead_key(tenant_id, lead_id), photo["file_key"], self._serialize(photo))
+            pipe.sadd(self.tenant_leads_key(tenant_id), lead_id)
+            pipe.execute()
+            
+            logger.info(
+                "Photo indexed",
+                tenant_id=tenant_id,
+                lead_id=lead_id,
+                file_key=photo["file_key"]
+            )
+            return True
+        
+        except Exception as e:
+            logger.error(
+                "Failed to index photo",
+                error=str(e),
+                tenant_id=tenant_id,
+                lead_id=lead_id
+            )
+            return False
+    
+    def get_photo(self, tenant_id: str, lead_id: str, file_key: str) -> Optional[Dict[str, Any]]:
+        """Read a single indexed photo"""
+        if not self.redis_client:
+            return None
+        
+        try:
+            raw = self.redis_client.hget(self.lead_key(tenant_id, lead_id), file_key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.error("Failed to read indexed photo", error=str(e), file_key=file_key)
+            return None
+    
+    def set_derivatives(self, tenant_id: str, lead_id: str, file_key: str, sizes: List[str]) -> bool:
+        """Record which size variants have been generated for a photo"""
+        photo = self.get_photo(tenant_id, lead_id, file_key)
+        if photo is None:
+            return False
+        
+        try:
+            photo["derivatives"] = sizes
+            self.redis_client.hset(self.lead_key(tenant_id, lead_id), file_key, json.dumps(photo))
+            return True
+        except Exception as e:
+            logger.error("Failed to record photo derivatives", error=str(e), file_key=file_key)
+            return False
+    
+    def remove_photo(self, tenant_id: str, lead_id: str, file_key: str) -> bool:
+        """Remove a photo from the index"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.hdel(self.lead_key(tenant_id, lead_id), file_key)
+            return True
+        except Exception as e:
+            logger.error("Failed to remove photo from index", error=str(e), file_key=file_key)
+            return False
+    
+    def remove_photos(self, file_keys: List[str]) -> bool:
+        """Remove many photos from the index in one round trip"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for file_key in file_keys:
+                parsed = parse_photo_key(file_key)
+                if parsed:
+                    pipe.hdel(self.lead_key(*parsed), file_key)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Failed to remove photos from index", error=str(e), count=len(file_keys))
+            return False
+    
+    def clear_tenant(self, tenant_id: str) -> bool:
+        """Drop every index entry for a tenant and stop its reconciliation"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline()
+            for lead_id in self.get_indexed_leads(tenant_id):
+                pipe.delete(self.lead_key(tenant_id, lead_id))
+            pipe.delete(self.tenant_leads_key(tenant_id))
+            pipe.srem(self.tenants_key, tenant_id)
+            pipe.execute()
+            
+            logger.info("Photo index cleared for tenant", tenant_id=tenant_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to clear tenant photo index", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def get_lead_photos(self, tenant_id: str, lead_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read all indexed photos for a lead in a single round trip
+        
+        Returns:
+            Photos ordered by upload time, or None if the index is unavailable
+            or the tenant has not been indexed yet (callers fall back to S3)
+        """
+        if not self.redis_client:
+            return None
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.sismember(self.tenants_key, tenant_id)
+            pipe.hgetall(self.lead_key(tenant_id, lead_id))
+            is_indexed, raw_photos = pipe.execute()
+            
+            if not is_indexed:
+                return None
+            
+            photos = [json.loads(raw) for raw in raw_photos.values()]
+            photos.sort(key=self._sort_key)
+            return photos
+        except Exception as e:
+            logger.error(
+                "Failed to read photo index",
+                error=str(e),
+                tenant_id=tenant_id,
+                lead_id=lead_id
+            )
+            return None
+    
+    def get_lead_photos_page(
+        self,
+        tenant_id: str,
+        lead_id: str,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read one page of a lead's indexed photos
+        
+        The cursor records the sort position (upload time, file key) of the
+        last photo returned, so pages stay consistent while photos are added
+        or removed between requests.
+        
+        Args:
+            tenant_id: Tenant ID
+            lead_id: Lead ID
+            limit: Maximum number of photos to return
+            cursor: next_cursor from the previous page
+        
+        Returns:
+            Dictionary with photos and next_cursor (None on the last page),
+            or None if the index can't serve this lead (callers fall back to S3)
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        
+        photos = self.get_lead_photos(tenant_id, lead_id)
+        if photos is None:
+            return None
+        
+        if after is not None:
+            photos = [photo for photo in photos if self._sort_key(photo) > after]
+        
+        page = photos[:limit]
+        next_cursor = self._encode_cursor(page[-1]) if len(photos) > limit else None
+        return {"photos": page, "next_cursor": next_cursor}
+    
+    @staticmethod
+    def is_index_cursor(cursor: str) -> bool:
+        return cursor.startswith(INDEX_CURSOR_PREFIX)
+    
+    @staticmethod
+    def _sort_key(photo: Dict[str, Any]) -> Tuple[str, str]:
+        return (photo.get("last_modified") or "", photo["file_key"])
+    
+    @classmethod
+    def _encode_cursor(cls, photo: Dict[str, Any]) -> str:
+        position = json.dumps(cls._sort_key(photo)).encode()
+        return INDEX_CURSOR_PREFIX + base64.urlsafe_b64encode(position).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str]:
+        try:
+            last_modified, file_key = json.loads(base64.urlsafe_b64decode(cursor[len(INDEX_CURSOR_PREFIX):]))
+            return (str(last_modified), str(file_key))
+        except Exception:
+            raise ValueError("Invalid cursor")
+    
+    def is_tenant_indexed(self, tenant_id: str) -> bool:
+        """Check whether a tenant is registered in the index"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            return bool(self.redis_client.sismember(self.tenants_key, tenant_id))
+        except Exception as e:
+            logger.error("Failed to check tenant photo index", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def register_tenant(self, tenant_id: str) -> bool:
+        """
+        Mark a tenant as indexed
+        
+        Returns:
+            True if the tenant was not registered before
+        """
+        if not self.redis_client:
+            return False
+        
+        try:
+            return bool(self.redis_client.sadd(self.tenants_key, tenant_id))
+        except Exception as e:
+            logger.error("Failed to register tenant in photo index", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def replace_lead_photos(
+        self,
+        tenant_id: str,
+        lead_id: str,
+        photos: List[Dict[str, Any]],
+        preserve_since: Optional[datetime] = None
+    ) -> bool:
+        """
+        Replace a lead's index entries with a fresh S3 listing
+        
+        Args:
+            tenant_id: Tenant ID
+            lead_id: Lead ID
+            photos: Photos currently in S3 for the lead
+            preserve_since: Keep existing entries uploaded at or after this
+                time, so photos confirmed while a listing was in flight survive
+        
+        Returns:
+            True if replaced
+        """
+        if not self.redis_client:
+            return False
+        
+        try:
+            key = self.lead_key(tenant_id, lead_id)
+            existing = {}
+            for raw in self.redis_client.hgetall(key).values():
+                photo = json.loads(raw)
+                existing[photo["file_key"]] = photo
+            
+            mapping = {}
+            if preserve_since:
+                cutoff = preserve_since.isoformat()
+                for file_key, photo in existing.items():
+                    if (photo.get("last_modified") or "") >= cutoff:
+                        mapping[file_key] = json.dumps(photo)
+            
+            for photo in photos:
+                # S3 LIST does not return content types, keep what we already know
+                known = existing.get(photo["file_key"], {})
+                mapping[photo["file_key"]] = self._serialize({
+                    **photo,
+                    "content_type": photo.get("content_type") or known.get("content_type"),
+                    "derivatives": known.get("derivatives")
+                })
+            
+            pipe = self.redis_client.pipeline()
+            pipe.delete(key)
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+                pipe.sadd(self.tenant_leads_key(tenant_id), lead_id)
+            else:
+                pipe.srem(self.tenant_leads_key(tenant_id), lead_id)
+            pipe.execute()
+            return True
+        
+        except Exception as e:
+            logger.error(
+                "Failed to replace lead photo index",
+                error=str(e),
+                tenant_id=tenant_id,
+                lead_id=lead_id
+            )
+            return False
+    
+    def get_indexed_leads(self, tenant_id: str) -> List[str]:
+        """List lead IDs that currently have index entries"""
+        if not self.redis_client:
+            return []
+        
+        try:
+            return [
+                lead_id.decode() if isinstance(lead_id, bytes) else lead_id
+                for lead_id in self.redis_client.smembers(self.tenant_leads_key(tenant_id))
+            ]
+        except Exception as e:
+            logger.error("Failed to read indexed leads", error=str(e), tenant_id=tenant_id)
+            return []
+    
+    async def reconcile_tenant(self, tenant_id: str, s3_client: AsyncS3Client) -> Dict[str, int]:
+        """
+        Rebuild a tenant's index from an S3 listing
+        
+        Keys are listed in lexicographic order, so each lead's photos arrive
+        contiguously and are flushed as soon as the listing moves past them.
+        
+        Args:
+            tenant_id: Tenant ID
+            s3_client: Async S3 client used to stream the tenant prefix
+        
+        Returns:
+            Counts of photos and leads reconciled
+        """
+        started_at = datetime.now(timezone.utc)
+        seen_leads = set()
+        current_lead = None
+        buffer: List[Dict[str, Any]] = []
+        photo_count = 0
+        
+        async for photos in s3_client.stream_photo_pages(tenant_id=tenant_id):
+            for photo in photos:
+                parsed = parse_photo_key(photo["file_key"])
+                if not parsed:
+                    continue
+                
+                lead_id = parsed[1]
+                if lead_id != current_lead:
+                    if current_lead is not None:
+                        self.replace_lead_photos(tenant_id, current_lead, buffer, preserve_since=started_at)
+                    current_lead = lead_id
+                    buffer = []
+                    seen_leads.add(lead_id)
+                
+                buffer.append(photo)
+                photo_count += 1
+        
+        if current_lead is not None:
+            self.replace_lead_photos(tenant_id, current_lead, buffer, preserve_since=started_at)
+        
+        # Leads whose photos were all removed from S3
+        for lead_id in set(self.get_indexed_leads(tenant_id)) - seen_leads:
+            self.replace_lead_photos(tenant_id, lead_id, [], preserve_since=started_at)
+        
+        logger.info(
+            "Photo index reconciled",
+            tenant_id=tenant_id,
+            photos=photo_count,
+            leads=len(seen_leads)
+        )
+        
+        return {"photos": photo_count, "leads": len(seen_leads)}
+
+# Global instance
+photo_index = PhotoIndex()
@@ -0,0 +1,129 @@
+import time
+import redis
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+class PresignedUrlCache:
+    """
+    Two-level (in-process + Redis) cache of presigned GET URLs
+    
+    Time is split into fixed buckets. Every URL signed during a bucket
+    expires at the end of the following bucket, and is cached until the end
+    of its own bucket, so repeated requests within a bucket get a
+    byte-identical URL (browser/CDN cache hits) that is still valid for at
+    least one full bucket.
+    """
+    
+    def __init__(self, bucket_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.bucket_seconds = bucket_seconds or settings.PRESIGNED_URL_BUCKET_SECONDS
+        self.max_entries = max_entries or settings.PRESIGNED_URL_CACHE_SIZE
+        self.local: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                client = redis.from_url(settings.REDIS_URL)
+                client.ping()
+                self.redis_client = client
+                logger.info("Presigned URL cache Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+    
+    def redis_key(self, object_key: str, bucket: int) -> str:
+        return f"lily:presigned:{bucket}:{object_key}"
+    
+    def _bucket(self, now: float) -> int:
+        return int(now // self.bucket_seconds)
+    
+    def _remember(self, object_key: str, bucket: int, url: str):
+        self.local[object_key] = (bucket, url)
+        self.local.move_to_end(object_key)
+        while len(self.local) > self.max_entries:
+            self.local.popitem(last=False)
+    
+    async def get_or_sign(
+        self,
+        object_key: str,
+        sign: Callable[[int], Awaitable[Optional[str]]],
+        now: Optional[float] = None
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Return the URL for the current bucket, signing it at most once
+        
+        Args:
+            object_key: S3 object key (variants have distinct keys)
+            sign: Coroutine taking ExpiresIn seconds and returning a URL
+            now: Current time, for tests
+        
+        Returns:
+            (url, seconds until the URL expires), or None if signing failed
+        """
+        now = now if now is not None else time.time()
+        bucket = self._bucket(now)
+        expires_at = (bucket + 2) * self.bucket_seconds
+        expires_in = int(expires_at - now)
+        
+        cached = self.local.get(object_key)
+        if cached and cached[0] == bucket:
+            self.local.move_to_end(object_key)
+            self.hits += 1
+            return cached[1], expires_in
+        
+        redis_key = self.redis_key(object_key, bucket)
+        url = self._redis_get(redis_key)
+        if url:
+            self.hits += 1
+            self._remember(object_key, bucket, url)
+            return url, expires_in
+        
+        self.misses += 1
+        url = await sign(expires_in)
+        if not url:
+            return None
+        
+        # Another replica may have signed concurrently; converge on its URL
+        ttl = int((bucket + 1) * self.bucket_seconds - now) + 1
+        url = self._redis_set_or_get(redis_key, url, ttl)
+        self._remember(object_key, bucket, url)
+        return url, expires_in
+    
+    def _redis_get(self, redis_key: str) -> Optional[str]:
+        if not self.redis_client:
+            return None
+        
+        try:
+            value = self.redis_client.get(redis_key)
+            return value.decode() if isinstance(value, bytes) else value
+        except Exception as e:
+            logger.error("Failed to read presigned URL cache", error=str(e))
+            return None
+    
+    def _redis_set_or_get(self, redis_key: str, url: str, ttl: int) -> str:
+        if not self.redis_client:
+            return url
+        
+        try:
+            if self.redis_client.set(redis_key, url, nx=True, ex=ttl):
+                return url
+            return self._redis_get(redis_key) or url
+        except Exception as e:
+            logger.error("Failed to write presigned URL cache", error=str(e))
+            return url
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "local_entries": len(self.local)
+        }
+
+# Global instance
+presigned_url_cache = PresignedUrlCache()
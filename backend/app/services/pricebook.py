@@ -0,0 +1,163 @@
+import math
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+from app.services.quoting_service import QuotingService, ServiceType, SeverityLevel, MaterialType
+from app.services.versioned_store import VersionedStore
+
+logger = structlog.get_logger()
+
+SERVICE_TYPES = list(ServiceType)
+SEVERITY_LEVELS = list(SeverityLevel)
+MATERIAL_TYPES = list(MaterialType)
+
+# Flat table index for "no material given"
+NO_MATERIAL = len(MATERIAL_TYPES)
+
+# Rule sections and the enum each one is keyed by
+RULE_SECTIONS = {
+    "base_prices": ServiceType,
+    "per_sqft_rates": ServiceType,
+    "severity_multipliers": SeverityLevel,
+    "material_multipliers": MaterialType,
+}
+
+def validate_rules(rules: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Check a rule set and normalise it to plain numbers
+    
+    Raises:
+        ValueError: On an unknown section or key, or a value that isn't a
+            finite, non-negative number
+    """
+    normalised = {}
+    for section, overrides in rules.items():
+        if section not in RULE_SECTIONS:
+            raise ValueError(f"Unknown pricebook section: {section}")
+        
+        enum = RULE_SECTIONS[section]
+        valid_keys = {member.value for member in enum}
+        normalised[section] = {}
+        for key, value in (overrides or {}).items():
+            if key not in valid_keys:
+                raise ValueError(f"Unknown {section} key: {key}")
+            try:
+                number = None if isinstance(value, bool) else float(value)
+            except (TypeError, ValueError):
+                number = None
+            if number is None or not math.isfinite(number) or number < 0:
+                raise ValueError(f"Invalid {section} value for {key}")
+            normalised[section][key] = number
+    
+    return normalised
+
+class CompiledPriceBook:
+    """
+    A tenant's pricing rules flattened for allocation-light lookups
+    
+    table holds one (base_price, per_unit_rate, severity_multiplier,
+    material_multiplier) tuple per (service, severity, material) cell, with
+    an extra material slot for "no material". array is the same table as a
+    float64 matrix for calculate_quotes_batch.
+    """
+    
+    __slots__ = ("version", "table", "array")
+    
+    def __init__(self, version: int, rules: Optional[Dict[str, Dict[str, float]]] = None):
+        rules = rules or {}
+        base_prices = {**{k.value: v for k, v in QuotingService.BASE_PRICES.items()}, **rules.get("base_prices", {})}
+        rates = {**{k.value: v for k, v in QuotingService.PER_SQFT_RATES.items()}, **rules.get("per_sqft_rates", {})}
+        severities = {**{k.value: v for k, v in QuotingService.SEVERITY_MULTIPLIERS.items()}, **rules.get("severity_multipliers", {})}
+        materials = {**{k.value: v for k, v in QuotingService.MATERIAL_MULTIPLIERS.items()}, **rules.get("material_multipliers", {})}
+        
+        material_values = [materials[material.value] for material in MATERIAL_TYPES] + [1.0]
+        
+        self.version = version
+        self.table = tuple(
+            (base_prices[service.value], rates[service.value], severities[severity.value], material_multiplier)
+            for service in SERVICE_TYPES
+            for severity in SEVERITY_LEVELS
+            for material_multiplier in material_values
+        )
+        self.array = np.array(self.table, dtype=np.float64)
+    
+    @staticmethod
+    def flat_index(service_code, severity_code, material_code):
+        """
+        Position of a (service, severity, material) cell
+        
+        Works on ints or numpy arrays of codes; pass NO_MATERIAL as the
+        material code when no material was given.
+        """
+        return (service_code * len(SEVERITY_LEVELS) + severity_code) * (NO_MATERIAL + 1) + material_code
+    
+    def lookup(
+        self,
+        service_type: ServiceType,
+        severity: SeverityLevel,
+        material: Optional[MaterialType]
+    ) -> Tuple[float, float, float, float]:
+        """(base_price, per_unit_rate, severity_multiplier, material_multiplier) for a job"""
+        return self.table[self.flat_index(
+            QuotingService.SERVICE_TYPE_CODES[service_type],
+            QuotingService.SEVERITY_CODES[severity],
+            QuotingService.MATERIAL_CODES[material] if material else NO_MATERIAL
+        )]
+
+class PriceBookStore(VersionedStore):
+    """
+    Per-tenant pricebooks stored in Redis and compiled once per process
+    
+    Rules are stored under lily:pricebook:{tenant_id} and cached as
+    CompiledPriceBooks for PRICEBOOK_CACHE_TTL_SECONDS between version
+    checks. Tenants without custom rules share one default book.
+    """
+    
+    KEY_PREFIX = "lily:pricebook"
+    CHANNEL = "lily:pricebook:invalidate"
+    FIELD = "rules"
+    NAME = "pricebook"
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        super().__init__(CompiledPriceBook(version=0), max_entries or settings.PRICEBOOK_CACHE_SIZE)
+    
+    @property
+    def cache_ttl_seconds(self) -> int:
+        return settings.PRICEBOOK_CACHE_TTL_SECONDS
+    
+    @property
+    def default_book(self) -> CompiledPriceBook:
+        return self.default
+    
+    def save_rules(self, tenant_id: str, rules: Dict[str, Any]) -> Optional[int]:
+        """
+        Replace a tenant's pricing rules
+        
+        Args:
+            tenant_id: Tenant ID
+            rules: Overrides per section, e.g. {"base_prices": {"driveway": 175}}
+        
+        Returns:
+            The new version, or None if storage failed
+        
+        Raises:
+            ValueError: If the rules are invalid
+        """
+        rules = validate_rules(rules)
+        return self._write(tenant_id, rules)
+    
+    def delete_rules(self, tenant_id: str) -> Optional[int]:
+        """Revert a tenant to default pricing"""
+        return self._write(tenant_id, None)
+    
+    def get_rules(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Read a tenant's stored rules and version"""
+        return self._read(tenant_id)
+    
+    def _compile(self, tenant_id: str, version: int, rules: Dict[str, Any]) -> CompiledPriceBook:
+        return CompiledPriceBook(version, rules)
+
+# Global instance
+pricebook_store = PriceBookStore()
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with hit/miss counters
+    
+    Used for quote results and quote messages, whose keys include
+    everything the value depends on (e.g. the PriceBook version), so
+    entries never need explicit invalidation - stale keys just stop being
+    requested and age out.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None on a miss"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries)
+        }
+
+# Global instances
+quote_cache = LRUCache(settings.QUOTE_CACHE_SIZE)
+quote_message_cache = LRUCache(settings.QUOTE_MESSAGE_CACHE_SIZE)
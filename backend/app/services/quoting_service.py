@@ -1,7 +1,11 @@
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Sequence
+import numpy as np
 import structlog
 from enum import Enum
 
+from app.services.message_templates import message_templates
+from app.services.quote_cache import quote_cache, quote_message_cache
+
 logger = structlog.get_logger()
 
 class ServiceType(Enum):
@@ -31,6 +35,8 @@ class MaterialType(Enum):
 class QuotingService:
     """Service for generating ballpark quotes based on PriceBook rules"""
     
+    # Default PriceBook rules; tenants override them through app.services.pricebook
+    
     # Base pricing per service type (minimum prices)
     BASE_PRICES = {
         ServiceType.DRIVEWAY: 150,
@@ -72,6 +78,13 @@ class QuotingService:
         MaterialType.OTHER: 1.0,
     }
     
+    # Integer codes for calculate_quotes_batch (enum declaration order);
+    # material code -1 means no material given
+    SERVICE_TYPE_CODES = {service_type: code for code, service_type in enumerate(ServiceType)}
+    SEVERITY_CODES = {severity: code for code, severity in enumerate(SeverityLevel)}
+    MATERIAL_CODES = {material: code for code, material in enumerate(MaterialType)}
+    CONFIDENCE_LEVELS = np.array(["low", "medium", "high"])
+    
     @classmethod
     def calculate_quote(
         cls,
@@ -86,7 +99,7 @@ class QuotingService:
         Calculate a ballpark quote based on PriceBook rules
         
         Args:
-            tenant_id: Tenant ID (for future per-tenant pricing)
+            tenant_id: Tenant ID, selects the tenant's PriceBook
             service_type: Type of service
             severity: Severity/condition level
             sqft: Square footage (optional)
@@ -96,15 +109,59 @@ class QuotingService:
         Returns:
             Dictionary with quote details
         """
+        from app.services.pricebook import pricebook_store
+        
+        pricebook = pricebook_store.get(tenant_id)
+        sqft = sqft or None
+        
+        # Everything the result depends on; tenants on default pricing
+        # share entries, and a new PriceBook version means new keys
+        cache_key = (
+            None if pricebook is pricebook_store.default_book else (tenant_id, pricebook.version),
+            service_type,
+            severity,
+            sqft,
+            material,
+            unit_count if unit_count and not sqft and service_type == ServiceType.WINDOWS else None
+        )
+        
+        result = quote_cache.get(cache_key)
+        if result is None:
+            result = cls._price_quote(tenant_id, pricebook, service_type, severity, sqft, material, unit_count)
+            if "error" in result:
+                return result
+            quote_cache.put(cache_key, result)
+        
+        return {
+            **result,
+            "price_range": dict(result["price_range"]),
+            "unit_count": unit_count,
+            "tenant_id": tenant_id
+        }
+    
+    @classmethod
+    def _price_quote(
+        cls,
+        tenant_id: str,
+        pricebook: Any,
+        service_type: ServiceType,
+        severity: SeverityLevel,
+        sqft: Optional[int],
+        material: Optional[MaterialType],
+        unit_count: Optional[int]
+    ) -> Dict[str, Any]:
         try:
-            base_price = cls.BASE_PRICES[service_type]
-            per_unit_rate = cls.PER_SQFT_RATES[service_type]
+            base_price, per_unit_rate, severity_multiplier, material_multiplier = pricebook.lookup(
+                service_type, severity, material
+            )
             
             # Calculate base cost
+            counted_units = False
             if sqft:
                 area_cost = sqft * per_unit_rate
             elif unit_count and service_type == ServiceType.WINDOWS:
                 area_cost = unit_count * per_unit_rate
+                counted_units = True
             else:
                 # No square footage provided, use estimation
                 area_cost = 0
@@ -113,21 +170,16 @@ class QuotingService:
             subtotal = base_price + area_cost
             
             # Apply severity multiplier
-            severity_multiplier = cls.SEVERITY_MULTIPLIERS[severity]
             subtotal *= severity_multiplier
             
-            # Apply material multiplier
-            if material:
-                material_multiplier = cls.MATERIAL_MULTIPLIERS[material]
-                subtotal *= material_multiplier
-            else:
-                material_multiplier = 1.0
+            # Apply material multiplier (1.0 when no material was given)
+            subtotal *= material_multiplier
             
             # Round to nearest $25
             final_price = round(subtotal / 25) * 25
             
-            # If no square footage, provide range estimate
-            if sqft is None:
+            # If no square footage or unit count, provide range estimate
+            if sqft is None and not counted_units:
                 confidence = "low"
                 price_range = {
                     "min": int(final_price),
@@ -135,7 +187,7 @@ class QuotingService:
                 }
                 estimated_sqft = cls._estimate_sqft_for_service(service_type)
             else:
-                confidence = "medium" if sqft < 500 else "high"
+                confidence = "medium" if counted_units or sqft < 500 else "high"
                 price_range = {
                     "min": int(final_price * 0.85),  # 15% lower
                     "max": int(final_price * 1.15)   # 15% higher
@@ -157,6 +209,7 @@ class QuotingService:
                 "sqft_provided": sqft,
                 "estimated_sqft": estimated_sqft,
                 "unit_count": unit_count,
+                "pricebook_version": pricebook.version,
                 "tenant_id": tenant_id
             }
             
@@ -183,6 +236,113 @@ class QuotingService:
                 "tenant_id": tenant_id
             }
     
+    @classmethod
+    def quote_from_text(cls, tenant_id: str, text: str) -> Dict[str, Any]:
+        """
+        Extract job details from a customer message and quote them
+        
+        Sqft (from areas or dimensions like "20x40") and window counts found
+        in the text are priced directly instead of falling back to a
+        low-confidence estimate.
+        
+        Args:
+            tenant_id: Tenant ID
+            text: Customer message
+        
+        Returns:
+            calculate_quote result plus the extracted zip_code
+        """
+        from app.services.intake_classifier import intake_classifier
+        
+        inputs = intake_classifier.extract_quote_inputs(text)
+        quote = cls.calculate_quote(
+            tenant_id=tenant_id,
+            service_type=inputs["service_type"],
+            severity=inputs["severity"],
+            sqft=inputs["sqft"],
+            material=inputs["material"],
+            unit_count=inputs["unit_count"]
+        )
+        quote["zip_code"] = inputs["zip_code"]
+        return quote
+    
+    @classmethod
+    def calculate_quotes_batch(
+        cls,
+        tenant_id: str,
+        service_types: Sequence[int],
+        severities: Sequence[int],
+        sqft: Optional[Sequence[int]] = None,
+        materials: Optional[Sequence[int]] = None,
+        unit_counts: Optional[Sequence[int]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price many jobs in one vectorised pass
+        
+        Inputs are columns of equal length, with enums given as codes from
+        SERVICE_TYPE_CODES, SEVERITY_CODES and MATERIAL_CODES. Arithmetic
+        follows calculate_quote operation for operation, so every column
+        matches the scalar result exactly.
+        
+        Args:
+            tenant_id: Tenant ID, selects the tenant's PriceBook
+            service_types: Service type codes
+            severities: Severity codes
+            sqft: Square footage, 0 where not provided
+            materials: Material codes, -1 where not provided
+            unit_counts: Unit counts (windows), 0 where not provided
+        
+        Returns:
+            Columns base_price, area_cost, severity_multiplier,
+            material_multiplier, subtotal, final_price, price_min, price_max
+            and confidence
+        """
+        service_codes = np.asarray(service_types, dtype=np.int64)
+        severity_codes = np.asarray(severities, dtype=np.int64)
+        size = len(service_codes)
+        sqft = np.zeros(size, dtype=np.int64) if sqft is None else np.asarray(sqft, dtype=np.int64)
+        material_codes = np.full(size, -1, dtype=np.int64) if materials is None else np.asarray(materials, dtype=np.int64)
+        unit_counts = np.zeros(size, dtype=np.int64) if unit_counts is None else np.asarray(unit_counts, dtype=np.int64)
+        
+        from app.services.pricebook import NO_MATERIAL, pricebook_store
+        
+        pricebook = pricebook_store.get(tenant_id)
+        has_material = material_codes >= 0
+        cells = pricebook.array[pricebook.flat_index(
+            service_codes,
+            severity_codes,
+            np.where(has_material, material_codes, NO_MATERIAL)
+        )]
+        base_price, per_unit_rate, severity_multiplier, material_multiplier = cells.T
+        
+        has_sqft = sqft != 0
+        uses_units = ~has_sqft & (unit_counts != 0) & (service_codes == cls.SERVICE_TYPE_CODES[ServiceType.WINDOWS])
+        area_cost = np.where(has_sqft, sqft * per_unit_rate, np.where(uses_units, unit_counts * per_unit_rate, 0.0))
+        
+        subtotal = (base_price + area_cost) * severity_multiplier * material_multiplier
+        
+        # Round to nearest $25 (round-half-even, like the builtin round)
+        final_price = np.rint(subtotal / 25) * 25
+        
+        measured = has_sqft | uses_units
+        price_min = np.where(measured, final_price * 0.85, final_price)
+        price_max = np.where(measured, final_price * 1.15, final_price * 1.5)
+        confidence = np.where(has_sqft, np.where(sqft < 500, 1, 2), np.where(uses_units, 1, 0))
+        
+        logger.info("Quotes calculated in batch", tenant_id=tenant_id, count=size, pricebook_version=pricebook.version)
+        
+        return {
+            "base_price": base_price.astype(np.int64),
+            "area_cost": np.trunc(area_cost).astype(np.int64),
+            "severity_multiplier": severity_multiplier,
+            "material_multiplier": material_multiplier,
+            "subtotal": np.trunc(subtotal).astype(np.int64),
+            "final_price": final_price.astype(np.int64),
+            "price_min": np.trunc(price_min).astype(np.int64),
+            "price_max": np.trunc(price_max).astype(np.int64),
+            "confidence": cls.CONFIDENCE_LEVELS[confidence]
+        }
+    
     @classmethod
     def _estimate_sqft_for_service(cls, service_type: ServiceType) -> int:
         """Provide rough square footage estimates for common service types"""
@@ -202,6 +362,9 @@ class QuotingService:
         """
         Generate a human-readable quote message for SMS/chat
         
+        Worded by the quoting tenant's templates. Rendered messages are cached
+        per template and template version, keyed by the values they contain.
+        
         Args:
             quote_data: Quote calculation result
         
@@ -209,33 +372,25 @@ class QuotingService:
             Formatted quote message
         """
         try:
+            template_set = message_templates.get(quote_data.get("tenant_id"))
+            
             if "error" in quote_data:
-                return (
-                    "Sorry, I couldn't calculate a quote right now. "
-                    "Please call us for a personalized estimate!"
-                )
+                return template_set.render("quote_error", {})
             
-            service_type = quote_data["service_type"].replace("_", " ").title()
             price_range = quote_data["price_range"]
-            confidence = quote_data["confidence"]
+            # "quote_estimate" for low-confidence ranges, "quote" when the job was measured
+            template = "quote_estimate" if quote_data["confidence"] == "low" else "quote"
             
-            if confidence == "low":
-                message = (
-                    f"Great! For {service_type} cleaning, our ballpark range is "
-                    f"${price_range['min']}-${price_range['max']}. 💰\n\n"
-                    "For a more precise quote, we'd need the square footage or "
-                    "a quick in-person assessment. Would you like to schedule "
-                    "a free estimate? 📅"
-                )
-            else:
-                avg_price = (price_range['min'] + price_range['max']) // 2
-                message = (
-                    f"Perfect! Based on your details, {service_type} cleaning "
-                    f"would be approximately ${avg_price} "
-                    f"(range: ${price_range['min']}-${price_range['max']}). 💰\n\n"
-                    "This includes our standard cleaning process. "
-                    "Ready to schedule? 📅"
-                )
+            cache_key = (template, template_set.key, quote_data["service_type"], price_range["min"], price_range["max"])
+            message = quote_message_cache.get(cache_key)
+            if message is None:
+                message = template_set.render(template, {
+                    "service": quote_data["service_type"].replace("_", " ").title(),
+                    "min": price_range["min"],
+                    "max": price_range["max"],
+                    "avg": (price_range["min"] + price_range["max"]) // 2
+                })
+                quote_message_cache.put(cache_key, message)
             
             return message
             
@@ -255,24 +410,12 @@ class QuotingService:
             text: Customer message
         
         Returns:
-            Detected service type
+            Highest-scoring service type, or OTHER if none is mentioned
         """
-        text_lower = text.lower()
-        
-        keywords = {
-            ServiceType.DRIVEWAY: ["driveway", "drive", "garage", "parking"],
-            ServiceType.ROOF: ["roof", "roofing", "shingle", "gutter"],
-            ServiceType.HOUSE: ["house", "home", "siding", "exterior", "building"],
-            ServiceType.DECK: ["deck", "patio", "porch", "balcony"],
-            ServiceType.WALKWAY: ["walkway", "sidewalk", "path", "steps", "stairs"],
-            ServiceType.WINDOWS: ["window", "glass", "pane"],
-        }
-        
-        for service_type, service_keywords in keywords.items():
-            if any(keyword in text_lower for keyword in service_keywords):
-                return service_type
+        from app.services.intake_classifier import intake_classifier
         
-        return ServiceType.OTHER
+        candidates = intake_classifier.classify(text)["service_types"]
+        return intake_classifier.best(candidates, ServiceType.OTHER)
     
     @classmethod
     def parse_severity_from_text(cls, text: str) -> SeverityLevel:
@@ -283,15 +426,9 @@ class QuotingService:
             text: Customer message
         
         Returns:
-            Detected severity level
+            Highest-scoring severity level, or LIGHT if none is mentioned
         """
-        text_lower = text.lower()
+        from app.services.intake_classifier import intake_classifier
         
-        if any(word in text_lower for word in ["extreme", "terrible", "awful", "disaster", "gross"]):
-            return SeverityLevel.EXTREME
-        elif any(word in text_lower for word in ["heavy", "bad", "dirty", "stained", "moldy"]):
-            return SeverityLevel.HEAVY
-        elif any(word in text_lower for word in ["moderate", "some", "bit", "little"]):
-            return SeverityLevel.MODERATE
-        else:
-            return SeverityLevel.LIGHT
\ No newline at end of file
+        candidates = intake_classifier.classify(text)["severities"]
+        return intake_classifier.best(candidates, SeverityLevel.LIGHT)
\ No newline at end of file
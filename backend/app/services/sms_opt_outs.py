@@ -0,0 +1,71 @@
+import redis
+from typing import Optional
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+class SmsOptOuts:
+    """
+    Numbers that have texted STOP to a tenant
+    
+    Kept as a Redis set per tenant under lily:tenant:{tenant_id}:sms:opt_outs
+    so that later texts from an opted-out number are not quoted and no
+    automated messages are sent to it. START removes the number again.
+    """
+    
+    def __init__(self):
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL)
+                self.redis_client.ping()
+                logger.info("SMS opt-outs Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - SMS opt-outs not tracked")
+    
+    def opt_outs_key(self, tenant_id: str) -> str:
+        return f"lily:tenant:{tenant_id}:sms:opt_outs"
+    
+    def is_opted_out(self, tenant_id: Optional[str], phone_number: Optional[str]) -> bool:
+        """Check whether a number has opted out of a tenant's messages"""
+        if not tenant_id or not phone_number or not self.redis_client:
+            return False
+        
+        try:
+            return bool(self.redis_client.sismember(self.opt_outs_key(tenant_id), phone_number))
+        except Exception as e:
+            logger.error("Failed to check SMS opt-out", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def opt_out(self, tenant_id: str, phone_number: str) -> bool:
+        """Record a STOP from a number"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.sadd(self.opt_outs_key(tenant_id), phone_number)
+            logger.info("SMS opt-out recorded", tenant_id=tenant_id, phone_number=phone_number)
+            return True
+        except Exception as e:
+            logger.error("Failed to record SMS opt-out", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def opt_in(self, tenant_id: str, phone_number: str) -> bool:
+        """Record a START from a number"""
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.srem(self.opt_outs_key(tenant_id), phone_number)
+            logger.info("SMS opt-in recorded", tenant_id=tenant_id, phone_number=phone_number)
+            return True
+        except Exception as e:
+            logger.error("Failed to record SMS opt-in", error=str(e), tenant_id=tenant_id)
+            return False
+
+# Global instance
+sms_opt_outs = SmsOptOuts()
@@ -0,0 +1,308 @@
+import json
+import time
+import uuid
+import redis
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+from app.integrations.twilio_client import TwilioClient
+from app.services.jitter_queue import jitter_queue
+from app.services.sms_opt_outs import sms_opt_outs
+from app.services.sms_segments import segment_count
+from app.services.tenant_sms_settings import tenant_sms_settings
+
+logger = structlog.get_logger()
+
+class SmsOutbox:
+    """
+    Per-tenant, per-recipient outbound SMS outbox
+    
+    Missed-call follow-ups, booking confirmations and reschedule notices can
+    reach the same phone within seconds of each other. Instead of sending
+    straight away, messages are appended to a Redis list per tenant and
+    recipient (so two tenants texting one customer never share a send) and
+    the first one schedules an SMS_OUTBOX_FLUSH task SMS_OUTBOX_WINDOW_SECONDS
+    out. The flush drops exact duplicates and, with SMS_OUTBOX_MERGE on,
+    joins messages from the same sender into one send as long as the result
+    stays within SMS_OUTBOX_MAX_SEGMENTS. Bodies are rendered with the
+    tenant's SMS settings (e.g. GSM-7 only) when queued, so merge limits and
+    the segment counts logged per send match what Twilio bills.
+    
+    Sent messages are removed individually, so a flush that fails part-way
+    is retried with only what is still unsent. Opt-outs are checked again at
+    flush time, so a STOP received during the window drops what is queued.
+    """
+    
+    BUFFER_TTL_SECONDS = 3600
+    SEPARATOR = "\n\n"
+    
+    def __init__(self):
+        self.twilio_client = TwilioClient()
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL)
+                self.redis_client.ping()
+                logger.info("SMS outbox Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - outbound SMS sent immediately")
+    
+    def outbox_key(self, to_number: str, tenant_id: Optional[str] = None) -> str:
+        return f"lily:tenant:{tenant_id or settings.DEFAULT_TENANT_ID}:outbox:{to_number}"
+    
+    async def send(
+        self,
+        to: str,
+        body: str,
+        from_number: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> bool:
+        """
+        Queue an SMS in the recipient's outbox, sending directly if the outbox is unavailable
+        
+        Args:
+            to: Destination phone number
+            body: Message body
+            from_number: Sender phone number (defaults to configured number)
+            tenant_id: Tenant whose SMS settings apply
+        
+        Returns:
+            True if queued or sent, or dropped because the recipient opted out
+        """
+        if sms_opt_outs.is_opted_out(tenant_id, to):
+            logger.info("Skipping SMS to opted-out number", tenant_id=tenant_id)
+            return True  # Nothing to retry
+        
+        if self.add(to, body, from_number, tenant_id):
+            return True
+        
+        body, _ = tenant_sms_settings.render(tenant_id, body)
+        return await self.twilio_client.send_sms(to, body, from_number)
+    
+    def add(
+        self,
+        to: str,
+        body: str,
+        from_number: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> bool:
+        """
+        Append an SMS to the recipient's outbox, scheduling a flush if it is the first
+        
+        Args:
+            to: Destination phone number
+            body: Message body
+            from_number: Sender phone number (defaults to configured number)
+            tenant_id: Tenant whose SMS settings apply
+        
+        Returns:
+            True if queued, False if failed
+        """
+        if not self.redis_client:
+            return False
+        
+        try:
+            key = self.outbox_key(to, tenant_id)
+            body, _ = tenant_sms_settings.render(tenant_id, body)
+            message = {
+                "id": str(uuid.uuid4()),
+                "tenant_id": tenant_id,
+                "from_number": from_number,
+                "body": body,
+                "queued_at": time.time()
+            }
+            
+            raw = json.dumps(message)
+            pipe = self.redis_client.pipeline()
+            pipe.rpush(key, raw)
+            pipe.expire(key, self.BUFFER_TTL_SECONDS)
+            pipe.set(f"{key}:scheduled", 1, nx=True, ex=self.BUFFER_TTL_SECONDS)
+            first = pipe.execute()[2]
+            
+            if first and not self._schedule(to, tenant_id):
+                # No flush would send it; let send() deliver it directly
+                self.redis_client.lrem(key, 1, raw)
+                return False
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to queue outbound SMS", error=str(e), to=to)
+            return False
+    
+    @classmethod
+    def plan(
+        cls,
+        messages: List[Tuple[bytes, Dict[str, Any]]],
+        merge: bool = True,
+        max_segments: int = 2
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Turn queued messages into sends
+        
+        Args:
+            messages: (raw list entry, decoded message) pairs, oldest first
+            merge: Whether to join messages from the same sender
+            max_segments: Largest merged send, in segments
+        
+        Returns:
+            Sends as dicts with from_number, body and the raw entries they
+            cover (duplicates included), plus the number of duplicates dropped
+        """
+        sends: List[Dict[str, Any]] = []
+        seen: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        duplicates = 0
+        
+        for raw, message in messages:
+            from_number = message.get("from_number")
+            body = message["body"]
+            
+            existing = seen.get((from_number, body))
+            if existing:
+                existing["raws"].append(raw)
+                duplicates += 1
+                continue
+            
+            send = None
+            if merge:
+                # Only the sender's latest send, so messages keep their order
+                latest = next((item for item in reversed(sends) if item["from_number"] == from_number), None)
+                if latest and segment_count(latest["body"] + cls.SEPARATOR + body) <= max_segments:
+                    latest["body"] += cls.SEPARATOR + body
+                    latest["raws"].append(raw)
+                    send = latest
+            
+            if send is None:
+                send = {"from_number": from_number, "body": body, "raws": [raw]}
+                sends.append(send)
+            
+            seen[(from_number, body)] = send
+        
+        return sends, duplicates
+    
+    async def flush(self, to_number: str, tenant_id: Optional[str] = None) -> bool:
+        """
+        Send everything a tenant has queued for a recipient
+        
+        Args:
+            to_number: Destination phone number
+            tenant_id: Tenant whose outbox to flush
+        
+        Returns:
+            True if every send succeeded, False if some are left for a retry
+        """
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return False
+        
+        key = self.outbox_key(to_number, tenant_id)
+        raws = self.redis_client.lrange(key, 0, -1)
+        
+        # A STOP may have arrived since these were queued
+        messages = []
+        opted_out: Dict[Optional[str], bool] = {}
+        dropped = []
+        for raw in raws:
+            message = json.loads(raw)
+            message_tenant = message.get("tenant_id")
+            if message_tenant not in opted_out:
+                opted_out[message_tenant] = sms_opt_outs.is_opted_out(message_tenant, to_number)
+            if opted_out[message_tenant]:
+                dropped.append(raw)
+            else:
+                messages.append((raw, message))
+        
+        if dropped:
+            pipe = self.redis_client.pipeline()
+            for raw in dropped:
+                pipe.lrem(key, 1, raw)
+            pipe.execute()
+        
+        sends, duplicates = self.plan(
+            messages,
+            merge=settings.SMS_OUTBOX_MERGE,
+            max_segments=settings.SMS_OUTBOX_MAX_SEGMENTS
+        )
+        
+        failed = 0
+        segments = 0
+        for send in sends:
+            segments += segment_count(send["body"])
+            if not await self.twilio_client.send_sms(to_number, send["body"], send["from_number"]):
+                failed += 1
+                continue
+            
+            pipe = self.redis_client.pipeline()
+            for raw in send["raws"]:
+                pipe.lrem(key, 1, raw)
+            pipe.execute()
+        
+        logger.info(
+            "SMS outbox flushed",
+            to=to_number,
+            queued=len(raws),
+            opted_out=len(dropped),
+            duplicates=duplicates,
+            sends=len(sends),
+            segments=segments,
+            failed=failed
+        )
+        
+        if failed:
+            return False
+        
+        # Messages queued mid-flush found the flush still scheduled and
+        # didn't schedule one of their own
+        pipe = self.redis_client.pipeline()
+        pipe.delete(f"{key}:scheduled")
+        pipe.llen(key)
+        _, remaining = pipe.execute()
+        if remaining and self.redis_client.set(f"{key}:scheduled", 1, nx=True, ex=self.BUFFER_TTL_SECONDS):
+            self._schedule(to_number, tenant_id)
+        
+        return True
+    
+    def release(self, to_number: str, tenant_id: Optional[str] = None) -> bool:
+        """
+        Clear a recipient's scheduled flag when its flush task is lost
+        
+        Called when the flush task couldn't be enqueued or was dropped after
+        its retries. Otherwise the flag outlives the task for
+        BUFFER_TTL_SECONDS and later messages queue behind a flush that will
+        never run. Messages still held are sent by the flush the next message
+        schedules.
+        
+        Args:
+            to_number: Destination phone number
+            tenant_id: Tenant whose outbox it is
+        
+        Returns:
+            True if cleared, False if failed
+        """
+        if not self.redis_client:
+            return False
+        
+        try:
+            self.redis_client.delete(f"{self.outbox_key(to_number, tenant_id)}:scheduled")
+            logger.warning("SMS outbox flush released", to=to_number, tenant_id=tenant_id)
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to release SMS outbox", error=str(e), to=to_number)
+            return False
+    
+    def _schedule(self, to_number: str, tenant_id: Optional[str] = None) -> bool:
+        task_id = jitter_queue.enqueue_delayed(
+            key="SMS_OUTBOX_FLUSH",
+            payload={"to_number": to_number, "tenant_id": tenant_id},
+            delay_seconds=settings.SMS_OUTBOX_WINDOW_SECONDS,
+            tenant_id=tenant_id
+        )
+        if not task_id:
+            self.release(to_number, tenant_id)
+        return bool(task_id)
+
+# Global instance
+sms_outbox = SmsOutbox()
@@ -0,0 +1,159 @@
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+import structlog
+
+from app.core.config import settings
+from app.services.intake_classifier import intake_classifier
+from app.services.jitter_queue import JitterQueue, jitter_queue
+from app.services.quoting_service import QuotingService
+from app.services.sms_opt_outs import sms_opt_outs
+
+logger = structlog.get_logger()
+
+class StageMetrics:
+    """Batch, item and latency counters for one pipeline stage"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+    
+    def record(self, items: int, seconds: float):
+        self.batches += 1
+        self.items += items
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get stage statistics (latencies in milliseconds)"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_ms": self.total_seconds / self.batches * 1000 if self.batches else 0.0,
+            "max_batch_ms": self.max_seconds * 1000,
+            "avg_item_ms": self.total_seconds / self.items * 1000 if self.items else 0.0
+        }
+
+class InboundSmsPipeline:
+    """
+    Inbound SMS -> quote -> jittered reply, in micro-batches
+    
+    Messages flow through four stages, each taking and returning a list so
+    it can be run and timed on its own: parse (intake extraction), quote
+    (QuotingService), render (generate_quote_message) and enqueue (one
+    JitterQueue write for the whole batch). Messages with nothing to quote,
+    such as "hi", drop out after parsing.
+    
+    Messages are dicts with message_sid, tenant_id, from_number, to_number
+    and body.
+    """
+    
+    STAGES = ("parse", "quote", "render", "enqueue")
+    
+    def __init__(self, queue: Optional[JitterQueue] = None):
+        self.queue = queue or jitter_queue
+        self.metrics = {name: StageMetrics(name) for name in self.STAGES}
+    
+    def parse(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Extract quote inputs, keeping only messages that describe a job"""
+        parsed = []
+        for message in messages:
+            # STOP may arrive after earlier texts of the burst were buffered
+            if sms_opt_outs.is_opted_out(message.get("tenant_id"), message.get("from_number")):
+                continue
+            
+            inputs = intake_classifier.extract_quote_inputs(message.get("body") or "")
+            candidates = inputs.pop("candidates")
+            if candidates["service_types"] or candidates["sqft"] or candidates["window_counts"]:
+                parsed.append({**message, "inputs": inputs})
+        return parsed
+    
+    def quote(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Price each parsed message"""
+        quoted = []
+        for item in items:
+            inputs = item["inputs"]
+            quote = QuotingService.calculate_quote(
+                tenant_id=item["tenant_id"],
+                service_type=inputs["service_type"],
+                severity=inputs["severity"],
+                sqft=inputs["sqft"],
+                material=inputs["material"],
+                unit_count=inputs["unit_count"]
+            )
+            if "error" not in quote:
+                quoted.append({**item, "quote": quote})
+        return quoted
+    
+    def render(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turn each quote into reply text"""
+        return [{**item, "reply": QuotingService.generate_quote_message(item["quote"])} for item in items]
+    
+    def enqueue(self, items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Queue every reply as a jittered CHATWOOT_REPLY task in one write"""
+        return self.queue.enqueue_many([
+            {
+                "key": "CHATWOOT_REPLY",
+                "payload": {
+                    "to_number": item["from_number"],
+                    "from_number": item.get("to_number"),
+                    "body": item["reply"],
+                    "in_reply_to": item["message_sid"]
+                },
+                "delay_seconds": random.randint(settings.JITTER_MIN_SECONDS, settings.JITTER_MAX_SECONDS),
+                "tenant_id": item["tenant_id"],
+                "idempotency_key": f"quote_reply_{item['message_sid']}"
+            }
+            for item in items
+        ])
+    
+    def process_batch(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a micro-batch of inbound messages through every stage
+        
+        Args:
+            messages: Inbound messages
+        
+        Returns:
+            Counts of messages received, quoted and queued, plus how long
+            each stage took for this batch in milliseconds
+        
+        Raises:
+            RuntimeError: If the replies could not be queued
+        """
+        timings = {}
+        
+        def run(name: str, stage: Callable[[List[Any]], List[Any]], items: List[Any]) -> List[Any]:
+            started = time.perf_counter()
+            result = stage(items)
+            elapsed = time.perf_counter() - started
+            self.metrics[name].record(len(items), elapsed)
+            timings[name] = round(elapsed * 1000, 3)
+            return result
+        
+        parsed = run("parse", self.parse, messages)
+        quoted = run("quote", self.quote, parsed)
+        rendered = run("render", self.render, quoted)
+        task_ids = run("enqueue", self.enqueue, rendered)
+        
+        if rendered and not any(task_ids):
+            raise RuntimeError("Failed to queue quote replies")
+        
+        result = {
+            "received": len(messages),
+            "quoted": len(quoted),
+            "queued": sum(1 for task_id in task_ids if task_id),
+            "timings_ms": timings
+        }
+        logger.info("Inbound SMS batch processed", **result)
+        return result
+    
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get per-stage statistics"""
+        return {name: metrics.get_stats() for name, metrics in self.metrics.items()}
+
+# Global instance
+sms_pipeline = InboundSmsPipeline()
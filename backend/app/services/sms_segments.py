@@ -0,0 +1,107 @@
+import math
+import re
+import unicodedata
+from typing import Tuple
+
+# GSM 03.38 default alphabet (one septet each) and its extension table
+# (escape + character, two septets each)
+GSM7_BASIC = set(
+    "@£$¥èéùìòÇ\nØø\rÅå"
+    "Δ_ΦΓΛΩΠΨΣΘΞÆæßÉ"
+    " !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§"
+    "¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM7_EXTENDED = set("\f^{}\\[~]|€")
+GSM7_CHARSET = frozenset(GSM7_BASIC | GSM7_EXTENDED)
+
+# Every printable ASCII character except the backtick is in one of the two
+# tables, so ASCII bodies only need this one regex scan
+NON_GSM7_ASCII = re.compile(r"[^\n\r\f\x20-\x5f\x61-\x7e]")
+GSM7_EXTENDED_PATTERN = re.compile(r"[\f^{}\\\[~\]|€]")
+NON_GSM7 = re.compile("[^" + "".join(re.escape(char) for char in sorted(GSM7_CHARSET)) + "]")
+
+# Characters per segment: single message, then each part of a multipart one
+GSM7_LIMITS = (160, 153)
+UCS2_LIMITS = (70, 67)
+
+GSM7 = "GSM-7"
+UCS2 = "UCS-2"
+
+# Common look-alikes for characters outside GSM-7; emoji and anything else
+# without a GSM-7 base letter are dropped
+GSM7_REPLACEMENTS = str.maketrans({
+    "‘": "'", "’": "'", "‚": "'", "′": "'", "`": "'",
+    "“": '"', "”": '"', "„": '"', "″": '"',
+    "–": "-", "—": "-", "−": "-", "•": "-",
+    "…": "...", " ": " ", " ": " ", "\t": " ",
+    "¢": "c", "©": "(c)", "®": "(R)", "™": "TM",
+})
+
+def analyze(body: str) -> Tuple[str, int, int]:
+    """
+    Encoding, length and SMS segment count Twilio bills for a message body
+    
+    Bodies made only of GSM-7 characters are sent 160 septets per segment
+    (153 once split); anything else forces UCS-2 at 70 UTF-16 code units
+    (67 once split), so a single emoji roughly doubles the segment count.
+    
+    Args:
+        body: Message body
+    
+    Returns:
+        (encoding, units, segments) where units are septets for GSM-7 and
+        UTF-16 code units for UCS-2
+    """
+    if body.isascii():
+        is_gsm7 = NON_GSM7_ASCII.search(body) is None
+    else:
+        is_gsm7 = GSM7_CHARSET.issuperset(body)
+    
+    if is_gsm7:
+        septets = len(body) + len(GSM7_EXTENDED_PATTERN.findall(body))
+        segments = 1 if septets <= GSM7_LIMITS[0] else math.ceil(septets / GSM7_LIMITS[1])
+        return GSM7, septets, segments
+    
+    units = len(body.encode("utf-16-le")) // 2
+    segments = 1 if units <= UCS2_LIMITS[0] else math.ceil(units / UCS2_LIMITS[1])
+    return UCS2, units, segments
+
+def segment_count(body: str) -> int:
+    """Number of SMS segments Twilio bills for a message body"""
+    return analyze(body)[2]
+
+def to_gsm7(body: str) -> str:
+    """
+    GSM-7-only variant of a message body
+    
+    Smart quotes, dashes and the like become their ASCII look-alikes,
+    accented letters lose accents GSM-7 doesn't have, and emoji are dropped
+    along with the spacing they leave behind. Bodies that are already GSM-7
+    are returned unchanged.
+    """
+    if analyze(body)[0] == GSM7:
+        return body
+    
+    text = NON_GSM7.sub(_gsm7_base, body.translate(GSM7_REPLACEMENTS))
+    text = re.sub(r" {2,}", " ", text)
+    return re.sub(r" +(?=\n)|^ +", "", text, flags=re.MULTILINE).strip(" ")
+
+def _gsm7_base(match: re.Match) -> str:
+    # "á" -> "a"; emoji have no decomposition and are dropped
+    return "".join(part for part in unicodedata.normalize("NFKD", match.group()) if part in GSM7_CHARSET)
+
+def render(body: str, gsm7_only: bool = False) -> Tuple[str, Tuple[str, int, int]]:
+    """
+    Final message body and its segment report
+    
+    Args:
+        body: Message body
+        gsm7_only: Whether to substitute characters that force UCS-2
+    
+    Returns:
+        (body, (encoding, units, segments))
+    """
+    if gsm7_only:
+        body = to_gsm7(body)
+    return body, analyze(body)
@@ -0,0 +1,101 @@
+import time
+import redis
+from typing import Dict, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+class TenantPhoneNumbers:
+    """
+    Which tenant owns each business phone number
+    
+    Inbound calls and texts are addressed to the tenant's Twilio number, so
+    webhooks resolve the tenant from the To number. Assignments are stored
+    under lily:phone_numbers:{number} and cached in-process for
+    SMS_SETTINGS_CACHE_TTL_SECONDS; numbers without an assignment belong to
+    DEFAULT_TENANT_ID.
+    """
+    
+    def __init__(self):
+        self.cache: Dict[str, Tuple[float, str]] = {}
+        
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL)
+                self.redis_client.ping()
+                logger.info("Tenant phone numbers Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - all phone numbers belong to the default tenant")
+    
+    def number_key(self, phone_number: str) -> str:
+        return f"lily:phone_numbers:{phone_number}"
+    
+    def resolve(self, phone_number: Optional[str], now: Optional[float] = None) -> str:
+        """Tenant that owns a business phone number"""
+        if not phone_number or not self.redis_client:
+            return settings.DEFAULT_TENANT_ID
+        
+        now = now if now is not None else time.monotonic()
+        cached = self.cache.get(phone_number)
+        if cached and now - cached[0] < settings.SMS_SETTINGS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        tenant_id = settings.DEFAULT_TENANT_ID
+        try:
+            stored = self.redis_client.get(self.number_key(phone_number))
+            if stored:
+                tenant_id = stored.decode() if isinstance(stored, bytes) else stored
+        except Exception as e:
+            logger.error("Failed to resolve phone number tenant", error=str(e), phone_number=phone_number)
+        
+        self.cache[phone_number] = (now, tenant_id)
+        return tenant_id
+    
+    def assign(self, phone_number: str, tenant_id: str) -> bool:
+        """
+        Route a business phone number to a tenant
+        
+        Args:
+            phone_number: Twilio number in E.164 format
+            tenant_id: Tenant ID
+        
+        Returns:
+            True if stored, False if failed
+        """
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return False
+        
+        try:
+            self.redis_client.set(self.number_key(phone_number), tenant_id)
+            self.cache.pop(phone_number, None)
+            logger.info("Phone number assigned", phone_number=phone_number, tenant_id=tenant_id)
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to assign phone number", error=str(e), phone_number=phone_number)
+            return False
+    
+    def release(self, phone_number: str) -> bool:
+        """Return a phone number to the default tenant"""
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return False
+        
+        try:
+            self.redis_client.delete(self.number_key(phone_number))
+            self.cache.pop(phone_number, None)
+            logger.info("Phone number released", phone_number=phone_number)
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to release phone number", error=str(e), phone_number=phone_number)
+            return False
+
+# Global instance
+tenant_phone_numbers = TenantPhoneNumbers()
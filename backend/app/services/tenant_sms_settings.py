@@ -0,0 +1,104 @@
+import json
+import time
+import redis
+from typing import Any, Dict, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+from app.services.sms_segments import render
+
+logger = structlog.get_logger()
+
+class TenantSmsSettings:
+    """
+    Per-tenant outbound SMS settings
+    
+    Stored as JSON under lily:tenant:{tenant_id}:sms and cached in-process
+    for SMS_SETTINGS_CACHE_TTL_SECONDS, so rendering a message doesn't cost
+    a Redis round trip. Tenants without stored settings get the defaults.
+    """
+    
+    def __init__(self):
+        self.cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL)
+                self.redis_client.ping()
+                logger.info("Tenant SMS settings Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning("Redis URL not configured - default SMS settings for all tenants")
+    
+    @property
+    def defaults(self) -> Dict[str, Any]:
+        return {"gsm7_only": settings.SMS_GSM7_ONLY_DEFAULT, "timezone": settings.DEFAULT_TIMEZONE}
+    
+    def settings_key(self, tenant_id: str) -> str:
+        return f"lily:tenant:{tenant_id}:sms"
+    
+    def get(self, tenant_id: Optional[str], now: Optional[float] = None) -> Dict[str, Any]:
+        """Get a tenant's SMS settings, defaults filled in"""
+        if not tenant_id or not self.redis_client:
+            return self.defaults
+        
+        now = now if now is not None else time.monotonic()
+        cached = self.cache.get(tenant_id)
+        if cached and now - cached[0] < settings.SMS_SETTINGS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        values = self.defaults
+        try:
+            stored = self.redis_client.get(self.settings_key(tenant_id))
+            if stored:
+                values.update(json.loads(stored))
+        except Exception as e:
+            logger.error("Failed to load SMS settings", error=str(e), tenant_id=tenant_id)
+        
+        self.cache[tenant_id] = (now, values)
+        return values
+    
+    def save(self, tenant_id: str, values: Dict[str, Any]) -> bool:
+        """
+        Store a tenant's SMS settings
+        
+        Other processes pick the change up once their cached copy expires.
+        
+        Args:
+            tenant_id: Tenant ID
+            values: Settings to store
+        
+        Returns:
+            True if stored, False if failed
+        """
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return False
+        
+        try:
+            self.redis_client.set(self.settings_key(tenant_id), json.dumps(values))
+            self.cache.pop(tenant_id, None)
+            logger.info("SMS settings updated", tenant_id=tenant_id, **values)
+            return True
+        
+        except Exception as e:
+            logger.error("Failed to store SMS settings", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    def render(self, tenant_id: Optional[str], body: str) -> Tuple[str, Tuple[str, int, int]]:
+        """
+        Render a message body the way the tenant sends it
+        
+        Args:
+            tenant_id: Tenant ID (None for the defaults)
+            body: Message body
+        
+        Returns:
+            (body, (encoding, units, segments))
+        """
+        return render(body, gsm7_only=self.get(tenant_id)["gsm7_only"])
+
+# Global instance
+tenant_sms_settings = TenantSmsSettings()
@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+import redis
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+class VersionedStore(ABC):
+    """
+    Per-tenant JSON documents in Redis, compiled once per process
+    
+    A tenant's document is stored as {"version": n, FIELD: ...} under
+    {KEY_PREFIX}:{tenant_id}. Compiled values are cached in an LRU; writing
+    bumps the version and publishes "{tenant_id}:{version}" on CHANNEL so
+    every process drops its stale copy. Entries are also revalidated against
+    the stored version after cache_ttl_seconds in case an invalidation was
+    missed. Tenants without a document share one default value.
+    
+    Subclasses set KEY_PREFIX, CHANNEL, FIELD and NAME (used in log
+    messages) and implement _compile and cache_ttl_seconds.
+    """
+    
+    KEY_PREFIX = ""
+    CHANNEL = ""
+    FIELD = ""
+    NAME = ""
+    
+    def __init__(self, default: Any, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.default = default
+        self.lock = threading.Lock()
+        self.listener = None
+        
+        self.redis_client = None
+        if settings.REDIS_URL:
+            try:
+                client = redis.from_url(settings.REDIS_URL)
+                client.ping()
+                self.redis_client = client
+                logger.info(f"{self.NAME.capitalize()} Redis client initialized")
+            except Exception as e:
+                logger.error("Failed to connect to Redis", error=str(e))
+        else:
+            logger.warning(f"Redis URL not configured - default {self.NAME} for all tenants")
+    
+    @property
+    @abstractmethod
+    def cache_ttl_seconds(self) -> int:
+        """Seconds a cached value is served before checking the stored version"""
+    
+    def key(self, tenant_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{tenant_id}"
+    
+    def get(self, tenant_id: Optional[str], now: Optional[float] = None) -> Any:
+        """Get the tenant's compiled value, loading it on first use"""
+        if not tenant_id:
+            return self.default
+        
+        now = now if now is not None else time.monotonic()
+        
+        with self.lock:
+            cached = self.entries.get(tenant_id)
+            if cached and now - cached[0] < self.cache_ttl_seconds:
+                self.entries.move_to_end(tenant_id)
+                return cached[1]
+        
+        if not self.redis_client:
+            return self.default
+        
+        self._ensure_listener()
+        value = self._load(tenant_id, cached[1] if cached else None)
+        self._remember(tenant_id, value, now)
+        return value
+    
+    def invalidate(self, tenant_id: str, version: Optional[int] = None):
+        """Drop a cached value unless it is already at least the given version"""
+        with self.lock:
+            cached = self.entries.get(tenant_id)
+            if cached and (version is None or cached[1].version < version):
+                del self.entries[tenant_id]
+    
+    @abstractmethod
+    def _compile(self, tenant_id: str, version: int, document: Any) -> Any:
+        """Build the cached value for a stored document"""
+    
+    def _read(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        if not self.redis_client:
+            return None
+        
+        try:
+            raw = self.redis_client.get(self.key(tenant_id))
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.error(f"Failed to read {self.NAME}", error=str(e), tenant_id=tenant_id)
+            return None
+    
+    def _write(self, tenant_id: str, document: Optional[Any]) -> Optional[int]:
+        if not self.redis_client:
+            logger.error("Redis client not available")
+            return None
+        
+        try:
+            key = self.key(tenant_id)
+            with self.redis_client.pipeline() as pipe:
+                # A concurrent write makes execute() raise WatchError
+                pipe.watch(key)
+                current = pipe.get(key)
+                version = (json.loads(current)["version"] if current else 0) + 1
+                
+                pipe.multi()
+                pipe.set(key, json.dumps({"version": version, self.FIELD: document}))
+                pipe.publish(self.CHANNEL, f"{tenant_id}:{version}")
+                pipe.execute()
+            
+            value = self._compile(tenant_id, version, document) if document else self.default
+            self._remember(tenant_id, value, time.monotonic())
+            
+            logger.info(f"{self.NAME.capitalize()} updated", tenant_id=tenant_id, version=version)
+            return version
+        
+        except Exception as e:
+            logger.error(f"Failed to store {self.NAME}", error=str(e), tenant_id=tenant_id)
+            return None
+    
+    def _load(self, tenant_id: str, cached: Optional[Any]) -> Any:
+        stored = self._read(tenant_id)
+        if not stored or not stored.get(self.FIELD):
+            return self.default
+        
+        if cached and cached.version == stored["version"]:
+            return cached
+        
+        try:
+            return self._compile(tenant_id, stored["version"], stored[self.FIELD])
+        except Exception as e:
+            logger.error(f"Failed to compile {self.NAME}", error=str(e), tenant_id=tenant_id)
+            return self.default
+    
+    def _remember(self, tenant_id: str, value: Any, now: float):
+        with self.lock:
+            self.entries[tenant_id] = (now, value)
+            self.entries.move_to_end(tenant_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def _ensure_listener(self):
+        if self.listener is not None:
+            return
+        
+        try:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.CHANNEL: self._on_invalidate})
+            self.listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        except Exception as e:
+            logger.error(f"Failed to subscribe to {self.NAME} invalidations", error=str(e))
+    
+    def _on_invalidate(self, message: Dict[str, Any]):
+        try:
+            data = message["data"]
+            tenant_id, version = (data.decode() if isinstance(data, bytes) else data).rsplit(":", 1)
+            self.invalidate(tenant_id, int(version))
+        except Exception as e:
+            logger.error(f"Invalid {self.NAME} invalidation message", error=str(e))
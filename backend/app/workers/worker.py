@@ -1,12 +1,19 @@
 import asyncio
 import signal
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, List
 import structlog
 
 from app.core.config import settings
 from app.services.jitter_queue import jitter_queue
 from app.integrations.twilio_client import TwilioClient
+from app.integrations.s3_client import async_s3_client
+from app.services.photo_index import photo_index, parse_photo_key
+from app.services.photo_derivatives import PhotoDerivativeService
+from app.services.calendar_sync import calendar_sync
+from app.services.sms_pipeline import sms_pipeline
+from app.services.conversation_buffer import conversation_buffer
+from app.services.sms_outbox import sms_outbox
 
 logger = structlog.get_logger()
 
@@ -16,6 +23,7 @@ class TaskWorker:
     def __init__(self):
         self.running = False
         self.twilio_client = TwilioClient()
+        self.derivative_service = PhotoDerivativeService(async_s3_client.sync_client)
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -55,10 +63,24 @@ class TaskWorker:
                 return await self._handle_review_request_sms(payload, tenant_id)
             elif task_type == "CHATWOOT_REPLY":
                 return await self._handle_chatwoot_reply(payload, tenant_id)
+            elif task_type == "PHOTO_INDEX_RECONCILE":
+                return await self._handle_photo_index_reconcile(payload, tenant_id)
+            elif task_type == "PHOTO_PURGE":
+                return await self._handle_photo_purge(payload, tenant_id)
+            elif task_type == "PHOTO_DERIVATIVES":
+                return await self._handle_photo_derivatives(payload, tenant_id)
+            elif task_type == "MULTIPART_UPLOAD_SWEEP":
+                return await self._handle_multipart_upload_sweep(payload, tenant_id)
+            elif task_type == "CALENDAR_SYNC":
+                return await self._handle_calendar_sync(payload, tenant_id)
+            elif task_type == "SMS_OUTBOX_FLUSH":
+                return await self._handle_sms_outbox_flush(payload, tenant_id)
+            elif task_type == "INBOUND_SMS":
+                return not await self._handle_inbound_sms_batch([task_data])
             else:
                 logger.error(f"Unknown task type: {task_type}", task_id=task_id)
                 return True  # Don't retry unknown task types
-        
+            
         except Exception as e:
             logger.error(
                 "Task processing failed",
@@ -78,13 +100,14 @@ class TaskWorker:
                 logger.error("Missing to_number for missed call SMS", payload=payload)
                 return True  # Don't retry malformed payloads
             
-            success = await self.twilio_client.send_missed_call_followup(
+            success = await sms_outbox.send(
                 to=to_number,
-                caller_name=caller_name
+                body=TwilioClient.missed_call_followup_body(caller_name, tenant_id),
+                tenant_id=tenant_id
             )
             
             if success:
-                logger.info("Missed call SMS sent", to_number=to_number, tenant_id=tenant_id)
+                logger.info("Missed call SMS queued", to_number=to_number, tenant_id=tenant_id)
             else:
                 logger.warning("Failed to send missed call SMS", to_number=to_number)
             
@@ -104,13 +127,14 @@ class TaskWorker:
                 logger.error("Missing to_number for review request", payload=payload)
                 return True  # Don't retry malformed payloads
             
-            success = await self.twilio_client.send_review_request(
+            success = await sms_outbox.send(
                 to=to_number,
-                customer_name=customer_name
+                body=TwilioClient.review_request_body(customer_name, tenant_id),
+                tenant_id=tenant_id
             )
             
             if success:
-                logger.info("Review request SMS sent", to_number=to_number, tenant_id=tenant_id)
+                logger.info("Review request SMS queued", to_number=to_number, tenant_id=tenant_id)
             else:
                 logger.warning("Failed to send review request SMS", to_number=to_number)
             
@@ -121,19 +145,241 @@ class TaskWorker:
             return False
     
     async def _handle_chatwoot_reply(self, payload: Dict[str, Any], tenant_id: str) -> bool:
-        """Handle Chatwoot automated reply (placeholder for future implementation)"""
+        """Send an automated reply, such as a text quote from the inbound SMS pipeline"""
         try:
-            # This would integrate with Chatwoot API when implemented
-            logger.info("Chatwoot reply task received", payload=payload, tenant_id=tenant_id)
+            to_number = payload.get("to_number")
+            body = payload.get("body")
             
-            # For now, just log and return success
-            # TODO: Implement Chatwoot API integration
-            return True
+            if not to_number or not body:
+                logger.error("Missing to_number or body for reply", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            success = await sms_outbox.send(
+                to=to_number,
+                body=body,
+                from_number=payload.get("from_number"),
+                tenant_id=tenant_id
+            )
+            
+            if success:
+                logger.info(
+                    "Automated reply queued",
+                    to_number=to_number,
+                    in_reply_to=payload.get("in_reply_to"),
+                    tenant_id=tenant_id
+                )
+            else:
+                logger.warning("Failed to send automated reply", to_number=to_number)
+            
+            return success
             
         except Exception as e:
             logger.error("Error handling Chatwoot reply", error=str(e), payload=payload)
             return False
     
+    async def _handle_sms_outbox_flush(self, payload: Dict[str, Any], tenant_id: str) -> bool:
+        """Send a recipient's held messages, deduplicated and merged"""
+        try:
+            to_number = payload.get("to_number")
+            
+            if not to_number:
+                logger.error("Missing to_number for outbox flush", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            # Anything left unsent is retried on the next attempt
+            return await sms_outbox.flush(to_number, payload.get("tenant_id"))
+            
+        except Exception as e:
+            logger.error("Error flushing SMS outbox", error=str(e), payload=payload)
+            return False
+    
+    def _task_dropped(self, task_data: Dict[str, Any]):
+        """Clean up after a task that will not be retried again"""
+        if task_data.get("task_type") == "SMS_OUTBOX_FLUSH":
+            payload = task_data.get("payload") or {}
+            if payload.get("to_number"):
+                sms_outbox.release(payload["to_number"], payload.get("tenant_id"))
+    
+    async def _handle_inbound_sms_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Quote every conversation whose burst of texts has gone quiet, as one micro-batch
+        
+        Returns:
+            Tasks to retry: only those whose conversation was taken but not
+            quoted. Tasks that were pushed back have already scheduled their
+            follow-up, so retrying them would quote the customer twice.
+        """
+        try:
+            # Parsing and quoting are CPU-bound, the buffer and queue are blocking Redis I/O
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._quote_conversations, tasks)
+            
+        except Exception as e:
+            logger.error("Error handling inbound SMS batch", error=str(e), count=len(tasks))
+            return tasks
+    
+    def _quote_conversations(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        failed = []
+        conversations = []
+        for task in tasks:
+            payload = task.get("payload", {})
+            tenant_id = task.get("tenant_id")
+            try:
+                messages = conversation_buffer.take(tenant_id, payload.get("from_number"), payload.get("to_number"))
+            except Exception as e:
+                logger.error("Failed to read conversation buffer", error=str(e), task_id=task.get("task_id"))
+                failed.append(task)
+                continue
+            
+            if messages:
+                conversations.append((task, messages))
+        
+        if not conversations:
+            return failed
+        
+        try:
+            sms_pipeline.process_batch([
+                conversation_buffer.merge(task.get("tenant_id"), messages) for task, messages in conversations
+            ])
+        except Exception as e:
+            logger.error("Failed to quote inbound SMS batch", error=str(e), count=len(conversations))
+            return failed + [task for task, _ in conversations]
+        
+        for task, messages in conversations:
+            latest = messages[-1]
+            try:
+                conversation_buffer.ack(task.get("tenant_id"), latest["from_number"], latest["to_number"], latest["message_sid"])
+            except Exception as e:
+                # The reply is already queued; retrying would quote the burst again
+                logger.error("Failed to acknowledge conversation", error=str(e), message_sid=latest["message_sid"])
+        
+        return failed
+    
+    async def _handle_photo_index_reconcile(self, payload: Dict[str, Any], tenant_id: str) -> bool:
+        """Rebuild a tenant's photo index from S3 and schedule the next run"""
+        try:
+            if not tenant_id:
+                logger.error("Missing tenant_id for photo index reconcile", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            if not photo_index.is_tenant_indexed(tenant_id):
+                logger.info("Tenant no longer indexed, stopping reconciliation", tenant_id=tenant_id)
+                return True
+            
+            await photo_index.reconcile_tenant(tenant_id, async_s3_client)
+            
+        except Exception as e:
+            logger.error("Error reconciling photo index", error=str(e), tenant_id=tenant_id)
+        
+        # Reconciliation is periodic, so a failed run just waits for the next one
+        jitter_queue.ensure_periodic(
+            key="PHOTO_INDEX_RECONCILE",
+            interval_seconds=settings.PHOTO_INDEX_RECONCILE_INTERVAL_SECONDS,
+            tenant_id=tenant_id,
+            renew=True
+        )
+        return True
+    
+    async def _handle_photo_purge(self, payload: Dict[str, Any], tenant_id: str) -> bool:
+        """Delete every photo under a tenant prefix, one listing page at a time"""
+        try:
+            if not tenant_id:
+                logger.error("Missing tenant_id for photo purge", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            deleted = 0
+            failed = 0
+            
+            # Originals and their resized derivatives
+            for root in ("photos", "derived"):
+                async for photos in async_s3_client.stream_photo_pages(tenant_id=tenant_id, root=root):
+                    result = await async_s3_client.delete_photos([photo["file_key"] for photo in photos])
+                    deleted += len(result["deleted"])
+                    failed += len(result["failed"])
+            
+            logger.info("Tenant photo purge finished", tenant_id=tenant_id, deleted=deleted, failed=failed)
+            
+            if failed:
+                return False  # Retry picks up whatever is left under the prefix
+            
+            photo_index.clear_tenant(tenant_id)
+            return True
+            
+        except Exception as e:
+            logger.error("Error purging tenant photos", error=str(e), tenant_id=tenant_id)
+            return False
+    
+    async def _handle_photo_derivatives(self, payload: Dict[str, Any], tenant_id: str) -> bool:
+        """Generate thumbnail and web-size copies of an uploaded photo"""
+        try:
+            file_key = payload.get("file_key")
+            parsed_key = parse_photo_key(file_key) if file_key else None
+            
+            if not parsed_key:
+                logger.error("Invalid file_key for photo derivatives", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            # Pillow decoding and S3 transfers are blocking
+            loop = asyncio.get_event_loop()
+            sizes = await loop.run_in_executor(None, self.derivative_service.generate, file_key)
+            
+            if sizes is None:
+                return False
+            if not sizes:
+                return True  # Not an image; retrying won't change that
+            
+            photo_index.set_derivatives(parsed_key[0], parsed_key[1], file_key, sizes)
+            return True
+            
+        except Exception as e:
+            logger.error("Error generating photo derivatives", error=str(e), payload=payload)
+            return False
+    
+    async def _handle_multipart_upload_sweep(self, payload: Dict[str, Any], tenant_id: str) -> bool:
+        """Abort a multipart upload that was never completed, freeing its parts"""
+        try:
+            file_key = payload.get("file_key")
+            upload_id = payload.get("upload_id")
+            
+            if not file_key or not upload_id:
+                logger.error("Missing upload reference for multipart sweep", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            # Completed uploads report NoSuchUpload, which counts as success
+            return await async_s3_client.abort_multipart_upload(file_key=file_key, upload_id=upload_id)
+            
+        except Exception as e:
+            logger.error("Error sweeping multipart upload", error=str(e), payload=payload)
+            return False
+    
+    async def _handle_calendar_sync(self, payload: Dict[str, Any], tenant_id: str) -> bool:
+        """Pull Google Calendar changes into the busy index and schedule the next run"""
+        try:
+            if not tenant_id:
+                logger.error("Missing tenant_id for calendar sync", payload=payload)
+                return True  # Don't retry malformed payloads
+            
+            if not calendar_sync.is_tenant_registered(tenant_id):
+                logger.info("Tenant no longer registered, stopping calendar sync", tenant_id=tenant_id)
+                return True
+            
+            await calendar_sync.sync_tenant(tenant_id)
+            
+        except Exception as e:
+            logger.error("Error syncing calendar", error=str(e), tenant_id=tenant_id)
+        
+        if payload.get("once"):
+            return True
+        
+        # Sync is periodic, so a failed run just waits for the next one
+        jitter_queue.ensure_periodic(
+            key="CALENDAR_SYNC",
+            interval_seconds=settings.CALENDAR_SYNC_INTERVAL_SECONDS,
+            tenant_id=tenant_id,
+            renew=True
+        )
+        return True
+    
     async def run(self):
         """Main worker loop"""
         self.running = True
@@ -149,6 +395,10 @@ class TaskWorker:
                     await asyncio.sleep(settings.WORKER_POLL_INTERVAL)
                     continue
                 
+                # Inbound conversations are quoted together as one micro-batch
+                inbound_sms = [task for task in tasks if task.get("task_type") == "INBOUND_SMS"]
+                tasks = [task for task in tasks if task.get("task_type") != "INBOUND_SMS"]
+                
                 # Process tasks concurrently with semaphore for rate limiting
                 semaphore = asyncio.Semaphore(settings.WORKER_CONCURRENCY)
                 
@@ -157,10 +407,17 @@ class TaskWorker:
                         success = await self.process_task(task_data)
                         if not success:
                             # Requeue failed task with exponential backoff
+                            if not jitter_queue.requeue_failed_task(task_data):
+                                self._task_dropped(task_data)
+                
+                async def process_inbound_sms():
+                    if inbound_sms:
+                        for task_data in await self._handle_inbound_sms_batch(inbound_sms):
                             jitter_queue.requeue_failed_task(task_data)
                 
                 # Process all tasks concurrently
                 await asyncio.gather(
+                    process_inbound_sms(),
                     *[process_with_semaphore(task) for task in tasks],
                     return_exceptions=True
                 )
@@ -0,0 +1,79 @@
+"""
+Throughput benchmark for quote intake text parsing
+
+    python -m benchmarks.intake_classifier
+
+Compares the keyword scans parse_service_from_text/parse_severity_from_text
+used before IntakeClassifier (two lowercase-and-substring passes, service
+and severity only) with one IntakeClassifier.classify pass, which also
+extracts material, sqft, window count and ZIP, over the messages in
+intake_sms.txt. Also reports how often the two disagree.
+"""
+import time
+from pathlib import Path
+
+from app.services.intake_classifier import intake_classifier
+from app.services.quoting_service import ServiceType, SeverityLevel
+
+CORPUS = Path(__file__).with_name("intake_sms.txt")
+ROUNDS = 200
+
+LEGACY_SERVICE_KEYWORDS = {
+    ServiceType.DRIVEWAY: ["driveway", "drive", "garage", "parking"],
+    ServiceType.ROOF: ["roof", "roofing", "shingle", "gutter"],
+    ServiceType.HOUSE: ["house", "home", "siding", "exterior", "building"],
+    ServiceType.DECK: ["deck", "patio", "porch", "balcony"],
+    ServiceType.WALKWAY: ["walkway", "sidewalk", "path", "steps", "stairs"],
+    ServiceType.WINDOWS: ["window", "glass", "pane"],
+}
+
+def legacy_service(text: str) -> ServiceType:
+    text_lower = text.lower()
+    for service_type, service_keywords in LEGACY_SERVICE_KEYWORDS.items():
+        if any(keyword in text_lower for keyword in service_keywords):
+            return service_type
+    return ServiceType.OTHER
+
+def legacy_severity(text: str) -> SeverityLevel:
+    text_lower = text.lower()
+    if any(word in text_lower for word in ["extreme", "terrible", "awful", "disaster", "gross"]):
+        return SeverityLevel.EXTREME
+    elif any(word in text_lower for word in ["heavy", "bad", "dirty", "stained", "moldy"]):
+        return SeverityLevel.HEAVY
+    elif any(word in text_lower for word in ["moderate", "some", "bit", "little"]):
+        return SeverityLevel.MODERATE
+    return SeverityLevel.LIGHT
+
+def compiled(text: str):
+    candidates = intake_classifier.classify(text)
+    return (
+        intake_classifier.best(candidates["service_types"], ServiceType.OTHER),
+        intake_classifier.best(candidates["severities"], SeverityLevel.LIGHT)
+    )
+
+def legacy(text: str):
+    return legacy_service(text), legacy_severity(text)
+
+def run_case(name: str, parse, messages) -> None:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for message in messages:
+            parse(message)
+    elapsed = time.perf_counter() - started
+    per_message = elapsed / (ROUNDS * len(messages)) * 1e6
+    print(f"{name:>10}: {per_message:6.2f}us/message")
+
+def main():
+    messages = [line for line in CORPUS.read_text().splitlines() if line.strip()]
+    print(f"{len(messages)} messages x {ROUNDS} rounds")
+    
+    run_case("legacy", legacy, messages)
+    run_case("compiled", compiled, messages)
+    
+    for message in messages:
+        old, new = legacy(message), compiled(message)
+        if old != new:
+            print(f"  {old[0].value}/{old[1].value} -> {new[0].value}/{new[1].value}: {message}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Speed and accuracy of sqft / unit / ZIP extraction on the labelled corpus
+
+    python -m benchmarks.intake_extraction
+
+Runs IntakeClassifier.extract_quote_inputs over tests/data/intake_labelled.jsonl,
+reports the time per message and per-field accuracy, and lists every
+message where a field disagrees with its label.
+"""
+import json
+import time
+from pathlib import Path
+
+from app.services.intake_classifier import intake_classifier
+
+CORPUS = Path(__file__).parents[1] / "tests" / "data" / "intake_labelled.jsonl"
+FIELDS = ["service_type", "sqft", "unit_count", "zip_code"]
+ROUNDS = 200
+
+def extract(text: str) -> dict:
+    inputs = intake_classifier.extract_quote_inputs(text)
+    inputs["service_type"] = inputs["service_type"].value
+    return inputs
+
+def main():
+    rows = [json.loads(line) for line in CORPUS.read_text().splitlines() if line.strip()]
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for row in rows:
+            extract(row["text"])
+    elapsed = time.perf_counter() - started
+    print(f"{len(rows)} messages x {ROUNDS} rounds: {elapsed / (ROUNDS * len(rows)) * 1e6:.2f}us/message")
+
+    correct = {field: 0 for field in FIELDS}
+    for row in rows:
+        inputs = extract(row["text"])
+        for field in FIELDS:
+            if inputs[field] == row[field]:
+                correct[field] += 1
+            else:
+                print(f"  {field}: got {inputs[field]!r}, expected {row[field]!r}: {row['text']}")
+
+    for field in FIELDS:
+        print(f"{field:>12}: {correct[field] / len(rows):.1%}")
+
+if __name__ == "__main__":
+    main()
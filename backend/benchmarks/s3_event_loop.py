@@ -0,0 +1,75 @@
+"""
+Event-loop latency benchmark for S3 access from async handlers
+
+Runs against a local S3 stand-in (moto_server or MinIO):
+
+    moto_server -p 5000 &
+    S3_ENDPOINT_URL=http://localhost:5000 AWS_ACCESS_KEY_ID=test \\
+        AWS_SECRET_ACCESS_KEY=test python -m benchmarks.s3_event_loop
+
+A ticker coroutine measures how late each 10ms sleep wakes up while a burst
+of concurrent list requests is in flight, once calling S3Client directly
+(blocking, as the handlers used to) and once through AsyncS3Client.
+"""
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.integrations.s3_client import S3Client, AsyncS3Client
+
+TENANT_ID = "bench-tenant"
+LEAD_ID = "bench-lead"
+CONCURRENT_REQUESTS = 50
+TICK_SECONDS = 0.01
+
+def seed_bucket(client: S3Client, count: int = 200):
+    client.client.create_bucket(Bucket=client.bucket_name)
+    for i in range(count):
+        client.client.put_object(
+            Bucket=client.bucket_name,
+            Key=f"photos/{TENANT_ID}/{LEAD_ID}/{i:05d}.jpg",
+            Body=b"x"
+        )
+
+async def measure_lag(stop: asyncio.Event) -> list:
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+    return lags
+
+async def run_case(name: str, request) -> None:
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*[request() for _ in range(CONCURRENT_REQUESTS)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = await ticker
+    print(
+        f"{name:>10}: {elapsed * 1000:8.1f}ms total, "
+        f"loop lag p50={statistics.median(lags):6.2f}ms max={max(lags):7.2f}ms"
+    )
+
+async def main():
+    if not settings.S3_ENDPOINT_URL:
+        raise SystemExit("Set S3_ENDPOINT_URL to a local S3 stand-in")
+    
+    sync_client = S3Client()
+    async_client = AsyncS3Client(sync_client=sync_client)
+    seed_bucket(sync_client)
+    
+    async def blocking_request():
+        sync_client.list_tenant_photos(tenant_id=TENANT_ID, lead_id=LEAD_ID)
+    
+    async def offloaded_request():
+        await async_client.list_tenant_photos(tenant_id=TENANT_ID, lead_id=LEAD_ID)
+    
+    await run_case("blocking", blocking_request)
+    await run_case("offloaded", offloaded_request)
+    async_client.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+import random
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.availability import AvailabilityService, candidate_starts, free_slot_mask
+from app.services.calendar_sync import BusyIndex, calendar_sync
+from app.services.quoting_service import ServiceType
+
+client = TestClient(app)
+NY = ZoneInfo("America/New_York")
+
+def local(day, hour, minute=0):
+    return datetime(2024, 5, day, hour, minute, tzinfo=NY)
+
+def make_service(intervals):
+    sync_service = MagicMock()
+    sync_service.get_index.return_value = BusyIndex(intervals)
+    return AvailabilityService(sync_service)
+
+def test_slots_respect_quiet_hours():
+    """Test slots start at QUIET_HOURS_END and finish by QUIET_HOURS_START"""
+    slots = make_service([]).free_slots(
+        "t1", ServiceType.WALKWAY, local(1, 0), local(2, 0), step_minutes=60, timezone_name="America/New_York"
+    )
+    
+    assert slots[0][0] == local(1, 9)
+    assert slots[-1][1] == local(1, 21)
+    assert len(slots) == 12
+
+def test_slots_keep_buffer_around_busy_blocks():
+    """Test slots overlapping a busy block or its buffer are excluded"""
+    busy = [(local(1, 12).timestamp(), local(1, 13).timestamp())]
+    slots = make_service(busy).free_slots(
+        "t1", ServiceType.WALKWAY, local(1, 9), local(1, 17),
+        buffer_minutes=30, step_minutes=30, timezone_name="America/New_York"
+    )
+    starts = [slot_start for slot_start, _ in slots]
+    
+    assert local(1, 10, 30) in starts  # Ends 11:30, exactly one buffer before
+    assert local(1, 11) not in starts
+    assert local(1, 13) not in starts
+    assert local(1, 13, 30) in starts
+
+def test_candidate_starts_follow_dst():
+    """Test the daily window stays at local 9:00 across a DST change"""
+    tz = ZoneInfo("America/New_York")
+    start = datetime(2024, 3, 9, 0, tzinfo=tz)
+    starts = candidate_starts(start, start + timedelta(days=3), 3600, 3600, tz)
+    first_of_day = {}
+    for value in starts.tolist():
+        moment = datetime.fromtimestamp(value, tz)
+        first_of_day.setdefault(moment.date(), moment.hour)
+    
+    assert set(first_of_day.values()) == {9}
+
+def test_vectorised_mask_matches_naive_scan():
+    """Test the single-pass mask agrees with a per-slot scan of every block"""
+    rng = random.Random(7)
+    base = local(1, 0).timestamp()
+    intervals = []
+    for _ in range(2000):
+        start = base + rng.randrange(0, 30 * 86400, 300)
+        intervals.append((start, start + rng.randrange(900, 6 * 3600, 300)))
+    
+    index = BusyIndex(intervals)
+    starts = np.arange(base, base + 30 * 86400, 1800, dtype=np.float64)
+    mask = free_slot_mask(index, starts, 5400, 1800)
+    
+    expected = [
+        not any(busy_start < slot + 5400 + 1800 and busy_end > slot - 1800 for busy_start, busy_end in intervals)
+        for slot in starts.tolist()
+    ]
+    assert mask.tolist() == expected
+
+def test_availability_endpoint_requires_synced_calendar():
+    """Test tenants without a synced calendar get 404"""
+    with patch.object(calendar_sync, "get_index", return_value=None):
+        response = client.get(
+            "/api/v1/tenants/t1/calendar/availability",
+            params={"service_type": "driveway", "start": "2099-05-01T00:00:00Z", "end": "2099-05-02T00:00:00Z"}
+        )
+    
+    assert response.status_code == 404
+
+def test_availability_endpoint_returns_slots():
+    """Test slot length follows the service type"""
+    with patch.object(calendar_sync, "get_index", return_value=BusyIndex([])):
+        response = client.get(
+            "/api/v1/tenants/t1/calendar/availability",
+            params={"service_type": "roof", "start": "2099-05-01T00:00:00Z", "end": "2099-05-02T00:00:00Z"}
+        )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["duration_minutes"] == 240
+    first = data["slots"][0]
+    assert datetime.fromisoformat(first["end"]) - datetime.fromisoformat(first["start"]) == timedelta(hours=4)
@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.api.webhooks.calcom import handle_booking_cancelled, handle_booking_rescheduled
+from app.integrations.google_calendar_client import GoogleCalendarClient, calendar_batch_writer
+from app.services.booking_events import booking_event_links
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+def reschedule(uid, original_uid, day):
+    return {
+        "uid": uid,
+        "rescheduleUid": original_uid,
+        "startTime": f"2025-06-{day:02d}T15:00:00Z",
+        "endTime": f"2025-06-{day:02d}T16:00:00Z"
+    }
+
+@pytest.mark.asyncio
+async def test_reschedules_and_cancellation_address_original_event():
+    """Test repeated reschedules and a cancellation all target the event created for the first booking"""
+    original_event = GoogleCalendarClient.booking_event_id("uid-a")
+    
+    with patch.object(booking_event_links, "redis_client", FakeRedis()), \
+            patch.object(calendar_batch_writer, "patch_event", new_callable=AsyncMock) as mock_patch, \
+            patch.object(calendar_batch_writer, "delete_event", new_callable=AsyncMock) as mock_delete:
+        await handle_booking_rescheduled(reschedule("uid-b", "uid-a", 2))
+        await handle_booking_rescheduled(reschedule("uid-c", "uid-b", 3))
+        await handle_booking_cancelled({"uid": "uid-c"})
+    
+    assert [call[0][1] for call in mock_patch.await_args_list] == [original_event, original_event]
+    mock_delete.assert_awaited_once_with("default-tenant", original_event)
+
+@pytest.mark.asyncio
+async def test_cancellation_without_links_uses_booking_uid():
+    """Test a booking never rescheduled maps straight to its own event, in the configured default tenant"""
+    with patch.object(booking_event_links, "redis_client", None), \
+            patch.object(settings, "DEFAULT_TENANT_ID", "acme"), \
+            patch.object(calendar_batch_writer, "delete_event", new_callable=AsyncMock) as mock_delete:
+        await handle_booking_cancelled({"uid": "uid-a"})
+    
+    mock_delete.assert_awaited_once_with("acme", GoogleCalendarClient.booking_event_id("uid-a"))
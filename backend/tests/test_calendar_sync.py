@@ -0,0 +1,122 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.google_calendar_client import GoogleCalendarClient, CalendarSyncTokenExpired
+from app.services.calendar_sync import BusyIndex, CalendarSyncService, calendar_sync, event_interval
+from app.services.jitter_queue import jitter_queue
+
+def ts(hour, minute=0):
+    return datetime(2024, 5, 1, hour, minute, tzinfo=timezone.utc).timestamp()
+
+def make_event(event_id, start_hour, end_hour, **fields):
+    return {
+        "id": event_id,
+        "start": {"dateTime": f"2024-05-01T{start_hour:02d}:00:00Z"},
+        "end": {"dateTime": f"2024-05-01T{end_hour:02d}:00:00Z"},
+        **fields
+    }
+
+def test_busy_index_overlaps():
+    """Test overlap checks including a long event hidden behind later starts"""
+    index = BusyIndex([(ts(8), ts(17)), (ts(9), ts(10)), (ts(12), ts(13))])
+    
+    assert index.overlaps(ts(16), ts(16, 30))  # Inside the long 8-17 block
+    assert not index.overlaps(ts(17), ts(18))  # Touching the end is free
+    assert index.between(ts(9, 30), ts(12)) == [(ts(8), ts(17)), (ts(9), ts(10))]
+    assert not BusyIndex([]).overlaps(ts(9), ts(10))
+
+def test_event_interval_skips_free_events():
+    """Test cancelled and transparent events don't block time"""
+    assert event_interval(make_event("a", 9, 10)) == (ts(9), ts(10))
+    assert event_interval(make_event("b", 9, 10, status="cancelled")) is None
+    assert event_interval(make_event("c", 9, 10, transparency="transparent")) is None
+    
+    all_day = event_interval({"id": "d", "start": {"date": "2024-05-01"}, "end": {"date": "2024-05-02"}})
+    assert all_day[1] - all_day[0] == 24 * 3600
+
+def make_service():
+    service = CalendarSyncService()
+    service.redis_client = MagicMock()
+    return service
+
+@pytest.mark.asyncio
+async def test_incremental_sync_applies_delta():
+    """Test a stored sync token is used and changes are upserted or removed"""
+    service = make_service()
+    pages = [
+        {"items": [make_event("a", 9, 10)], "nextPageToken": "p2"},
+        {"items": [make_event("b", 9, 10, status="cancelled")], "nextSyncToken": "sync-2"}
+    ]
+    
+    with patch.object(service, "_get_sync_token", return_value="sync-1"), \
+         patch.object(service, "_apply") as mock_apply, \
+         patch.object(GoogleCalendarClient, "list_events_page", AsyncMock(side_effect=pages)) as mock_list:
+        result = await service.sync_tenant("t1")
+    
+    assert result == {"upserted": 1, "removed": 1}
+    assert mock_list.call_args_list[0][1]["sync_token"] == "sync-1"
+    assert mock_list.call_args_list[1][1]["page_token"] == "p2"
+    mock_apply.assert_called_once_with("t1", {"a": f"{ts(9)},{ts(10)}"}, ["b"], "sync-2", full=False)
+
+@pytest.mark.asyncio
+async def test_expired_sync_token_triggers_full_sync():
+    """Test a 410 from Google falls back to a full listing that replaces the index"""
+    service = make_service()
+    responses = [CalendarSyncTokenExpired(), {"items": [make_event("a", 9, 10)], "nextSyncToken": "sync-new"}]
+    
+    with patch.object(service, "_get_sync_token", return_value="sync-old"), \
+         patch.object(service, "_apply") as mock_apply, \
+         patch.object(GoogleCalendarClient, "list_events_page", AsyncMock(side_effect=responses)) as mock_list:
+        await service.sync_tenant("t1")
+    
+    assert mock_list.call_args_list[1][1]["sync_token"] is None
+    assert mock_apply.call_args[1]["full"] is True
+
+def test_busy_index_cached_between_version_checks():
+    """Test the local index is reused until the Redis version changes"""
+    service = make_service()
+    service.redis_client.get.return_value = b"1"
+    service.redis_client.hgetall.return_value = {b"a": f"{ts(9)},{ts(10)}".encode()}
+    
+    first = service.get_index("t1", now=0)
+    second = service.get_index("t1", now=1)  # Within the check interval, no Redis access
+    third = service.get_index("t1", now=100)  # Version unchanged, index reused
+    
+    assert first is second is third
+    assert service.redis_client.get.call_count == 2
+    assert service.redis_client.hgetall.call_count == 1
+    
+    service.redis_client.get.return_value = b"2"
+    service.redis_client.hgetall.return_value = {}
+    
+    assert len(service.get_index("t1", now=200)) == 0
+
+def test_unsynced_tenant_has_no_index():
+    """Test availability callers can tell an unsynced tenant from a free one"""
+    service = make_service()
+    service.redis_client.get.return_value = None
+    
+    assert service.is_busy("t1", datetime(2024, 5, 1, 9, tzinfo=timezone.utc), datetime(2024, 5, 1, 10, tzinfo=timezone.utc)) is None
+
+@patch.object(jitter_queue, 'enqueue_delayed', return_value="once-1")
+@patch.object(jitter_queue, 'ensure_periodic')
+@patch.object(calendar_sync, 'register_tenant', return_value=False)
+def test_sync_endpoint_rearms_lost_chain(mock_register, mock_periodic, mock_enqueue):
+    """Test the periodic sync is re-armed whenever its next run is missing, not only for new tenants"""
+    client = TestClient(app)
+    
+    mock_periodic.return_value = True
+    rearmed = client.post("/api/v1/tenants/t1/calendar/sync")
+    mock_periodic.return_value = False
+    extra = client.post("/api/v1/tenants/t1/calendar/sync")
+    mock_periodic.return_value = None
+    unavailable = client.post("/api/v1/tenants/t1/calendar/sync")
+    
+    assert rearmed.json()["task_id"] == "CALENDAR_SYNC:t1"
+    assert extra.json()["task_id"] == "once-1"
+    mock_enqueue.assert_called_once()
+    assert mock_enqueue.call_args[1]["payload"] == {"once": True}
+    assert unavailable.status_code == 503
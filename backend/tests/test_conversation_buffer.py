@@ -0,0 +1,163 @@
+import pytest
+import time
+from unittest.mock import patch
+
+from app.services.conversation_buffer import ConversationBuffer
+from app.services.sms_pipeline import InboundSmsPipeline
+from app.workers.worker import TaskWorker
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+    
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((name, args))
+        return queue
+    
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args) for name, args in self.commands]
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.hashes = {}
+    
+    def pipeline(self):
+        return FakePipeline(self)
+    
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value.encode())
+        return len(self.lists[key])
+    
+    def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        return values[start:] if end == -1 else values[start:end + 1]
+    
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lrange(key, start, end)
+    
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+    
+    def hsetnx(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        if field.encode() in fields:
+            return 0
+        fields[field.encode()] = str(value).encode()
+        return 1
+    
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field.encode()] = str(value).encode()
+    
+    def hgetall(self, key):
+        return self.hashes.get(key, {})
+    
+    def delete(self, key):
+        self.hashes.pop(key, None)
+        self.lists.pop(key, None)
+    
+    def expire(self, key, seconds):
+        pass
+
+@pytest.fixture
+def buffer():
+    buffer = ConversationBuffer.__new__(ConversationBuffer)
+    buffer.redis_client = FakeRedis()
+    return buffer
+
+def text(sid, body):
+    return {"message_sid": sid, "from_number": "+15550001111", "to_number": "+15559998888", "body": body}
+
+@patch('app.services.conversation_buffer.jitter_queue')
+def test_burst_schedules_one_flush(mock_queue, buffer):
+    """Test only the first text of a burst schedules a task"""
+    buffer.append("t1", text("SM1", "hi"), now=100)
+    buffer.append("t1", text("SM2", "driveway is really dirty"), now=102)
+    buffer.append("t1", text("SM3", "30301"), now=104)
+    
+    mock_queue.enqueue_delayed.assert_called_once()
+    assert mock_queue.enqueue_delayed.call_args[1]["key"] == "INBOUND_SMS"
+
+@patch('app.services.conversation_buffer.jitter_queue')
+@patch('app.services.conversation_buffer.settings')
+def test_flush_is_pushed_back_while_customer_is_texting(mock_settings, mock_queue, buffer):
+    """Test the flush waits for a quiet window, capped by the max wait"""
+    mock_settings.CONVERSATION_DEBOUNCE_SECONDS = 8
+    mock_settings.CONVERSATION_MAX_WAIT_SECONDS = 30
+    buffer.append("t1", text("SM1", "hi"), now=100)
+    buffer.append("t1", text("SM2", "deck"), now=105)
+    
+    assert buffer.take("t1", "+15550001111", "+15559998888", now=108) == []
+    assert mock_queue.enqueue_delayed.call_args[1]["delay_seconds"] == 5
+    
+    messages = buffer.take("t1", "+15550001111", "+15559998888", now=113)
+    assert [message["message_sid"] for message in messages] == ["SM1", "SM2"]
+    
+    buffer.append("t2", text("SM3", "roof"), now=100)
+    for moment in range(104, 132, 4):
+        buffer.append("t2", text(f"SM{moment}", "still typing"), now=moment)
+    assert buffer.take("t2", "+15550001111", "+15559998888", now=131) != []
+
+@patch('app.services.conversation_buffer.jitter_queue')
+def test_ack_reopens_burst_for_late_texts(mock_queue, buffer):
+    """Test texts that arrive while quoting get a flush of their own"""
+    buffer.append("t1", text("SM1", "patio"), now=100)
+    messages = buffer.take("t1", "+15550001111", "+15559998888", now=200)
+    buffer.append("t1", text("SM2", "also the walkway"), now=201)
+    
+    buffer.ack("t1", "+15550001111", "+15559998888", messages[-1]["message_sid"], now=202)
+    
+    assert mock_queue.enqueue_delayed.call_count == 2
+    remaining = buffer.take("t1", "+15550001111", "+15559998888", now=300)
+    assert [message["message_sid"] for message in remaining] == ["SM2"]
+
+@patch('app.services.conversation_buffer.jitter_queue')
+def test_worker_quotes_burst_once(mock_queue, buffer):
+    """Test a burst of texts becomes a single quote and reply"""
+    for sid, body, moment in [("SM1", "hi", 100), ("SM2", "driveway is really dirty", 102), ("SM3", "20x40 zip 30301", 104)]:
+        buffer.append("t1", text(sid, body), now=moment)
+    
+    pipeline = InboundSmsPipeline(mock_queue)
+    mock_queue.enqueue_many.return_value = ["quote_reply_SM3"]
+    task = {"task_type": "INBOUND_SMS", "tenant_id": "t1", "payload": {"from_number": "+15550001111", "to_number": "+15559998888"}}
+    
+    with patch('app.workers.worker.conversation_buffer', buffer), patch('app.workers.worker.sms_pipeline', pipeline):
+        TaskWorker._quote_conversations(None, [task])
+    
+    replies = mock_queue.enqueue_many.call_args[0][0]
+    assert len(replies) == 1
+    assert replies[0]["payload"]["in_reply_to"] == "SM3"
+    assert "$" in replies[0]["payload"]["body"]
+    assert buffer.redis_client.llen("lily:conversation:t1:+15550001111:+15559998888:messages") == 0
+
+@patch('app.services.conversation_buffer.jitter_queue')
+def test_ack_twice_keeps_later_texts(mock_queue, buffer):
+    """Test acknowledging the same burst again doesn't drop texts that arrived after it"""
+    buffer.append("t1", text("SM1", "patio"), now=100)
+    messages = buffer.take("t1", "+15550001111", "+15559998888", now=200)
+    buffer.ack("t1", "+15550001111", "+15559998888", messages[-1]["message_sid"], now=201)
+    buffer.append("t1", text("SM2", "also the walkway"), now=202)
+    
+    buffer.ack("t1", "+15550001111", "+15559998888", messages[-1]["message_sid"], now=203)
+    
+    remaining = buffer.take("t1", "+15550001111", "+15559998888", now=300)
+    assert [message["message_sid"] for message in remaining] == ["SM2"]
+
+@patch('app.services.conversation_buffer.jitter_queue')
+def test_failed_batch_requeues_only_taken_conversations(mock_queue, buffer):
+    """Test a conversation that was pushed back isn't retried when the batch fails"""
+    buffer.append("t1", text("SM1", "driveway 20x40"), now=100)
+    buffer.append("t2", text("SM2", "roof"), now=time.time())
+    quiet = {"task_type": "INBOUND_SMS", "tenant_id": "t1", "payload": {"from_number": "+15550001111", "to_number": "+15559998888"}}
+    busy = {**quiet, "tenant_id": "t2"}
+    
+    pipeline = InboundSmsPipeline(mock_queue)
+    mock_queue.enqueue_many.return_value = [None]
+    
+    with patch('app.workers.worker.conversation_buffer', buffer), patch('app.workers.worker.sms_pipeline', pipeline):
+        failed = TaskWorker._quote_conversations(None, [quiet, busy])
+    
+    assert failed == [quiet]
+    assert buffer.redis_client.llen("lily:conversation:t1:+15550001111:+15559998888:messages") == 1
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+from google.oauth2.credentials import Credentials
+
+from app.core.config import settings
+from app.integrations import google_calendar_client
+from app.integrations.google_calendar_client import GoogleCalendarClient, calendar_service_cache
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    """Minimal Calendar v3 events endpoint"""
+    
+    requests = []
+    delay_seconds = 0
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeCalendarHandler.requests.append((self.path, self.headers.get("Authorization"), body))
+        time.sleep(FakeCalendarHandler.delay_seconds)
+        
+        payload = json.dumps({"id": "evt-1", **body}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def do_PATCH(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeCalendarHandler.requests.append((self.path, self.headers.get("If-Match"), body))
+        
+        if self.headers.get("If-Match") not in (None, '"etag-current"'):
+            self.send_response(412)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"error": {"code": 412, "message": "Precondition Failed"}}')
+            return
+        
+        payload = json.dumps({"id": self.path.split("/")[-1].split("?")[0], "etag": '"etag-next"', **body}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_calendar():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCalendarHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    FakeCalendarHandler.requests = []
+    FakeCalendarHandler.delay_seconds = 0
+    calendar_service_cache.invalidate("t-fake")
+    
+    endpoint = f"http://127.0.0.1:{server.server_port}/calendar/v3/"
+    with patch.object(settings, "GOOGLE_CALENDAR_API_ENDPOINT", endpoint), \
+         patch.object(
+             google_calendar_client.google_credential_store,
+             "get_credentials",
+             AsyncMock(return_value=Credentials(token="test-token"))
+         ):
+        yield FakeCalendarHandler
+    
+    calendar_service_cache.invalidate("t-fake")
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.asyncio
+async def test_create_booking_event_against_fake_server(fake_calendar):
+    """Test booking events are created through the executor and awaitable end to end"""
+    event = await GoogleCalendarClient.create_booking_event(
+        tenant_id="t-fake",
+        customer_name="Jane",
+        customer_email="jane@example.com",
+        customer_phone="+15555550100",
+        service_type="Pressure Washing",
+        start_time=datetime(2024, 5, 1, 9, 0),
+        duration_minutes=90
+    )
+    
+    assert event["id"] == "evt-1"
+    path, authorization, body = fake_calendar.requests[0]
+    assert path.startswith("/calendar/v3/calendars/primary/events")
+    assert authorization == "Bearer test-token"
+    assert body["summary"] == "Pressure Washing - Jane"
+    assert body["end"]["dateTime"] == "2024-05-01T10:30:00"
+
+@pytest.mark.asyncio
+async def test_slow_request_times_out_without_blocking_loop(fake_calendar):
+    """Test a slow Calendar call hits its timeout while the event loop keeps running"""
+    fake_calendar.delay_seconds = 1
+    client = GoogleCalendarClient("t-fake")
+    service = await client._get_service()
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+    
+    ticker_task = asyncio.create_task(ticker())
+    with pytest.raises(asyncio.TimeoutError):
+        await client._execute(
+            "events.insert",
+            service.events().insert(calendarId="primary", body={"summary": "slow"}),
+            timeout=0.3
+        )
+    ticker_task.cancel()
+    
+    assert ticks >= 10
+
+@pytest.mark.asyncio
+async def test_update_event_sends_single_conditional_patch(fake_calendar):
+    """Test updates are one PATCH carrying only the changed fields and If-Match"""
+    client = GoogleCalendarClient("t-fake")
+    
+    event = await client.update_event("evt-1", {"location": "12 Main St"}, etag='"etag-current"')
+    
+    assert event["etag"] == '"etag-next"'
+    assert len(fake_calendar.requests) == 1
+    path, if_match, body = fake_calendar.requests[0]
+    assert path.startswith("/calendar/v3/calendars/primary/events/evt-1")
+    assert if_match == '"etag-current"'
+    assert body == {"location": "12 Main St"}
+
+@pytest.mark.asyncio
+async def test_update_event_conflict_returns_none(fake_calendar):
+    """Test a stale ETag is rejected rather than overwriting the newer event"""
+    client = GoogleCalendarClient("t-fake")
+    
+    event = await client.update_event("evt-1", {"location": "12 Main St"}, etag='"etag-stale"')
+    
+    assert event is None
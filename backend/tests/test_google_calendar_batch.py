@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.integrations.google_calendar_client import CalendarBatchWriter, GoogleCalendarClient
+
+class FakeBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+    
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+    
+    def execute(self):
+        for request_id, request in self.requests:
+            body = request.kwargs.get("body") or {}
+            if body.get("summary") == "bad":
+                self.callback(request_id, None, Exception("400 Bad Request"))
+            else:
+                self.callback(request_id, {"id": f"evt-{request_id}", **body}, None)
+
+class FakeRequest:
+    def __init__(self, operation, kwargs):
+        self.operation = operation
+        self.kwargs = kwargs
+    
+    def execute(self):
+        return {"id": "evt-single", **(self.kwargs.get("body") or {})}
+
+def make_service():
+    service = MagicMock()
+    service.batches = []
+    
+    def new_batch_http_request(callback):
+        batch = FakeBatch(callback)
+        service.batches.append(batch)
+        return batch
+    
+    events = MagicMock()
+    for operation in CalendarBatchWriter.OPERATIONS:
+        setattr(events, operation, lambda operation=operation, **kwargs: FakeRequest(operation, kwargs))
+    service.events.return_value = events
+    service.new_batch_http_request.side_effect = new_batch_http_request
+    return service
+
+@pytest.fixture
+def service():
+    service = make_service()
+    
+    async def get_service(self):
+        return service
+    
+    async def execute(self, operation, request, timeout=None):
+        return request.execute()
+    
+    with patch.object(GoogleCalendarClient, "_get_service", get_service), \
+         patch.object(GoogleCalendarClient, "_execute", execute):
+        yield service
+
+@pytest.mark.asyncio
+async def test_operations_in_window_share_one_batch(service):
+    """Test concurrent writes for a tenant go out in one batch request"""
+    writer = CalendarBatchWriter(window_seconds=0.01, max_batch_size=50)
+    
+    results = await asyncio.gather(*[
+        writer.create_event("t1", {"summary": f"job {i}"}) for i in range(5)
+    ])
+    
+    assert len(service.batches) == 1
+    assert [event["summary"] for event in results] == [f"job {i}" for i in range(5)]
+    assert writer.get_stats() == {"requests_sent": 1, "operations_sent": 5, "pending": 0}
+
+@pytest.mark.asyncio
+async def test_failed_operation_only_fails_its_caller(service):
+    """Test per-operation errors are mapped back to the right caller"""
+    writer = CalendarBatchWriter(window_seconds=0.01, max_batch_size=50)
+    
+    good, bad, deleted = await asyncio.gather(
+        writer.create_event("t1", {"summary": "ok"}),
+        writer.create_event("t1", {"summary": "bad"}),
+        writer.delete_event("t1", "evt-9")
+    )
+    
+    assert good["summary"] == "ok"
+    assert bad is None
+    assert deleted is True
+
+@pytest.mark.asyncio
+async def test_full_batches_are_sent_without_waiting(service):
+    """Test batches are capped at max_batch_size"""
+    writer = CalendarBatchWriter(window_seconds=0.01, max_batch_size=2)
+    
+    results = await asyncio.gather(*[
+        writer.create_event("t1", {"summary": f"job {i}"}) for i in range(5)
+    ])
+    
+    assert all(results)
+    assert sorted(len(batch.requests) for batch in service.batches) == [2, 2]
+    assert writer.get_stats()["requests_sent"] == 3  # Two batches plus one plain request
+
+@pytest.mark.asyncio
+async def test_single_operation_skips_batch_endpoint(service):
+    """Test a lone operation is sent as a plain request"""
+    writer = CalendarBatchWriter(window_seconds=0.01, max_batch_size=50)
+    
+    event = await writer.create_event("t1", {"summary": "solo"})
+    
+    assert event["id"] == "evt-single"
+    assert service.batches == []
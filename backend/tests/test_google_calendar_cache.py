@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.integrations import google_calendar_client
+from app.integrations.google_calendar_client import (
+    CalendarServiceCache,
+    GoogleCalendarClient,
+    calendar_service_cache,
+    get_calendar_discovery_document
+)
+
+def test_discovery_document_loaded_once():
+    """Test the bundled discovery document is read and parsed a single time"""
+    get_calendar_discovery_document.cache_clear()
+    
+    with patch.object(
+        google_calendar_client.discovery_cache,
+        "get_static_doc",
+        return_value='{"name": "calendar", "version": "v3"}'
+    ) as mock_doc:
+        first = get_calendar_discovery_document()
+        second = get_calendar_discovery_document()
+    
+    get_calendar_discovery_document.cache_clear()
+    
+    assert first is second
+    assert first["name"] == "calendar"
+    mock_doc.assert_called_once_with("calendar", "v3")
+
+def test_service_cache_evicts_least_recently_used():
+    """Test the cache keeps at most max_entries tenants"""
+    cache = CalendarServiceCache(max_entries=2, ttl_seconds=60)
+    creds = MagicMock()
+    cache.put("t1", creds, "s1", now=0)
+    cache.put("t2", creds, "s2", now=0)
+    cache.get("t1", creds, now=1)
+    cache.put("t3", creds, "s3", now=2)
+    
+    assert cache.get("t2", creds, now=3) is None
+    assert cache.get("t1", creds, now=3) == "s1"
+    assert cache.get("t3", creds, now=3) == "s3"
+
+def test_service_cache_expires_entries():
+    """Test entries older than the TTL are rebuilt"""
+    cache = CalendarServiceCache(max_entries=10, ttl_seconds=60)
+    creds = MagicMock()
+    cache.put("t1", creds, "s1", now=0)
+    
+    assert cache.get("t1", creds, now=59) == "s1"
+    assert cache.get("t1", creds, now=60) is None
+    assert cache.get_stats()["entries"] == 0
+
+def test_service_cache_rebuilds_for_new_credentials():
+    """Test a service is not reused once the tenant's credentials object changes"""
+    cache = CalendarServiceCache(max_entries=10, ttl_seconds=60)
+    cache.put("t1", MagicMock(), "s1", now=0)
+    
+    assert cache.get("t1", MagicMock(), now=1) is None
+
+@pytest.mark.asyncio
+async def test_clients_share_service_per_tenant():
+    """Test new client instances reuse the tenant's built service"""
+    calendar_service_cache.invalidate("t-cache")
+    service = MagicMock()
+    creds = MagicMock()
+    
+    with patch.object(google_calendar_client.google_credential_store, "get_credentials", AsyncMock(return_value=creds)), \
+         patch.object(google_calendar_client, "build_from_document", return_value=service) as mock_build:
+        first = await GoogleCalendarClient("t-cache")._get_service()
+        second = await GoogleCalendarClient("t-cache")._get_service()
+    
+    calendar_service_cache.invalidate("t-cache")
+    
+    assert first is service and second is service
+    mock_build.assert_called_once()
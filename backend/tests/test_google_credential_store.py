@@ -0,0 +1,101 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from google.oauth2.credentials import Credentials
+
+from app.integrations.google_credential_store import GoogleCredentialStore
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+    
+    def delete(self, key):
+        self.data.pop(key, None)
+
+def make_credentials(token="old", expires_in=-60):
+    return Credentials(
+        token=token,
+        refresh_token="refresh",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="client",
+        client_secret="secret",
+        expiry=datetime.utcnow() + timedelta(seconds=expires_in)
+    )
+
+def make_store(redis_client=None):
+    store = GoogleCredentialStore()
+    store.redis_client = redis_client
+    return store
+
+def fake_refresh(creds, request):
+    creds.token = "new"
+    creds.expiry = datetime.utcnow() + timedelta(hours=1)
+
+@pytest.mark.asyncio
+async def test_valid_credentials_served_from_memory():
+    """Test valid credentials are returned without touching Redis"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    store.save_credentials("t1", make_credentials(token="live", expires_in=3600))
+    redis_client.data.clear()
+    
+    creds = await store.get_credentials("t1")
+    
+    assert creds.token == "live"
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_refresh_once():
+    """Test coroutines waiting on an expired token share a single refresh"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    store.save_credentials("t1", make_credentials())
+    refreshes = []
+    
+    def refresh(creds, request):
+        refreshes.append(creds)
+        fake_refresh(creds, request)
+    
+    with patch.object(Credentials, "refresh", refresh):
+        results = await asyncio.gather(*[store.get_credentials("t1") for _ in range(10)])
+    
+    assert len(refreshes) == 1
+    assert all(creds.token == "new" for creds in results)
+    assert json.loads(redis_client.data[store.credentials_key("t1")])["token"] == "new"
+    assert store.refresh_lock_key("t1") not in redis_client.data
+
+@pytest.mark.asyncio
+async def test_waits_for_other_replica_refresh():
+    """Test a replica that loses the refresh lock picks up the shared token"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    store.save_credentials("t1", make_credentials())
+    store.credentials.clear()
+    redis_client.set(store.refresh_lock_key("t1"), "1")
+    
+    async def other_replica():
+        await asyncio.sleep(0.1)
+        redis_client.set(store.credentials_key("t1"), make_credentials(token="shared", expires_in=3600).to_json())
+    
+    with patch.object(Credentials, "refresh", side_effect=AssertionError("should not refresh")):
+        creds, _ = await asyncio.gather(store.get_credentials("t1"), other_replica())
+    
+    assert creds.token == "shared"
+
+@pytest.mark.asyncio
+async def test_unauthorized_tenant_returns_none():
+    """Test tenants without stored credentials get None"""
+    store = make_store(FakeRedis())
+    
+    assert await store.get_credentials("missing") is None
@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+from app.services.intake_classifier import intake_classifier
+from app.services.quoting_service import QuotingService, ServiceType, SeverityLevel, MaterialType
+
+def test_extracts_all_fields_in_one_pass():
+    """Test service, severity, material, sqft and ZIP come from one message"""
+    result = intake_classifier.classify(
+        "Driveway is really dirty, about 1,200 sq ft of concrete. Zip is 30301"
+    )
+    
+    assert result["service_types"] == [(ServiceType.DRIVEWAY, 1.0)]
+    assert result["severities"] == [(SeverityLevel.HEAVY, 1.0)]
+    assert result["materials"] == [(MaterialType.CONCRETE, 1.0)]
+    assert result["sqft"] == [(1200, 1.0)]
+    assert result["zip_codes"] == [("30301", 1.0)]
+
+def test_candidates_ranked_by_score():
+    """Test every candidate is returned, strongest first"""
+    result = intake_classifier.classify("moderately dirty brick patio")
+    
+    assert result["severities"] == [(SeverityLevel.MODERATE, 1.0), (SeverityLevel.HEAVY, 0.5)]
+
+def test_whole_words_only():
+    """Test keywords don't match inside unrelated words"""
+    result = intake_classifier.classify("I'm driven to get the pathway cleared, somebody help")
+    
+    assert result["service_types"] == []
+    assert result["severities"] == []
+
+def test_window_count():
+    """Test a window count also counts towards the windows service"""
+    result = intake_classifier.classify("8 large windows and the deck")
+    
+    assert result["window_counts"] == [(8, 1.0)]
+    assert intake_classifier.best(result["service_types"]) == ServiceType.WINDOWS
+
+def test_word_between_count_and_windows_still_classified():
+    """Test a severity word inside "N <word> windows" isn't skipped"""
+    for text in ["I have 3 moldy windows", "2 dirty windows"]:
+        inputs = intake_classifier.extract_quote_inputs(text)
+        
+        assert inputs["severity"] == SeverityLevel.HEAVY, text
+        assert inputs["service_type"] == ServiceType.WINDOWS
+    
+    assert intake_classifier.extract_quote_inputs("I have 3 moldy windows")["unit_count"] == 3
+
+def test_phone_numbers_are_not_zip_codes():
+    """Test digit groups of a phone number are ignored"""
+    result = intake_classifier.classify("call me at 555-201-3344 or 5552013344")
+    
+    assert result["zip_codes"] == []
+
+def test_zip_code_followed_by_punctuation():
+    """Test a comma after the ZIP doesn't hide it"""
+    assert intake_classifier.extract_quote_inputs("zip 30301, thanks")["zip_code"] == "30301"
+
+def test_negated_severity():
+    """Test "not too dirty" reads as light"""
+    result = intake_classifier.classify("composite deck, not too dirty")
+    
+    assert intake_classifier.best(result["severities"]) == SeverityLevel.LIGHT
+
+LABELLED_CORPUS = Path(__file__).parent / "data" / "intake_labelled.jsonl"
+EXTRACTED_FIELDS = ["service_type", "sqft", "unit_count", "zip_code"]
+
+def test_extraction_accuracy_on_labelled_corpus():
+    """Test each extracted field matches the labels on at least 95% of messages"""
+    rows = [json.loads(line) for line in LABELLED_CORPUS.read_text().splitlines() if line.strip()]
+    correct = {field: 0 for field in EXTRACTED_FIELDS}
+    
+    for row in rows:
+        inputs = intake_classifier.extract_quote_inputs(row["text"])
+        inputs["service_type"] = inputs["service_type"].value
+        for field in EXTRACTED_FIELDS:
+            correct[field] += inputs[field] == row[field]
+    
+    for field in EXTRACTED_FIELDS:
+        assert correct[field] / len(rows) >= 0.95, field
+
+def test_dimensions_become_sqft():
+    """Test width x length patterns are multiplied out"""
+    assert intake_classifier.classify("deck 16x20")["sqft"] == [(320, 1.0)]
+    assert intake_classifier.classify("20 ft by 40 ft driveway")["sqft"] == [(800, 1.0)]
+    assert intake_classifier.classify("about 1.5k sq ft roof")["sqft"] == [(1500, 1.0)]
+
+def test_quote_from_text_uses_extracted_measurements():
+    """Test measurements in the text lift quotes out of low confidence"""
+    by_area = QuotingService.quote_from_text("t1", "driveway 20x40, concrete, zip 30301")
+    by_count = QuotingService.quote_from_text("t1", "need 12 windows cleaned")
+    
+    assert by_area["sqft_provided"] == 800
+    assert by_area["confidence"] == "high"
+    assert by_area["zip_code"] == "30301"
+    assert by_count["unit_count"] == 12
+    assert by_count["confidence"] == "medium"
@@ -0,0 +1,177 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.message_templates import CompiledTemplate, MessageTemplateStore, date_formatter, validate_templates
+from app.services.quote_cache import quote_message_cache
+from app.services.quoting_service import QuotingService
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def watch(self, key):
+        pass
+    
+    def get(self, key):
+        return self.redis_client.get(key)
+    
+    def multi(self):
+        pass
+    
+    def set(self, key, value):
+        self.commands.append(("set", key, value))
+    
+    def publish(self, channel, message):
+        self.commands.append(("publish", channel, message))
+    
+    def execute(self):
+        for command, key, value in self.commands:
+            if command == "set":
+                self.redis_client.data[key] = value
+            else:
+                self.redis_client.published.append(value)
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.published = []
+        self.reads = 0
+    
+    def get(self, key):
+        self.reads += 1
+        return self.data.get(key)
+    
+    def pipeline(self):
+        return FakePipeline(self)
+
+def make_store(redis_client=None):
+    store = MessageTemplateStore()
+    store.redis_client = redis_client
+    store.listener = object()  # no pub/sub thread in tests
+    return store
+
+APPOINTMENT = datetime(2025, 6, 2, 18, 30, tzinfo=timezone.utc)
+
+def test_compiled_template_renders_placeholders():
+    """Test literals and placeholders render like str.format"""
+    template = CompiledTemplate("Hi {customer_name}! Range ${min}-${max:,}")
+    
+    assert template.fields == {"customer_name", "min", "max"}
+    assert template.render({"customer_name": "Sam", "min": 120, "max": 1500}, "UTC") == "Hi Sam! Range $120-$1,500"
+
+def test_dates_render_in_timezone():
+    """Test datetimes use the default or given strftime pattern in the tenant's timezone"""
+    template = CompiledTemplate("{appointment_time} / {appointment_time:%a %b %-d at %-I:%M %p %Z}")
+    
+    assert template.render({"appointment_time": APPOINTMENT}, "America/Chicago") == (
+        "Monday, June 02 at 01:30 PM / Mon Jun 2 at 1:30 PM CDT"
+    )
+    # Naive datetimes are UTC; strftime fallback for directives without a lookup
+    assert date_formatter("UTC", "%j %H:%M").format(datetime(2025, 2, 1, 9, 5)) == "032 09:05"
+    assert date_formatter("Not/AZone").zone.key == "America/New_York"
+
+def test_invalid_templates_rejected():
+    """Test unknown templates, unknown placeholders and bad syntax are refused"""
+    with pytest.raises(ValueError):
+        validate_templates({"welcome": "Hi!"})
+    with pytest.raises(ValueError):
+        validate_templates({"review_request": "Hi {caller_name}!"})
+    with pytest.raises(ValueError):
+        validate_templates({"review_request_named": "Hi {customer_name!"})
+    with pytest.raises(ValueError):
+        validate_templates({"review_request_named": "Hi {customer_name.__class__}"})
+    with pytest.raises(ValueError):
+        validate_templates({"help_response": "  "})
+
+def test_format_specs_checked_at_save():
+    """Test format specs that can't apply to a placeholder's value are refused"""
+    with pytest.raises(ValueError):
+        validate_templates({"booking_cancellation": "Hi {customer_name:zz}"})
+    with pytest.raises(ValueError):
+        validate_templates({"quote": "${min:%B}"})
+    
+    assert validate_templates({"quote": "${min:,}-${max:,.2f}", "booking_reschedule": "{customer_name:>4} {appointment_time:%b %-d}"})
+
+def test_template_routes_reject_bad_format_spec():
+    """Test a template that would fail every render is a 400, not stored"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    client = TestClient(app)
+    
+    with patch("app.api.routes.templates.message_templates", store):
+        rejected = client.put("/api/v1/tenants/t1/templates", json={"templates": {"booking_cancellation": "Hi {customer_name:zz}"}})
+        updated = client.put("/api/v1/tenants/t1/templates", json={"templates": {"booking_cancellation": "Bye {customer_name}"}})
+    
+    assert rejected.status_code == 400
+    assert "booking_cancellation" in rejected.json()["detail"]
+    assert updated.json() == {"tenant_id": "t1", "version": 1}
+    assert store.render("t1", "booking_cancellation", customer_name="Sam") == "Bye Sam"
+
+def test_tenant_overrides_fall_back_to_defaults():
+    """Test a tenant's overrides replace only the templates they list"""
+    store = make_store(FakeRedis())
+    store.save_templates("t1", {"review_request_named": "Thanks {customer_name}!"})
+    
+    assert store.render("t1", "review_request_named", customer_name="Sam") == "Thanks Sam!"
+    assert store.render("t1", "review_request") == store.render("t2", "review_request")
+    assert store.get("t2") is store.default_set
+
+def test_cached_set_does_not_hit_redis():
+    """Test repeated renders are served from the compiled in-process set"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    store.save_templates("t1", {"help_response": "Call us."})
+    redis_client.reads = 0
+    
+    for _ in range(100):
+        template_set = store.get("t1", now=0)
+    
+    assert template_set.version == 1
+    assert redis_client.reads == 0
+
+def test_invalidation_message_reloads_templates():
+    """Test a newer version published elsewhere replaces the cached set"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    other = make_store(redis_client)
+    store.save_templates("t1", {"help_response": "v1"})
+    
+    assert other.save_templates("t1", {"help_response": "v2"}) == 2
+    assert store.get("t1", now=1).render("help_response", {}) == "v1"
+    
+    store._on_invalidate({"data": b"t1:2"})
+    
+    assert store.get("t1", now=2).render("help_response", {}) == "v2"
+    assert redis_client.published == ["t1:1", "t1:2"]
+    
+    assert other.delete_templates("t1") == 3
+    assert other.get("t1") is other.default_set
+
+def test_quote_message_uses_tenant_template():
+    """Test quote messages are worded by the tenant's quote template"""
+    store = make_store(FakeRedis())
+    store.save_templates("t1", {"quote": "{service}: ${min}-${max}"})
+    quote_message_cache.clear()
+    quote = {
+        "tenant_id": "t1",
+        "service_type": "house_wash",
+        "confidence": "high",
+        "price_range": {"min": 200, "max": 300}
+    }
+    
+    with patch("app.services.quoting_service.message_templates", store):
+        custom = QuotingService.generate_quote_message(quote)
+        default = QuotingService.generate_quote_message({**quote, "tenant_id": "t2"})
+    
+    assert custom == "House Wash: $200-$300"
+    assert default.startswith("Perfect! Based on your details, House Wash cleaning")
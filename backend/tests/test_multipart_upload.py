@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.s3_client import async_s3_client
+from app.workers.worker import TaskWorker
+
+client = TestClient(app)
+
+def test_create_multipart_upload_schedules_sweep():
+    """Test starting an upload returns the part plan and schedules cleanup"""
+    boto_client = MagicMock()
+    boto_client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client), \
+         patch("app.api.routes.leads.jitter_queue.enqueue_delayed") as mock_enqueue:
+        response = client.post(
+            "/api/v1/leads/l1/media/multipart",
+            json={
+                "tenant_id": "t1",
+                "file_extension": "MP4",
+                "content_type": "video/mp4",
+                "size_bytes": 20 * 1024 * 1024
+            }
+        )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["upload_id"] == "up-1"
+    assert data["file_key"].startswith("photos/t1/l1/") and data["file_key"].endswith(".mp4")
+    assert data["part_size_bytes"] == 8 * 1024 * 1024
+    assert data["part_count"] == 3
+    assert boto_client.create_multipart_upload.call_args[1]["ContentType"] == "video/mp4"
+    assert boto_client.create_multipart_upload.call_args[1]["Metadata"] == {"declared-size": str(20 * 1024 * 1024)}
+    assert mock_enqueue.call_args[1]["key"] == "MULTIPART_UPLOAD_SWEEP"
+    assert mock_enqueue.call_args[1]["payload"] == {"file_key": data["file_key"], "upload_id": "up-1"}
+
+def test_create_multipart_upload_rejects_other_content_types():
+    """Test only image and video uploads can be started"""
+    response = client.post(
+        "/api/v1/leads/l1/media/multipart",
+        json={"tenant_id": "t1", "file_extension": "zip", "content_type": "application/zip", "size_bytes": 10}
+    )
+    
+    assert response.status_code == 422
+
+def test_presign_parts_rejects_foreign_key():
+    """Test part URLs cannot be signed for another lead's object"""
+    response = client.post(
+        "/api/v1/leads/l1/media/multipart/parts",
+        json={"tenant_id": "t1", "file_key": "photos/t2/l1/a.mp4", "upload_id": "up-1", "part_numbers": [1]}
+    )
+    
+    assert response.status_code == 400
+
+def test_presign_and_list_parts():
+    """Test part URLs are signed per part and uploaded parts can be listed to resume"""
+    boto_client = MagicMock()
+    boto_client.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://s3.test/{Params['PartNumber']}"
+    paginator = MagicMock()
+    paginator.paginate.return_value = [
+        {"Parts": [{"PartNumber": 1, "ETag": '"e1"', "Size": 8388608}]},
+        {"Parts": [{"PartNumber": 2, "ETag": '"e2"', "Size": 8388608}]}
+    ]
+    boto_client.get_paginator.return_value = paginator
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        signed = client.post(
+            "/api/v1/leads/l1/media/multipart/parts",
+            json={"tenant_id": "t1", "file_key": "photos/t1/l1/a.mp4", "upload_id": "up-1", "part_numbers": [2, 3]}
+        )
+        listed = client.get(
+            "/api/v1/leads/l1/media/multipart/parts",
+            params={"tenant_id": "t1", "file_key": "photos/t1/l1/a.mp4", "upload_id": "up-1"}
+        )
+    
+    assert signed.status_code == 200
+    assert [part["upload_url"] for part in signed.json()["parts"]] == ["https://s3.test/2", "https://s3.test/3"]
+    assert listed.status_code == 200
+    assert [part["part_number"] for part in listed.json()["parts"]] == [1, 2]
+
+def test_complete_multipart_upload_records_photo():
+    """Test completing an upload assembles parts in order and indexes the object"""
+    boto_client = MagicMock()
+    boto_client.head_object.return_value = {"ContentLength": 1024, "ContentType": "video/mp4", "Metadata": {"declared-size": "1024"}}
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client), \
+         patch("app.api.routes.leads._record_uploaded_photo", return_value={"file_key": "photos/t1/l1/a.mp4"}) as mock_record:
+        response = client.post(
+            "/api/v1/leads/l1/media/multipart/complete",
+            json={
+                "tenant_id": "t1",
+                "file_key": "photos/t1/l1/a.mp4",
+                "upload_id": "up-1",
+                "parts": [{"part_number": 2, "etag": '"e2"'}, {"part_number": 1, "etag": '"e1"'}]
+            }
+        )
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    parts = boto_client.complete_multipart_upload.call_args[1]["MultipartUpload"]["Parts"]
+    assert [part["PartNumber"] for part in parts] == [1, 2]
+    assert mock_record.call_args[0][:3] == ("t1", "l1", "photos/t1/l1/a.mp4")
+
+@pytest.mark.parametrize("content_length, declared, expected", [
+    (4 * 1024 ** 3, "1024", 413),
+    (2048, "1024", 400)
+])
+def test_complete_rejects_oversized_assembly(content_length, declared, expected):
+    """Test an assembled object over the limit or the declared size is deleted, not indexed"""
+    boto_client = MagicMock()
+    boto_client.head_object.return_value = {"ContentLength": content_length, "Metadata": {"declared-size": declared}}
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client), \
+         patch("app.api.routes.leads._record_uploaded_photo") as mock_record:
+        response = client.post(
+            "/api/v1/leads/l1/media/multipart/complete",
+            json={
+                "tenant_id": "t1",
+                "file_key": "photos/t1/l1/a.mp4",
+                "upload_id": "up-1",
+                "parts": [{"part_number": 1, "etag": '"e1"'}]
+            }
+        )
+    
+    assert response.status_code == expected
+    assert boto_client.delete_object.call_args[1]["Key"] == "photos/t1/l1/a.mp4"
+    mock_record.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_sweep_aborts_abandoned_upload():
+    """Test the worker aborts uploads that were never completed"""
+    boto_client = MagicMock()
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        worker = TaskWorker()
+        result = await worker._handle_multipart_upload_sweep(
+            {"file_key": "photos/t1/l1/a.mp4", "upload_id": "up-1"},
+            "t1"
+        )
+    
+    assert result is True
+    boto_client.abort_multipart_upload.assert_called_once()
@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.s3_client import S3Client, AsyncS3Client, async_s3_client
+from app.services.photo_index import photo_index
+
+client = TestClient(app)
+
+def make_s3_client(boto_client):
+    s3 = S3Client.__new__(S3Client)
+    s3.client = boto_client
+    s3.bucket_name = "test-bucket"
+    return s3
+
+def delete_objects_failing(bad_keys):
+    def delete_objects(Bucket, Delete):
+        errors = [{"Key": obj["Key"], "Code": "AccessDenied"} for obj in Delete["Objects"] if obj["Key"] in bad_keys]
+        return {"Errors": errors}
+    return delete_objects
+
+def test_delete_photos_chunks_into_delete_objects_calls():
+    """Test keys are grouped into DeleteObjects calls of at most 1000"""
+    boto_client = MagicMock()
+    boto_client.delete_objects.side_effect = delete_objects_failing({"k1500"})
+    s3 = make_s3_client(boto_client)
+    keys = [f"k{i}" for i in range(2500)]
+    
+    result = s3.delete_photos(keys)
+    
+    chunk_sizes = sorted(len(call[1]["Delete"]["Objects"]) for call in boto_client.delete_objects.call_args_list)
+    assert chunk_sizes == [500, 1000, 1000]
+    assert len(result["deleted"]) == 2499
+    assert result["failed"] == [{"file_key": "k1500", "error": "AccessDenied"}]
+
+@pytest.mark.asyncio
+async def test_async_delete_photos_reports_chunk_errors():
+    """Test a failing chunk is reported per key without losing other chunks"""
+    boto_client = MagicMock()
+    
+    def delete_objects(Bucket, Delete):
+        if Delete["Objects"][0]["Key"] == "k0":
+            raise RuntimeError("boom")
+        return {}
+    
+    boto_client.delete_objects.side_effect = delete_objects
+    async_client = AsyncS3Client(sync_client=make_s3_client(boto_client), max_workers=2)
+    
+    result = await async_client.delete_photos([f"k{i}" for i in range(4)], chunk_size=2)
+    
+    assert result["deleted"] == ["k2", "k3"]
+    assert [failure["file_key"] for failure in result["failed"]] == ["k0", "k1"]
+    async_client.shutdown()
+
+@patch.object(photo_index, 'remove_photos')
+@patch.object(async_s3_client, 'delete_photos', new_callable=AsyncMock)
+def test_batch_delete_endpoint_rejects_foreign_keys(mock_delete_photos, mock_remove_photos):
+    """Test bulk delete only touches keys owned by the lead"""
+    mock_delete_photos.return_value = {"deleted": ["photos/t1/l1/a.jpg"], "failed": []}
+    
+    response = client.post(
+        "/api/v1/leads/l1/photos/delete",
+        json={"tenant_id": "t1", "file_keys": ["photos/t1/l1/a.jpg", "photos/t1/l2/b.jpg"]}
+    )
+    
+    assert response.status_code == 200
+    originals, derivatives = [call[0][0] for call in mock_delete_photos.await_args_list]
+    assert originals == ["photos/t1/l1/a.jpg"]
+    assert "derived/t1/l1/a/thumb.webp" in derivatives
+    mock_remove_photos.assert_called_once_with(["photos/t1/l1/a.jpg"])
+    assert response.json()["failed"] == [
+        {"file_key": "photos/t1/l2/b.jpg", "error": "Key does not belong to this lead"}
+    ]
+
+@patch.object(photo_index, 'remove_photo')
+@patch.object(async_s3_client, 'delete_photos', new_callable=AsyncMock)
+@patch.object(async_s3_client, 'delete_photo', new_callable=AsyncMock, return_value=True)
+def test_single_delete_endpoint_accepts_full_key(mock_delete_photo, mock_delete_photos, mock_remove_photo):
+    """Test a full photos/... key reaches the handler and cleans up derivatives and the index"""
+    response = client.delete("/api/v1/leads/l1/photos/photos/t1/l1/a.jpg")
+    
+    assert response.status_code == 200
+    mock_delete_photo.assert_awaited_once_with("photos/t1/l1/a.jpg")
+    assert "derived/t1/l1/a/thumb.webp" in mock_delete_photos.await_args[0][0]
+    mock_remove_photo.assert_called_once_with("t1", "l1", "photos/t1/l1/a.jpg")
+    
+    foreign = client.delete("/api/v1/leads/l1/photos/photos/t1/l2/b.jpg")
+    assert foreign.status_code == 400
@@ -0,0 +1,80 @@
+import io
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.main import app
+from app.integrations.s3_client import async_s3_client
+from app.services.photo_index import photo_index
+from app.services.photo_derivatives import PhotoDerivativeService, derivative_key, derivative_keys
+from app.workers.worker import TaskWorker
+
+client = TestClient(app)
+
+def jpeg_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 100, 50)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+def test_derivative_key_layout():
+    """Test derivatives live under the derived prefix keyed by original file id"""
+    assert derivative_key("photos/t1/l1/abc.jpg", "thumb", "webp") == "derived/t1/l1/abc/thumb.webp"
+    assert len(derivative_keys("photos/t1/l1/abc.jpg")) == 4
+
+def test_generate_uploads_every_size_and_format():
+    """Test each size variant is produced in JPEG and WebP within its bounds"""
+    original = jpeg_bytes(4000, 3000)
+    uploads = {}
+    
+    s3 = MagicMock()
+    s3.download_fileobj.side_effect = lambda key, fileobj: fileobj.write(original) or True
+    
+    def upload_fileobj(key, fileobj, content_type, cache_control):
+        uploads[key] = (Image.open(io.BytesIO(fileobj.read())), content_type)
+        return True
+    
+    s3.upload_fileobj.side_effect = upload_fileobj
+    
+    sizes = PhotoDerivativeService(s3).generate("photos/t1/l1/abc.jpg")
+    
+    assert sizes == ["web", "thumb"]
+    assert set(uploads) == set(derivative_keys("photos/t1/l1/abc.jpg"))
+    thumb, content_type = uploads["derived/t1/l1/abc/thumb.webp"]
+    assert content_type == "image/webp"
+    assert max(thumb.size) == 320
+    web, _ = uploads["derived/t1/l1/abc/web.jpg"]
+    assert web.size == (1600, 1200)
+
+@pytest.mark.asyncio
+async def test_undecodable_original_is_not_retried():
+    """Test an original Pillow can't identify finishes the task instead of failing it"""
+    s3 = MagicMock()
+    s3.download_fileobj.side_effect = lambda key, fileobj: fileobj.write(b"%PDF-1.4 not an image") or True
+    worker = TaskWorker.__new__(TaskWorker)
+    worker.derivative_service = PhotoDerivativeService(s3)
+    
+    assert worker.derivative_service.generate("photos/t1/l1/abc.jpg") == []
+    with patch.object(photo_index, 'set_derivatives') as mock_set:
+        assert await worker._handle_photo_derivatives({"file_key": "photos/t1/l1/abc.jpg"}, "t1") is True
+    
+    s3.upload_fileobj.assert_not_called()
+    mock_set.assert_not_called()
+
+@patch.object(photo_index, 'get_photo')
+def test_download_serves_derivative_when_ready(mock_get_photo):
+    """Test size variant falls back to the original until derivatives exist"""
+    boto_client = MagicMock()
+    boto_client.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://s3.test/{Params['Key']}"
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        mock_get_photo.return_value = {"file_key": "photos/t1/l1/abc.jpg"}
+        pending = client.get("/api/v1/leads/l1/photos/photos/t1/l1/abc.jpg/download", params={"size": "thumb"})
+        
+        mock_get_photo.return_value = {"file_key": "photos/t1/l1/abc.jpg", "derivatives": ["web", "thumb"]}
+        ready = client.get("/api/v1/leads/l1/photos/photos/t1/l1/abc.jpg/download", params={"size": "thumb"})
+    
+    assert pending.json()["size"] == "original"
+    assert pending.json()["download_url"] == "https://s3.test/photos/t1/l1/abc.jpg"
+    assert ready.json()["size"] == "thumb"
+    assert ready.json()["download_url"] == "https://s3.test/derived/t1/l1/abc/thumb.webp"
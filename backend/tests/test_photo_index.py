@@ -0,0 +1,155 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.s3_client import async_s3_client
+from app.services.jitter_queue import JitterQueue, jitter_queue
+from app.services.photo_index import PhotoIndex, photo_index, parse_photo_key
+
+client = TestClient(app)
+
+def test_parse_photo_key():
+    """Test tenant and lead are extracted from photo keys"""
+    assert parse_photo_key("photos/t1/l1/abc.jpg") == ("t1", "l1")
+    assert parse_photo_key("photos/t1/abc.jpg") is None
+    assert parse_photo_key("derived/t1/l1/abc.jpg") is None
+
+@patch.object(jitter_queue, 'ensure_periodic')
+@patch.object(jitter_queue, 'enqueue_delayed')
+@patch.object(photo_index, 'register_tenant', return_value=False)
+@patch.object(photo_index, 'record_photo', return_value=True)
+@patch.object(async_s3_client, 'get_photo_metadata', new_callable=AsyncMock)
+def test_confirm_upload_indexes_photo(mock_metadata, mock_record, mock_register, mock_enqueue, mock_periodic):
+    """Test upload confirmation records the photo and (re-)arms reconciliation"""
+    mock_metadata.return_value = {
+        "file_key": "photos/t1/l1/a.jpg",
+        "size_bytes": 2048,
+        "content_type": "image/jpeg",
+        "last_modified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "etag": "abc",
+        "metadata": {}
+    }
+    
+    response = client.post(
+        "/api/v1/leads/l1/photos/confirm",
+        json={"tenant_id": "t1", "file_key": "photos/t1/l1/a.jpg"}
+    )
+    
+    assert response.status_code == 200
+    tenant_id, lead_id, photo = mock_record.call_args[0]
+    assert (tenant_id, lead_id) == ("t1", "l1")
+    assert photo["content_type"] == "image/jpeg"
+    assert photo["size_bytes"] == 2048
+    assert mock_enqueue.call_args[1]["key"] == "PHOTO_DERIVATIVES"
+    # Armed even for an already registered tenant, in case its chain was lost
+    assert mock_periodic.call_args[1]["key"] == "PHOTO_INDEX_RECONCILE"
+
+def test_confirm_upload_rejects_foreign_key():
+    """Test a key from another lead cannot be confirmed"""
+    response = client.post(
+        "/api/v1/leads/l1/photos/confirm",
+        json={"tenant_id": "t1", "file_key": "photos/t2/l1/a.jpg"}
+    )
+    
+    assert response.status_code == 400
+
+@patch.object(async_s3_client, 'list_photos_page', new_callable=AsyncMock)
+@patch.object(photo_index, 'get_lead_photos')
+def test_gallery_served_from_index(mock_get_lead_photos, mock_list_page):
+    """Test gallery reads skip S3 LIST when the index is populated"""
+    mock_get_lead_photos.return_value = [{"file_key": "photos/t1/l1/a.jpg", "size_bytes": 1}]
+    
+    response = client.get("/api/v1/leads/l1/photos", params={"tenant_id": "t1"})
+    
+    assert response.status_code == 200
+    assert response.json()["photos"][0]["file_key"] == "photos/t1/l1/a.jpg"
+    mock_list_page.assert_not_called()
+
+@patch.object(async_s3_client, 'list_photos_page', new_callable=AsyncMock)
+def test_indexed_gallery_is_paginated(mock_list_page):
+    """Test limit and cursor are honoured when the gallery is served from the index"""
+    stored = {
+        f"photos/t1/l1/{name}.jpg".encode(): json.dumps({
+            "file_key": f"photos/t1/l1/{name}.jpg",
+            "last_modified": f"2024-01-0{day}T00:00:00+00:00"
+        })
+        for day, name in enumerate(["c", "a", "b"], start=1)
+    }
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value.execute.return_value = [1, stored]
+    
+    with patch.object(photo_index, "redis_client", redis_client):
+        first = client.get("/api/v1/leads/l1/photos", params={"tenant_id": "t1", "limit": 2})
+        second = client.get(
+            "/api/v1/leads/l1/photos",
+            params={"tenant_id": "t1", "limit": 2, "cursor": first.json()["next_cursor"]}
+        )
+        invalid = client.get("/api/v1/leads/l1/photos", params={"tenant_id": "t1", "cursor": "ix:???"})
+    
+    assert [p["file_key"] for p in first.json()["photos"]] == ["photos/t1/l1/c.jpg", "photos/t1/l1/a.jpg"]
+    assert first.json()["next_cursor"].startswith("ix:")
+    assert [p["file_key"] for p in second.json()["photos"]] == ["photos/t1/l1/b.jpg"]
+    assert second.json()["next_cursor"] is None
+    assert invalid.status_code == 400
+    mock_list_page.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_reconcile_groups_listing_by_lead():
+    """Test reconciliation rewrites each lead and clears leads gone from S3"""
+    index = PhotoIndex.__new__(PhotoIndex)
+    index.redis_client = MagicMock()
+    index.replace_lead_photos = MagicMock(return_value=True)
+    index.get_indexed_leads = MagicMock(return_value=["l1", "l2", "stale"])
+    
+    async def stream_photo_pages(tenant_id):
+        yield [{"file_key": "photos/t1/l1/a.jpg"}, {"file_key": "photos/t1/l1/b.jpg"}]
+        yield [{"file_key": "photos/t1/l1/c.jpg"}, {"file_key": "photos/t1/l2/d.jpg"}]
+    
+    s3 = MagicMock()
+    s3.stream_photo_pages = stream_photo_pages
+    
+    result = await index.reconcile_tenant("t1", s3)
+    
+    assert result == {"photos": 4, "leads": 2}
+    replaced = {call[0][1]: [p["file_key"] for p in call[0][2]] for call in index.replace_lead_photos.call_args_list}
+    assert replaced == {
+        "l1": ["photos/t1/l1/a.jpg", "photos/t1/l1/b.jpg", "photos/t1/l1/c.jpg"],
+        "l2": ["photos/t1/l2/d.jpg"],
+        "stale": []
+    }
+
+class FakeQueueRedis:
+    def __init__(self):
+        self.values = {}
+        self.queued = []
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+    
+    def delete(self, key):
+        self.values.pop(key, None)
+    
+    def zadd(self, key, mapping):
+        self.queued.extend(json.loads(member) for member in mapping)
+
+def test_reconciliation_chain_is_rearmed_once_lost():
+    """Test a live chain is left alone and a lost one is scheduled again"""
+    queue = JitterQueue.__new__(JitterQueue)
+    queue.redis_client = FakeQueueRedis()
+    arm = dict(key="PHOTO_INDEX_RECONCILE", interval_seconds=3600, tenant_id="t1")
+    
+    assert queue.ensure_periodic(delay_seconds=0, **arm) is True
+    assert queue.ensure_periodic(delay_seconds=0, **arm) is False
+    assert queue.ensure_periodic(renew=True, **arm) is True
+    assert [task["task_id"] for task in queue.redis_client.queued] == ["PHOTO_INDEX_RECONCILE:t1"] * 2
+    
+    # The run was lost and its record expired
+    queue.redis_client.delete(queue.periodic_key("PHOTO_INDEX_RECONCILE", "t1"))
+    assert queue.ensure_periodic(delay_seconds=0, **arm) is True
+    assert len(queue.redis_client.queued) == 3
@@ -0,0 +1,85 @@
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.s3_client import async_s3_client
+
+client = TestClient(app)
+
+def s3_object(key):
+    return {"Key": key, "Size": 1024, "LastModified": datetime(2024, 1, 1), "ETag": '"abc"'}
+
+def paged_list_objects(pages):
+    """Build a list_objects_v2 stub that serves pages keyed by continuation token"""
+    def list_objects_v2(**params):
+        index = int(params.get("ContinuationToken", "0"))
+        response = {"Contents": [s3_object(key) for key in pages[index]], "IsTruncated": index + 1 < len(pages)}
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(index + 1)
+        return response
+    return list_objects_v2
+
+def test_list_lead_photos_returns_cursor():
+    """Test lead photo listing pages through S3 continuation tokens"""
+    boto_client = MagicMock()
+    boto_client.list_objects_v2.side_effect = paged_list_objects([
+        ["photos/t1/l1/a.jpg", "photos/t1/l1/b.jpg"],
+        ["photos/t1/l1/c.jpg"]
+    ])
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        first = client.get("/api/v1/leads/l1/photos", params={"tenant_id": "t1", "limit": 2})
+        second = client.get(
+            "/api/v1/leads/l1/photos",
+            params={"tenant_id": "t1", "limit": 2, "cursor": first.json()["next_cursor"]}
+        )
+    
+    assert first.status_code == 200
+    assert [p["file_key"] for p in first.json()["photos"]] == ["photos/t1/l1/a.jpg", "photos/t1/l1/b.jpg"]
+    assert first.json()["next_cursor"] == "1"
+    assert [p["file_key"] for p in second.json()["photos"]] == ["photos/t1/l1/c.jpg"]
+    assert second.json()["next_cursor"] is None
+    assert boto_client.list_objects_v2.call_args_list[0][1]["Prefix"] == "photos/t1/l1/"
+
+def test_list_lead_photos_rejects_bad_cursor():
+    """Test a continuation token S3 rejects is a client error, not an outage"""
+    boto_client = MagicMock()
+    boto_client.list_objects_v2.side_effect = ClientError(
+        {"Error": {"Code": "InvalidArgument", "Message": "The continuation token provided is incorrect"}},
+        "ListObjectsV2"
+    )
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        response = client.get("/api/v1/leads/l1/photos", params={"tenant_id": "t1", "cursor": "garbage"})
+    
+    assert response.status_code == 400
+
+def test_list_lead_photos_storage_unavailable():
+    """Test listing returns 503 when S3 is not configured"""
+    with patch.object(async_s3_client.sync_client, "client", None):
+        response = client.get("/api/v1/leads/l1/photos", params={"tenant_id": "t1"})
+    
+    assert response.status_code == 503
+
+def test_export_tenant_photos_streams_ndjson():
+    """Test tenant export streams every page as NDJSON"""
+    boto_client = MagicMock()
+    boto_client.list_objects_v2.side_effect = paged_list_objects([
+        ["photos/t1/l1/a.jpg"],
+        ["photos/t1/l2/b.jpg", "photos/t1/l2/c.jpg"]
+    ])
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        response = client.get("/api/v1/tenants/t1/photos/export")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["file_key"] for line in lines] == [
+        "photos/t1/l1/a.jpg", "photos/t1/l2/b.jpg", "photos/t1/l2/c.jpg"
+    ]
+    assert boto_client.list_objects_v2.call_args_list[0][1]["Prefix"] == "photos/t1/"
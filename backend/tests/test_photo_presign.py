@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.s3_client import async_s3_client
+
+client = TestClient(app)
+
+def fake_presigned_post(Bucket, Key, Fields, Conditions, ExpiresIn):
+    return {"url": "https://s3.test/bucket", "fields": {**Fields, "policy": "p", "conditions": Conditions}}
+
+def test_batch_presign_returns_upload_per_file():
+    """Test batch presign signs every file in one request with its own conditions"""
+    boto_client = MagicMock()
+    boto_client.generate_presigned_post.side_effect = fake_presigned_post
+    
+    with patch.object(async_s3_client.sync_client, "client", boto_client):
+        response = client.post(
+            "/api/v1/leads/l1/photos/presign/batch",
+            json={
+                "tenant_id": "t1",
+                "files": [
+                    {"file_extension": "jpg", "size_bytes": 2048},
+                    {"file_extension": "png"},
+                    {"file_extension": "heic", "content_type": "image/heic"}
+                ]
+            }
+        )
+    
+    assert response.status_code == 200
+    uploads = response.json()["uploads"]
+    assert len(uploads) == 3
+    assert all(upload["file_key"].startswith("photos/t1/l1/") for upload in uploads)
+    assert len({upload["file_key"] for upload in uploads}) == 3
+    assert [upload["fields"]["Content-Type"] for upload in uploads] == ["image/jpeg", "image/png", "image/heic"]
+    assert uploads[0]["max_size_bytes"] == 2048
+    assert ["content-length-range", 0, 2048] in uploads[0]["fields"]["conditions"]
+    assert {"Content-Type": "image/png"} in uploads[1]["fields"]["conditions"]
+
+def test_batch_presign_rejects_non_image_content_type():
+    """Test only image content types can be presigned"""
+    response = client.post(
+        "/api/v1/leads/l1/photos/presign/batch",
+        json={"tenant_id": "t1", "files": [{"file_extension": "exe", "content_type": "application/octet-stream"}]}
+    )
+    
+    assert response.status_code == 422
+
+def test_batch_presign_rejects_guessed_non_image_type():
+    """Test an extension that guesses to a non-image type is refused rather than presigned"""
+    response = client.post(
+        "/api/v1/leads/l1/photos/presign/batch",
+        json={"tenant_id": "t1", "files": [{"file_extension": "jpg"}, {"file_extension": "pdf"}]}
+    )
+    
+    assert response.status_code == 400
+    assert "pdf" in response.json()["detail"]
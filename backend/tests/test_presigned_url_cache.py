@@ -0,0 +1,66 @@
+import pytest
+
+from app.services.presigned_url_cache import PresignedUrlCache
+
+def make_signer():
+    calls = []
+    
+    async def sign(expires_in):
+        calls.append(expires_in)
+        return f"https://s3.test/photo.jpg?sig={len(calls)}&expires={expires_in}"
+    
+    return sign, calls
+
+def make_cache(**kwargs):
+    cache = PresignedUrlCache(bucket_seconds=3600, **kwargs)
+    cache.redis_client = None
+    return cache
+
+@pytest.mark.asyncio
+async def test_same_url_within_bucket():
+    """Test repeated requests in one bucket get a byte-identical URL"""
+    cache = make_cache()
+    sign, calls = make_signer()
+    
+    first_url, first_expires = await cache.get_or_sign("photos/t1/l1/a.jpg", sign, now=7200 + 10)
+    second_url, second_expires = await cache.get_or_sign("photos/t1/l1/a.jpg", sign, now=7200 + 3000)
+    
+    assert first_url == second_url
+    assert len(calls) == 1
+    assert calls[0] == 3600 * 2 - 10  # Valid until the end of the next bucket
+    assert second_expires == 3600 * 2 - 3000
+    assert cache.get_stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_new_bucket_resigns():
+    """Test a new bucket produces a fresh URL"""
+    cache = make_cache()
+    sign, calls = make_signer()
+    
+    first_url, _ = await cache.get_or_sign("photos/t1/l1/a.jpg", sign, now=7200 + 10)
+    second_url, _ = await cache.get_or_sign("photos/t1/l1/a.jpg", sign, now=10800 + 10)
+    
+    assert first_url != second_url
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_local_entries_are_bounded():
+    """Test the in-process cache evicts least recently used keys"""
+    cache = make_cache(max_entries=2)
+    sign, _ = make_signer()
+    
+    for key in ("a", "b", "c"):
+        await cache.get_or_sign(key, sign, now=100)
+    
+    assert list(cache.local) == ["b", "c"]
+
+@pytest.mark.asyncio
+async def test_failed_signing_is_not_cached():
+    """Test signing failures return None and are retried next time"""
+    cache = make_cache()
+    
+    async def failing_sign(expires_in):
+        return None
+    
+    assert await cache.get_or_sign("photos/t1/l1/a.jpg", failing_sign, now=100) is None
+    assert "photos/t1/l1/a.jpg" not in cache.local
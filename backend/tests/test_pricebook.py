@@ -0,0 +1,188 @@
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.pricebook import PriceBookStore
+from app.services.quote_cache import quote_cache
+from app.services.quoting_service import QuotingService, ServiceType, SeverityLevel, MaterialType
+from app.services.versioned_store import VersionedStore
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def watch(self, key):
+        pass
+    
+    def get(self, key):
+        return self.redis_client.get(key)
+    
+    def multi(self):
+        pass
+    
+    def set(self, key, value):
+        self.commands.append(("set", key, value))
+    
+    def publish(self, channel, message):
+        self.commands.append(("publish", channel, message))
+    
+    def execute(self):
+        for command, key, value in self.commands:
+            if command == "set":
+                self.redis_client.data[key] = value
+            else:
+                self.redis_client.published.append(value)
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.published = []
+        self.reads = 0
+    
+    def get(self, key):
+        self.reads += 1
+        return self.data.get(key)
+    
+    def pipeline(self):
+        return FakePipeline(self)
+
+def make_store(redis_client=None):
+    store = PriceBookStore()
+    store.redis_client = redis_client
+    store.listener = object()  # no pub/sub thread in tests
+    return store
+
+def test_tenants_without_rules_share_default_book():
+    """Test tenants without custom rules get the default pricing"""
+    store = make_store(FakeRedis())
+    
+    assert store.get("t1") is store.default_book
+    assert store.get("t2") is store.default_book
+    assert store.default_book.lookup(ServiceType.ROOF, SeverityLevel.HEAVY, MaterialType.BRICK) == (300, 0.40, 1.6, 1.2)
+    assert store.default_book.lookup(ServiceType.ROOF, SeverityLevel.HEAVY, None) == (300, 0.40, 1.6, 1.0)
+
+def test_cached_book_does_not_hit_redis():
+    """Test repeated lookups are served from the in-process cache"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    store.save_rules("t1", {"base_prices": {"driveway": 175}})
+    redis_client.reads = 0
+    
+    for _ in range(100):
+        book = store.get("t1", now=0)
+    
+    assert book.version == 1
+    assert redis_client.reads == 0
+
+def test_save_rules_bumps_version_and_publishes():
+    """Test saving rules versions the book and announces it to other processes"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    
+    assert store.save_rules("t1", {"severity_multipliers": {"heavy": 1.8}}) == 1
+    assert store.save_rules("t1", {"severity_multipliers": {"heavy": 1.9}}) == 2
+    
+    assert redis_client.published == ["t1:1", "t1:2"]
+    assert store.get("t1").lookup(ServiceType.DECK, SeverityLevel.HEAVY, None)[2] == 1.9
+
+def test_invalidation_message_reloads_book():
+    """Test a newer version published elsewhere replaces the cached book"""
+    redis_client = FakeRedis()
+    store = make_store(redis_client)
+    other = make_store(redis_client)
+    store.get("t1", now=0)
+    
+    other.save_rules("t1", {"base_prices": {"roof": 500}})
+    assert store.get("t1", now=1).version == 0
+    
+    store._on_invalidate({"data": b"t1:1"})
+    
+    assert store.get("t1", now=2).lookup(ServiceType.ROOF, SeverityLevel.LIGHT, None)[0] == 500
+
+def test_invalid_rules_rejected():
+    """Test unknown sections and keys and non-numeric, non-finite or negative values are refused"""
+    store = make_store(FakeRedis())
+    
+    with pytest.raises(ValueError):
+        store.save_rules("t1", {"discounts": {}})
+    with pytest.raises(ValueError):
+        store.save_rules("t1", {"base_prices": {"pool": 100}})
+    with pytest.raises(ValueError):
+        store.save_rules("t1", {"base_prices": {"roof": -1}})
+    for value in (True, "abc", float("nan"), float("inf"), None):
+        with pytest.raises(ValueError):
+            store.save_rules("t1", {"base_prices": {"roof": value}})
+    
+    store.save_rules("t1", {"base_prices": {"roof": "12"}})
+    assert store.get_rules("t1")["rules"] == {"base_prices": {"roof": 12.0}}
+
+def test_quotes_use_tenant_pricebook():
+    """Test scalar and batch quotes both price with the tenant's rules"""
+    store = make_store(FakeRedis())
+    store.save_rules("t1", {"base_prices": {"driveway": 200}, "material_multipliers": {"brick": 1.5}})
+    quote_cache.clear()
+    
+    with patch("app.services.pricebook.pricebook_store", store):
+        custom = QuotingService.calculate_quote(
+            tenant_id="t1",
+            service_type=ServiceType.DRIVEWAY,
+            severity=SeverityLevel.LIGHT,
+            sqft=400,
+            material=MaterialType.BRICK
+        )
+        default = QuotingService.calculate_quote(
+            tenant_id="t2",
+            service_type=ServiceType.DRIVEWAY,
+            severity=SeverityLevel.LIGHT,
+            sqft=400,
+            material=MaterialType.BRICK
+        )
+        batch = QuotingService.calculate_quotes_batch(
+            tenant_id="t1",
+            service_types=[QuotingService.SERVICE_TYPE_CODES[ServiceType.DRIVEWAY]],
+            severities=[QuotingService.SEVERITY_CODES[SeverityLevel.LIGHT]],
+            sqft=[400],
+            materials=[QuotingService.MATERIAL_CODES[MaterialType.BRICK]]
+        )
+    
+    # (200 + 400 * 0.25) * 1.5 = 450
+    assert custom["final_price"] == 450
+    assert custom["pricebook_version"] == 1
+    # (150 + 400 * 0.25) * 1.2 = 300
+    assert default["final_price"] == 300
+    assert batch["final_price"][0] == 450
+
+def test_pricebook_routes():
+    """Test the PriceBook endpoints are registered and round-trip through HTTP"""
+    store = make_store(FakeRedis())
+    client = TestClient(app)
+    
+    with patch("app.api.routes.pricebook.pricebook_store", store):
+        updated = client.put("/api/v1/tenants/t1/pricebook", json={"base_prices": {"driveway": 175}})
+        fetched = client.get("/api/v1/tenants/t1/pricebook")
+        rejected = client.put("/api/v1/tenants/t1/pricebook", json={"base_prices": {"pool": 100}})
+        reset = client.delete("/api/v1/tenants/t1/pricebook")
+    
+    assert updated.status_code == 200
+    assert updated.json() == {"tenant_id": "t1", "version": 1}
+    assert fetched.json() == {"tenant_id": "t1", "version": 1, "rules": {"base_prices": {"driveway": 175}}}
+    assert rejected.status_code == 400
+    assert reset.json() == {"tenant_id": "t1", "version": 2}
+    assert store.get("t1") is store.default_book
+
+def test_store_missing_hooks_fails_at_construction():
+    """Test a VersionedStore subclass must implement its hooks to be built"""
+    class Incomplete(VersionedStore):
+        def _compile(self, tenant_id, version, document):
+            return document
+    
+    with pytest.raises(TypeError):
+        Incomplete(None, 10)
@@ -1,4 +1,8 @@
+import time
 import pytest
+from unittest.mock import patch
+from app.services.pricebook import CompiledPriceBook, PriceBookStore
+from app.services.quote_cache import quote_cache, quote_message_cache
 from app.services.quoting_service import QuotingService, ServiceType, SeverityLevel, MaterialType
 
 def test_basic_driveway_quote():
@@ -106,4 +110,99 @@ def test_quote_error_handling():
     message = QuotingService.generate_quote_message(quote_data)
     
     assert "Sorry" in message
-    assert "call us" in message
\ No newline at end of file
+    assert "call us" in message
+
+def test_batch_quotes_match_scalar_exactly():
+    """Test calculate_quotes_batch reproduces calculate_quote for every combination"""
+    import itertools
+    import random
+    
+    rng = random.Random(11)
+    rows = []
+    for service_type, severity, material in itertools.product(ServiceType, SeverityLevel, [None, *MaterialType]):
+        for _ in range(20):
+            sqft = rng.choice([0, rng.randrange(1, 5000)])
+            unit_count = rng.choice([0, rng.randrange(1, 60)])
+            rows.append((service_type, severity, material, sqft, unit_count))
+    
+    batch = QuotingService.calculate_quotes_batch(
+        tenant_id="test_tenant",
+        service_types=[QuotingService.SERVICE_TYPE_CODES[row[0]] for row in rows],
+        severities=[QuotingService.SEVERITY_CODES[row[1]] for row in rows],
+        materials=[QuotingService.MATERIAL_CODES[row[2]] if row[2] else -1 for row in rows],
+        sqft=[row[3] for row in rows],
+        unit_counts=[row[4] for row in rows]
+    )
+    
+    for i, (service_type, severity, material, sqft, unit_count) in enumerate(rows):
+        scalar = QuotingService.calculate_quote(
+            tenant_id="test_tenant",
+            service_type=service_type,
+            severity=severity,
+            sqft=sqft,
+            material=material,
+            unit_count=unit_count
+        )
+        
+        assert batch["base_price"][i] == scalar["base_price"]
+        assert batch["area_cost"][i] == scalar["area_cost"]
+        assert batch["severity_multiplier"][i] == scalar["severity_multiplier"]
+        assert batch["material_multiplier"][i] == scalar["material_multiplier"]
+        assert batch["subtotal"][i] == scalar["subtotal"]
+        assert batch["final_price"][i] == scalar["final_price"]
+        assert batch["price_min"][i] == scalar["price_range"]["min"]
+        assert batch["price_max"][i] == scalar["price_range"]["max"]
+        assert batch["confidence"][i] == scalar["confidence"]
+
+def test_repeated_quotes_served_from_cache():
+    """Test identical inputs hit the quote cache and callers get independent copies"""
+    quote_cache.clear()
+    
+    first = QuotingService.calculate_quote(
+        tenant_id="tenant_a",
+        service_type=ServiceType.DECK,
+        severity=SeverityLevel.HEAVY,
+        sqft=320
+    )
+    first["price_range"]["min"] = 0
+    second = QuotingService.calculate_quote(
+        tenant_id="tenant_b",
+        service_type=ServiceType.DECK,
+        severity=SeverityLevel.HEAVY,
+        sqft=320
+    )
+    
+    assert quote_cache.get_stats()["hits"] == 1
+    assert second["tenant_id"] == "tenant_b"
+    assert second["price_range"]["min"] > 0
+
+def test_pricebook_version_change_misses_cache():
+    """Test a new PriceBook version is never served an old cached quote"""
+    store = PriceBookStore()
+    store.redis_client = None
+    quote_cache.clear()
+    
+    with patch("app.services.pricebook.pricebook_store", store):
+        store._remember("tenant_a", CompiledPriceBook(1, {"base_prices": {"deck": 200}}), time.monotonic())
+        before = QuotingService.calculate_quote("tenant_a", ServiceType.DECK, SeverityLevel.LIGHT)
+        store._remember("tenant_a", CompiledPriceBook(2, {"base_prices": {"deck": 300}}), time.monotonic())
+        after = QuotingService.calculate_quote("tenant_a", ServiceType.DECK, SeverityLevel.LIGHT)
+    
+    assert before["base_price"] == 200
+    assert after["base_price"] == 300
+    assert quote_cache.get_stats()["misses"] == 2
+
+def test_quote_messages_cached_per_template():
+    """Test rendered messages are reused for the same template and values"""
+    quote_message_cache.clear()
+    quote_data = {
+        "service_type": "driveway",
+        "price_range": {"min": 200, "max": 300},
+        "confidence": "medium"
+    }
+    
+    first = QuotingService.generate_quote_message(quote_data)
+    second = QuotingService.generate_quote_message(quote_data)
+    
+    assert first == second
+    assert quote_message_cache.get_stats()["hits"] == 1
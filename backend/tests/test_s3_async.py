@@ -0,0 +1,56 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from app.integrations.s3_client import AsyncS3Client
+
+def make_async_client(sync_client, timeout_seconds=1.0):
+    return AsyncS3Client(sync_client=sync_client, max_workers=4, timeout_seconds=timeout_seconds)
+
+@pytest.mark.asyncio
+async def test_blocking_call_does_not_stall_event_loop():
+    """Test slow boto3 calls run off the event loop"""
+    sync_client = MagicMock()
+    sync_client.list_tenant_photos.side_effect = lambda **kwargs: time.sleep(0.3) or []
+    client = make_async_client(sync_client)
+    
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+    
+    photos, _ = await asyncio.gather(
+        client.list_tenant_photos(tenant_id="t1", lead_id="l1"),
+        ticker()
+    )
+    
+    assert photos == []
+    assert ticks == 10  # Loop kept ticking while S3 call was in flight
+    sync_client.list_tenant_photos.assert_called_once_with(tenant_id="t1", lead_id="l1")
+    client.shutdown()
+
+@pytest.mark.asyncio
+async def test_operation_timeout_raises():
+    """Test per-operation timeout surfaces as asyncio.TimeoutError"""
+    sync_client = MagicMock()
+    sync_client.delete_photo.side_effect = lambda key: time.sleep(0.5) or True
+    client = make_async_client(sync_client, timeout_seconds=0.05)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await client.delete_photo("photos/t1/l1/a.jpg")
+    
+    client.shutdown()
+
+@pytest.mark.asyncio
+async def test_per_call_timeout_override():
+    """Test a per-call timeout overrides the default"""
+    sync_client = MagicMock()
+    sync_client.check_photo_exists.side_effect = lambda key: time.sleep(0.1) or True
+    client = make_async_client(sync_client, timeout_seconds=0.01)
+    
+    assert await client.check_photo_exists("photos/t1/l1/a.jpg", timeout=1.0) is True
+    client.shutdown()
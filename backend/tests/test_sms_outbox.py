@@ -0,0 +1,179 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.sms_outbox import SmsOutbox
+from app.services.sms_segments import segment_count
+from app.workers.worker import TaskWorker
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+        return queue
+    
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.values = {}
+    
+    def pipeline(self):
+        return FakePipeline(self)
+    
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value.encode())
+    
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+    
+    def lrem(self, key, count, value):
+        self.lists[key].remove(value.encode() if isinstance(value, str) else value)
+    
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+    
+    def delete(self, key):
+        self.values.pop(key, None)
+    
+    def expire(self, key, seconds):
+        pass
+
+@pytest.fixture
+def outbox():
+    outbox = SmsOutbox.__new__(SmsOutbox)
+    outbox.redis_client = FakeRedis()
+    outbox.twilio_client = AsyncMock()
+    return outbox
+
+def queued(*bodies, from_number=None):
+    return [(body.encode(), {"from_number": from_number, "body": body}) for body in bodies]
+
+def test_segment_count():
+    """Test GSM-7 and UCS-2 segment limits"""
+    assert segment_count("a" * 160) == 1
+    assert segment_count("a" * 161) == 2
+    assert segment_count("[" * 80) == 1
+    assert segment_count("a" * 69 + "📞") == 2
+
+def test_plan_drops_duplicates_and_merges():
+    """Test exact duplicates are dropped and short messages share a send"""
+    sends, duplicates = SmsOutbox.plan(queued("Confirmed for Monday.", "Confirmed for Monday.", "Rescheduled to Tuesday."))
+    
+    assert duplicates == 1
+    assert len(sends) == 1
+    assert sends[0]["body"] == "Confirmed for Monday.\n\nRescheduled to Tuesday."
+    assert len(sends[0]["raws"]) == 3
+
+def test_plan_respects_segment_limit_and_sender():
+    """Test merges stop at the segment limit and never cross senders"""
+    long_body = "x" * 150
+    sends, _ = SmsOutbox.plan(queued(long_body, long_body + "y", long_body + "z"), max_segments=2)
+    assert [len(send["raws"]) for send in sends] == [2, 1]
+    
+    sends, _ = SmsOutbox.plan(queued("one") + queued("two", from_number="+15550002222"))
+    assert len(sends) == 2
+    
+    sends, _ = SmsOutbox.plan(queued("one", "two"), merge=False)
+    assert len(sends) == 2
+
+@pytest.mark.asyncio
+@patch('app.services.sms_outbox.jitter_queue')
+async def test_flush_sends_once_per_recipient(mock_queue, outbox):
+    """Test several messages to one phone become one flush and one send"""
+    outbox.twilio_client.send_sms.return_value = True
+    outbox.add("+15550001111", "Hi! Sorry we missed your call.")
+    outbox.add("+15550001111", "Your appointment is confirmed.")
+    outbox.add("+15550001111", "Your appointment is confirmed.")
+    
+    mock_queue.enqueue_delayed.assert_called_once()
+    assert await outbox.flush("+15550001111") is True
+    
+    outbox.twilio_client.send_sms.assert_awaited_once()
+    assert outbox.redis_client.llen(outbox.outbox_key("+15550001111")) == 0
+    assert outbox.outbox_key("+15550001111") + ":scheduled" not in outbox.redis_client.values
+
+@pytest.mark.asyncio
+@patch('app.services.sms_outbox.jitter_queue')
+async def test_failed_send_stays_queued(mock_queue, outbox):
+    """Test only unsent messages are left for the retry"""
+    outbox.twilio_client.send_sms.side_effect = [True, False]
+    outbox.add("+15550001111", "first", "+15550002222")
+    outbox.add("+15550001111", "second", "+15550003333")
+    
+    assert await outbox.flush("+15550001111") is False
+    
+    remaining = outbox.redis_client.lrange(outbox.outbox_key("+15550001111"), 0, -1)
+    assert [json.loads(raw)["body"] for raw in remaining] == ["second"]
+
+@patch('app.services.sms_outbox.jitter_queue')
+def test_dropped_flush_releases_schedule(mock_queue, outbox):
+    """Test a flush dropped after its retries lets the next message schedule a new one"""
+    outbox.add("+15550001111", "first")
+    task = {"task_type": "SMS_OUTBOX_FLUSH", "payload": {"to_number": "+15550001111"}}
+    
+    with patch('app.workers.worker.sms_outbox', outbox):
+        TaskWorker._task_dropped(None, task)
+    
+    assert outbox.outbox_key("+15550001111") + ":scheduled" not in outbox.redis_client.values
+    outbox.add("+15550001111", "second")
+    assert mock_queue.enqueue_delayed.call_count == 2
+
+@pytest.mark.asyncio
+@patch('app.services.sms_outbox.jitter_queue')
+async def test_tenants_never_share_a_send(mock_queue, outbox):
+    """Test the same text from two tenants to one customer is sent once per tenant"""
+    outbox.twilio_client.send_sms.return_value = True
+    outbox.add("+15550001111", "Your appointment is confirmed.", tenant_id="t1")
+    outbox.add("+15550001111", "Your appointment is confirmed.", tenant_id="t2")
+    
+    payloads = [call.kwargs["payload"] for call in mock_queue.enqueue_delayed.call_args_list]
+    assert payloads == [
+        {"to_number": "+15550001111", "tenant_id": "t1"},
+        {"to_number": "+15550001111", "tenant_id": "t2"}
+    ]
+    
+    assert await outbox.flush("+15550001111", "t1") is True
+    assert await outbox.flush("+15550001111", "t2") is True
+    assert outbox.twilio_client.send_sms.await_count == 2
+
+@pytest.mark.asyncio
+@patch('app.services.sms_outbox.sms_opt_outs')
+@patch('app.services.sms_outbox.jitter_queue')
+async def test_stop_during_window_drops_queued(mock_queue, mock_opt_outs, outbox):
+    """Test messages queued before a STOP are dropped at flush, not sent"""
+    mock_opt_outs.is_opted_out.return_value = False
+    outbox.add("+15550001111", "Your appointment is confirmed.", tenant_id="t1")
+    mock_opt_outs.is_opted_out.return_value = True
+    
+    assert await outbox.flush("+15550001111", "t1") is True
+    
+    outbox.twilio_client.send_sms.assert_not_awaited()
+    mock_opt_outs.is_opted_out.assert_called_with("t1", "+15550001111")
+    assert outbox.redis_client.llen(outbox.outbox_key("+15550001111", "t1")) == 0
+
+@patch('app.services.sms_outbox.jitter_queue')
+def test_failed_schedule_releases_flag(mock_queue, outbox):
+    """Test a flush that can't be enqueued leaves nothing queued behind the flag"""
+    mock_queue.enqueue_delayed.return_value = None
+    key = outbox.outbox_key("+15550001111", "t1")
+    
+    assert outbox.add("+15550001111", "first", tenant_id="t1") is False
+    assert key + ":scheduled" not in outbox.redis_client.values
+    assert outbox.redis_client.llen(key) == 0
+    
+    mock_queue.enqueue_delayed.return_value = "task-1"
+    assert outbox.add("+15550001111", "second", tenant_id="t1") is True
+    assert outbox.redis_client.values[key + ":scheduled"] == 1
@@ -0,0 +1,141 @@
+import json
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.twilio_client import TwilioClient
+from app.services.conversation_buffer import conversation_buffer
+from app.services.jitter_queue import JitterQueue
+from app.services.sms_opt_outs import sms_opt_outs
+from app.services.sms_pipeline import InboundSmsPipeline
+from app.services.tenant_phone_numbers import tenant_phone_numbers
+
+class FakeRedis:
+    def __init__(self):
+        self.zadd_calls = []
+    
+    def zadd(self, key, entries):
+        self.zadd_calls.append(entries)
+
+@pytest.fixture
+def queue():
+    queue = JitterQueue.__new__(JitterQueue)
+    queue.redis_client = FakeRedis()
+    return queue
+
+def message(sid, body):
+    return {
+        "message_sid": sid,
+        "tenant_id": "t1",
+        "from_number": "+15550001111",
+        "to_number": "+15559998888",
+        "body": body
+    }
+
+def test_batch_is_quoted_and_queued_in_one_write(queue):
+    """Test every quotable message gets a reply task from a single ZADD"""
+    pipeline = InboundSmsPipeline(queue)
+    
+    result = pipeline.process_batch([
+        message("SM1", "driveway 20x40, concrete"),
+        message("SM2", "hi"),
+        message("SM3", "need 12 windows cleaned")
+    ])
+    
+    assert result["received"] == 3
+    assert result["quoted"] == 2
+    assert result["queued"] == 2
+    assert set(result["timings_ms"]) == {"parse", "quote", "render", "enqueue"}
+    
+    assert len(queue.redis_client.zadd_calls) == 1
+    tasks = [json.loads(entry) for entry in queue.redis_client.zadd_calls[0]]
+    assert [task["task_id"] for task in tasks] == ["quote_reply_SM1", "quote_reply_SM3"]
+    assert tasks[0]["task_type"] == "CHATWOOT_REPLY"
+    assert tasks[0]["payload"]["to_number"] == "+15550001111"
+    assert tasks[0]["payload"]["from_number"] == "+15559998888"
+    assert "$" in tasks[0]["payload"]["body"]
+
+def test_stage_metrics_accumulate(queue):
+    """Test per-stage counters cover every batch"""
+    pipeline = InboundSmsPipeline(queue)
+    
+    pipeline.process_batch([message("SM1", "roof is moldy")])
+    pipeline.process_batch([message("SM2", "deck"), message("SM3", "thanks!")])
+    
+    stats = pipeline.get_stats()
+    assert stats["parse"]["batches"] == 2
+    assert stats["parse"]["items"] == 3
+    assert stats["enqueue"]["items"] == 2
+
+def test_failed_enqueue_raises():
+    """Test a failed queue write surfaces so the worker retries the batch"""
+    queue = JitterQueue.__new__(JitterQueue)
+    queue.redis_client = None
+    
+    with pytest.raises(RuntimeError):
+        InboundSmsPipeline(queue).process_batch([message("SM1", "house siding")])
+
+class FakeOptOutRedis:
+    def __init__(self):
+        self.sets = {}
+    
+    def sismember(self, key, member):
+        return member in self.sets.get(key, set())
+    
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+    
+    def srem(self, key, member):
+        self.sets.get(key, set()).discard(member)
+
+@patch.object(sms_opt_outs, 'redis_client', new_callable=FakeOptOutRedis)
+@patch.object(tenant_phone_numbers, 'resolve', return_value="t1")
+@patch.object(conversation_buffer, 'append')
+@patch.object(TwilioClient, 'validate_webhook', return_value=True)
+def test_sms_webhook_buffers_inbound_text(mock_validate, mock_append, mock_resolve, opt_out_redis):
+    """Test inbound texts are buffered for the number's tenant, opted-out senders are not"""
+    client = TestClient(app)
+    
+    form_data = {"MessageSid": "SM1", "From": "+15550001111", "To": "+15559998888", "Body": "deck 16x20"}
+    response = client.post("/webhooks/twilio/sms", data=form_data)
+    
+    assert response.status_code == 200
+    mock_resolve.assert_called_with("+15559998888")
+    mock_append.assert_called_once()
+    assert mock_append.call_args[0][0] == "t1"
+    assert mock_append.call_args[0][1]["message_sid"] == "SM1"
+    assert mock_append.call_args[0][1]["body"] == "deck 16x20"
+    
+    client.post("/webhooks/twilio/sms", data={**form_data, "MessageSid": "SM2", "Body": "STOP"})
+    client.post("/webhooks/twilio/sms", data={**form_data, "MessageSid": "SM3", "Body": "how much for the roof?"})
+    assert mock_append.call_count == 1
+    assert sms_opt_outs.is_opted_out("t1", "+15550001111")
+    
+    client.post("/webhooks/twilio/sms", data={**form_data, "MessageSid": "SM4", "Body": "start"})
+    client.post("/webhooks/twilio/sms", data={**form_data, "MessageSid": "SM5", "Body": "roof please"})
+    assert mock_append.call_count == 2
+
+@patch.object(sms_opt_outs, 'redis_client', new_callable=FakeOptOutRedis)
+@patch.object(tenant_phone_numbers, 'resolve', return_value="t1")
+@patch.object(conversation_buffer, 'append', return_value=False)
+@patch.object(TwilioClient, 'validate_webhook', return_value=True)
+def test_sms_webhook_fails_when_not_buffered(mock_validate, mock_append, mock_resolve, opt_out_redis):
+    """Test a text that couldn't be buffered is a server error, not a silent 200"""
+    client = TestClient(app)
+    
+    response = client.post("/webhooks/twilio/sms", data={"MessageSid": "SM1", "From": "+15550001111", "To": "+15559998888", "Body": "deck"})
+    
+    assert response.status_code == 503
+    mock_append.assert_called_once()
+
+def test_opted_out_senders_are_not_quoted(queue):
+    """Test a STOP that arrives after buffered texts keeps them from being quoted"""
+    redis_client = FakeOptOutRedis()
+    redis_client.sadd(sms_opt_outs.opt_outs_key("t1"), "+15550001111")
+    
+    with patch.object(sms_opt_outs, 'redis_client', redis_client):
+        result = InboundSmsPipeline(queue).process_batch([message("SM1", "house siding")])
+    
+    assert result["quoted"] == 0
+    assert queue.redis_client.zadd_calls == []
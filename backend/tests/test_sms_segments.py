@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.integrations.twilio_client import TwilioClient
+from app.services.message_templates import DEFAULT_TEMPLATES
+from app.services.sms_segments import GSM7, UCS2, analyze, to_gsm7
+from app.services.tenant_sms_settings import TenantSmsSettings
+
+def test_analyze_counts_units_per_encoding():
+    """Test septets for GSM-7 (extension chars count twice) and UTF-16 units for UCS-2"""
+    assert analyze("Hi there") == (GSM7, 8, 1)
+    assert analyze("{}") == (GSM7, 4, 1)
+    assert analyze("Ünïcödé à") == (UCS2, 9, 1)
+    assert analyze("See you 📅") == (UCS2, 10, 1)
+    assert analyze("x" * 306) == (GSM7, 306, 2)
+    assert analyze("x" * 307) == (GSM7, 307, 3)
+    assert analyze("x" * 134 + "📅") == (UCS2, 136, 3)
+
+def test_gsm7_variant_drops_emoji_and_fixes_punctuation():
+    """Test the GSM-7 variant keeps text readable without forcing UCS-2"""
+    assert to_gsm7("Call us! 📞 Text “photos” — thanks…") == 'Call us! Text "photos" - thanks...'
+    assert to_gsm7("Range $120-$300. 💰\n\nNext") == "Range $120-$300.\n\nNext"
+    assert to_gsm7("Crème brûlée") == "Crème brulée"
+    assert to_gsm7("plain [text]") == "plain [text]"
+
+def test_gsm7_variant_cuts_template_segments():
+    """Test the emoji in stock templates cost segments the GSM-7 variant saves"""
+    bodies = [
+        TwilioClient.missed_call_followup_body("Sam"),
+        TwilioClient.review_request_body(),
+        DEFAULT_TEMPLATES["quote_estimate"]
+    ]
+    
+    for body in bodies:
+        encoding, _, segments = analyze(to_gsm7(body))
+        assert encoding == GSM7
+        assert segments < analyze(body)[2]
+
+def test_tenant_setting_controls_rendering():
+    """Test only tenants with gsm7_only get the GSM-7 variant"""
+    store = TenantSmsSettings.__new__(TenantSmsSettings)
+    store.cache = {}
+    store.redis_client = MagicMock()
+    store.redis_client.get.side_effect = lambda key: b'{"gsm7_only": true}' if "t1" in key else None
+    
+    body, (encoding, _, segments) = store.render("t1", TwilioClient.review_request_body())
+    assert encoding == GSM7
+    assert segments == 1
+    assert "🌟" in store.render("t2", TwilioClient.review_request_body())[0]
+    
+    store.render("t1", "again")
+    assert store.redis_client.get.call_count == 2
+
+def test_preview_reports_segments():
+    """Test the preview endpoint reports encoding and segment count"""
+    client = TestClient(app)
+    
+    response = client.post("/api/v1/tenants/t1/sms-preview", json={"body": "Hi! 🌟 Thanks"})
+    
+    assert response.status_code == 200
+    assert response.json()["encoding"] == UCS2
+    assert response.json()["segments"] == 1